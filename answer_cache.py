@@ -0,0 +1,260 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# ---------------------
+# Near-duplicate answer cache
+# ---------------------
+# Whole answers are reused when a new query has the same intent and the same
+# normalized slots as a cached one, and the words left over once slots and
+# intent keywords are removed are similar enough (MinHash estimate of Jaccard
+# similarity over ordered word pairs, looked up through an LSH band index).
+# Word pairs keep order, so "into nursing from tech" is not "into tech from
+# nursing". All in memory, CPU only.
+
+SIMILARITY_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.85"))
+MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "2000"))
+# How long past its max age an answer may still be served while it is refreshed
+STALE_SECONDS = int(os.getenv("ANSWER_CACHE_STALE_SECONDS", str(24 * 60 * 60)))
+
+# How long an answer may be served for each intent, in seconds (0 = never cache).
+# General questions have no slots to pin them down, so one word can change the
+# question ("first job" vs "second job"); they are not cached.
+MAX_AGE = {
+    "company": 6 * 60 * 60,
+    "salary": 24 * 60 * 60,
+    "interview": 7 * 24 * 60 * 60,
+    "resume": 7 * 24 * 60 * 60,
+    "trends": 12 * 60 * 60,
+    "general": 0,
+    "jd": 0,
+}
+
+NUM_HASHES = 32
+BANDS = 8
+ROWS = NUM_HASHES // BANDS
+
+_TOKEN = re.compile(r"[a-z0-9+#/]+")
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "for", "in", "at", "on", "to", "with", "as", "is", "are", "be",
+    "what", "whats", "how", "much", "does", "do", "can", "i", "me", "my", "you", "your", "it", "this",
+    "that", "please", "give", "tell", "about", "should", "would", "typical", "some", "any", "range",
+    "include", "including", "information", "level", "both",
+}
+# Words that only restate the intent ("salary" vs "compensation") carry no meaning once it is known
+_INTENT_WORDS = {
+    "company": {"company", "research", "news", "culture", "funding", "updates", "important", "recent", "work", "like"},
+    "salary": {"salary", "salaries", "compensation", "pay", "tc", "wage", "wages", "make", "earn", "base", "total", "comp", "benefits"},
+    "interview": {"interview", "interviews", "questions", "question", "prepare", "prep", "technical", "behavioral", "sample", "answers"},
+    "resume": {"resume", "cv", "tips", "experience", "years", "formatting", "advice", "key", "sections", "recruiters", "look", "write"},
+    "trends": {"trends", "trend", "trending", "industry", "latest", "hot", "skills", "emerging", "technologies", "job", "market", "insights"},
+}
+_ALIASES = {
+    "nyc": "new york", "new york city": "new york", "ny": "new york",
+    "sf": "san francisco", "bay area": "san francisco", "sf bay area": "san francisco",
+    "la": "los angeles", "dc": "washington", "washington dc": "washington",
+    "uk": "united kingdom", "us": "united states", "usa": "united states",
+    "swe": "software engineer", "sde": "software engineer", "software developer": "software engineer",
+    "ml engineer": "machine learning engineer", "mle": "machine learning engineer",
+    "pm": "product manager", "ds": "data scientist", "sre": "site reliability engineer",
+}
+_MASK = (1 << 61) - 1
+_SEEDS = [(i * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) & _MASK for i in range(1, NUM_HASHES + 1)]
+
+
+def normalize_slot(value: str) -> str:
+    value = " ".join(_TOKEN.findall(value.lower()))
+    value = _ALIASES.get(value, value)
+    # Singularize the last word so "data scientists" matches "data scientist"
+    if value.endswith("s") and not value.endswith("ss") and len(value) > 3:
+        value = value[:-1]
+    return value
+
+
+def _residual_words(query: str, route) -> list:
+    """Words left once slots, stopwords and intent keywords are removed, in query order."""
+    slot_words = set()
+    for value in route.slots().values():
+        slot_words.update(_TOKEN.findall(value.lower()))
+        slot_words.update(normalize_slot(value).split())
+    ignored = _STOPWORDS | _INTENT_WORDS.get(route.intent, set()) | slot_words
+    words = []
+    for token in _TOKEN.findall(query.lower()):
+        if token in ignored:
+            continue
+        token = _ALIASES.get(token, token)
+        if token in ignored:
+            continue
+        words.append(token[:-1] if token.endswith("s") and len(token) > 3 else token)
+    return words
+
+
+def _residual_tokens(query: str, route) -> set:
+    """Shingles of the leftover words: each word and each ordered pair of neighbours."""
+    words = _residual_words(query, route)
+    # Two queries that are nothing but intent + slots are the same question
+    if not words:
+        return {"<empty>"}
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def minhash(tokens: set) -> tuple:
+    hashes = [hash(token) & _MASK for token in tokens]
+    return tuple(min((h ^ seed) * 0x5851F42D4C957F2D & _MASK for h in hashes) for seed in _SEEDS)
+
+
+def similarity(a: tuple, b: tuple) -> float:
+    """Estimated Jaccard similarity from two MinHash signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_HASHES
+
+
+class AnswerCache:
+    """In-memory answer cache bucketed by intent + normalized slots with an LSH index per bucket."""
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD, max_entries: int = MAX_ENTRIES, max_age: dict = None,
+                 stale_seconds: int = STALE_SECONDS):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_age = dict(MAX_AGE if max_age is None else max_age)
+        self.stale_seconds = stale_seconds
+        self._entries = OrderedDict()
+        self._bands = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._counters = {"lookups": 0, "hits": 0, "misses": 0, "stale": 0, "stale_served": 0, "saved_seconds": 0.0}
+
+    def bucket(self, route) -> tuple:
+        return (route.intent,) + tuple(sorted((k, normalize_slot(v)) for k, v in route.slots().items()))
+
+    def request_key(self, query: str, route) -> tuple:
+        """Exact key for identical requests: bucket plus the normalized leftover wording."""
+        return self.bucket(route) + tuple(sorted(_residual_tokens(query, route)))
+
+    def _band_keys(self, bucket: tuple, signature: tuple):
+        for band in range(BANDS):
+            yield bucket, band, signature[band * ROWS:(band + 1) * ROWS]
+
+    def _drop(self, entry_id: int):
+        entry = self._entries.pop(entry_id)
+        for key in self._band_keys(entry["bucket"], entry["signature"]):
+            ids = self._bands.get(key)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._bands[key]
+
+    def _find(self, query: str, route, allow_stale: bool):
+        # Caller holds the lock. Fresh entries win over stale ones, then similarity.
+        max_age = self.max_age.get(route.intent, 0)
+        if max_age <= 0:
+            return None
+        bucket = self.bucket(route)
+        signature = minhash(_residual_tokens(query, route))
+        candidates = set()
+        for key in self._band_keys(bucket, signature):
+            candidates.update(self._bands.get(key, ()))
+
+        best_id, best_rank = None, None
+        now = time.time()
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            age = now - entry["created"]
+            if age > max_age + self.stale_seconds:
+                self._drop(entry_id)
+                self._counters["stale"] += 1
+                continue
+            fresh = age <= max_age
+            if not fresh and not allow_stale:
+                continue
+            score = similarity(signature, entry["signature"])
+            if score >= self.threshold and (best_rank is None or (fresh, score) >= best_rank):
+                best_id, best_rank = entry_id, (fresh, score)
+        if best_id is None:
+            return None
+        entry = self._entries[best_id]
+        return best_id, {"answer": entry["answer"], "age": now - entry["created"], "stale": not best_rank[0]}
+
+    def lookup(self, query: str, route):
+        """Return a cached answer for a near-duplicate query, or None."""
+        entry = self.lookup_entry(query, route)
+        return entry["answer"] if entry is not None else None
+
+    def lookup_entry(self, query: str, route, allow_stale: bool = False):
+        """Return {"answer", "age", "stale"} for a near-duplicate query, or None.
+
+        With allow_stale, an answer past its max age (but within the stale
+        window) is returned with stale=True so the caller can serve it while
+        a refresh runs.
+        """
+        with self._lock:
+            self._counters["lookups"] += 1
+            found = self._find(query, route, allow_stale)
+            if found is None:
+                self._counters["misses"] += 1
+                return None
+            entry_id, entry = found
+            self._entries.move_to_end(entry_id)
+            self._counters["hits"] += 1
+            self._counters["stale_served"] += entry["stale"]
+            self._counters["saved_seconds"] += self._entries[entry_id]["latency"]
+            return entry
+
+    def age(self, query: str, route):
+        """Age in seconds of the answer a lookup would serve (fresh or stale), or None; not counted as a lookup."""
+        with self._lock:
+            found = self._find(query, route, allow_stale=True)
+        return found[1]["age"] if found is not None else None
+
+    def store(self, query: str, route, answer: str, latency: float):
+        """Remember an answer along with how long it took to produce."""
+        if self.max_age.get(route.intent, 0) <= 0 or not answer:
+            return
+        bucket = self.bucket(route)
+        signature = minhash(_residual_tokens(query, route))
+        with self._lock:
+            # A refreshed answer replaces the previous one for the same question
+            for key in self._band_keys(bucket, signature):
+                for entry_id in list(self._bands.get(key, ())):
+                    if entry_id in self._entries and self._entries[entry_id]["signature"] == signature:
+                        self._drop(entry_id)
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = {
+                "bucket": bucket,
+                "signature": signature,
+                "answer": answer,
+                "latency": latency,
+                "created": time.time(),
+            }
+            for key in self._band_keys(bucket, signature):
+                self._bands.setdefault(key, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bands.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+        stats["hit_rate"] = stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """Process-wide answer cache shared by all sessions."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnswerCache()
+    return _cache
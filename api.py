@@ -0,0 +1,310 @@
+"""HTTP API for the assistant pipeline, for other services and the Streamlit UI.
+
+One endpoint per quick action plus free-text chat, all going through the same
+research, caches and LLM dispatch as the chat UI. Chat queries are routed;
+the quick-action endpoints already have the intent and its details, so they
+pass them to the pipeline as they are. Answers stream as
+server-sent events by default; send "stream": false for one JSON response.
+
+    python api.py --port 8000 --workers 4
+    curl -N localhost:8000/v1/salary -H 'Content-Type: application/json' \\
+        -d '{"role": "Data Scientist", "location": "New York"}'
+
+Events: "queue" ({"upstream", "position"}) while the request waits for a rate
+limit slot, "chunk" ({"text"}) for each piece of the answer, then "done" with
+the provider that answered, the intent, timings and per-stage durations.
+A request that fails before it can answer (e.g. no provider could be set
+up) ends with an "error" event ({"status", "error", "message"}) instead of
+"done"; with "stream": false, or when the error is the first event, the same
+body comes back with that status. Overloaded requests get status 503 with
+"retry_after" seconds, also sent as a Retry-After header.
+The Streamlit UI (file.py) uses this API instead of running the pipeline
+itself when CAREER_API_URL is set.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Literal
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from assistant import QUICK_ACTION_QUERIES, format_error, initialize_llm, stream_query, warm_up
+from metrics import metrics, trace_request
+from prefetch import start_prefetch
+from ratelimit import Overloaded, queue_listener
+from router import Route
+
+# Requests run the blocking pipeline on worker threads; the event loop only moves bytes
+API_THREADS = int(os.getenv("API_THREADS", "64"))
+API_MODEL = os.getenv("API_MODEL", "OpenAI")
+# Seconds an overloaded client is told to wait before retrying (Retry-After)
+RETRY_AFTER_SECONDS = int(os.getenv("API_RETRY_AFTER_SECONDS", "5"))
+# Job descriptions are the longest inputs
+MAX_INPUT_CHARS = 100_000
+
+Model = Literal["OpenAI", "Gemini"]
+
+_executor = ThreadPoolExecutor(max_workers=API_THREADS, thread_name_prefix="api")
+
+
+# ---------------------
+# Request bodies
+# ---------------------
+class Ask(BaseModel):
+    model: Model = API_MODEL
+    stream: bool = True
+
+
+class ChatRequest(Ask):
+    query: str = Field(min_length=1, max_length=MAX_INPUT_CHARS)
+
+
+class CompanyRequest(Ask):
+    company: str = Field(min_length=1, max_length=200)
+
+
+class InterviewRequest(Ask):
+    role: str = Field(min_length=1, max_length=200)
+    level: Literal["entry", "mid", "senior"] = "mid"
+
+
+class SalaryRequest(Ask):
+    role: str = Field(min_length=1, max_length=200)
+    location: str = Field(min_length=1, max_length=200)
+    level: Literal["", "entry", "mid", "senior"] = ""
+
+
+class ResumeRequest(Ask):
+    role: str = Field(min_length=1, max_length=200)
+    experience: str = Field(default="", max_length=200)
+
+
+class TrendsRequest(Ask):
+    industry: str = Field(min_length=1, max_length=200)
+
+
+class JDRequest(Ask):
+    job_description: str = Field(min_length=1, max_length=MAX_INPUT_CHARS)
+
+
+# ---------------------
+# Running the pipeline
+# ---------------------
+_llms = {}
+_llms_lock = threading.Lock()
+
+
+def get_llm(model: str):
+    """One LLM dispatcher per preferred model, shared by all requests in the worker."""
+    llm = _llms.get(model)
+    if llm is None:
+        with _llms_lock:
+            llm = _llms.get(model)
+            if llm is None:
+                llm = _llms[model] = initialize_llm(model)
+    return llm
+
+
+def run_request(query: str, model: str, emit, cancelled: threading.Event, route: Route = None):
+    """Answer query on the calling thread, reporting progress through emit(event, data)."""
+    try:
+        _run_request(query, model, emit, cancelled, route)
+    except Overloaded as e:
+        emit("error", {
+            "status": 503,
+            "error": type(e).__name__,
+            "message": format_error(e),
+            "retry_after": RETRY_AFTER_SECONDS,
+        })
+    except Exception as e:
+        # The response may have started by now; the client learns of the failure from this event
+        emit("error", {"status": 500, "error": type(e).__name__, "message": format_error(e)})
+
+
+def _run_request(query: str, model: str, emit, cancelled: threading.Event, route: Route = None):
+    timing = {}
+    llm = get_llm(model)
+    with trace_request("api") as trace:
+        with queue_listener(lambda upstream, position: emit("queue", {"upstream": upstream, "position": position})):
+            stream = stream_query(query, llm, timing, route, raise_overloaded=True)
+            try:
+                for chunk in stream:
+                    if cancelled.is_set():
+                        break
+                    emit("chunk", {"text": chunk})
+            finally:
+                # Closing the generator cancels the provider calls of an abandoned request
+                stream.close()
+    # Trace attributes: provider, intent, total, prompt size and token counts when an LLM was called
+    emit("done", {
+        "provider": model,
+        **trace.attributes,
+        "timing": timing,
+        "stages": {stage: round(seconds, 4) for stage, seconds in trace.stages.items()},
+    })
+
+
+async def events(query: str, model: str, route: Route = None):
+    """Async iterator of (event, data) for one request, run on the worker thread pool."""
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def emit(event, data):
+        loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+    future = loop.run_in_executor(
+        _executor, contextvars.copy_context().run, run_request, query, model, emit, cancelled, route
+    )
+    # Scheduled after every emit() the worker made, so it marks the end of the stream
+    future.add_done_callback(lambda _: queue.put_nowait((None, None)))
+    try:
+        while True:
+            event, data = await queue.get()
+            if event is None:
+                break
+            yield event, data
+        await future
+    finally:
+        # The client went away (or the request failed): stop streaming on the worker too
+        cancelled.set()
+
+
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def error_response(data: dict) -> JSONResponse:
+    headers = {"Retry-After": str(data["retry_after"])} if "retry_after" in data else None
+    return JSONResponse(data, status_code=data["status"], headers=headers)
+
+
+async def respond(query: str, ask: Ask, route: Route = None):
+    stream = events(query, ask.model, route)
+    if ask.stream:
+        # Hold the response until the first event, so a request that fails
+        # before doing anything (e.g. turned away by the rate limiter) gets
+        # its real status code instead of a 200 with an error event
+        first = await stream.__anext__()
+        if first[0] == "error":
+            await stream.aclose()
+            return error_response(first[1])
+
+        async def body():
+            yield sse(*first)
+            async for event, data in stream:
+                yield sse(event, data)
+
+        return StreamingResponse(
+            body(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    chunks, result = [], {}
+    async for event, data in stream:
+        if event == "chunk":
+            chunks.append(data["text"])
+        elif event == "done":
+            result = data
+        elif event == "error":
+            return error_response(data)
+    return JSONResponse({"answer": "".join(chunks), **result})
+
+
+# ---------------------
+# Endpoints
+# ---------------------
+@asynccontextmanager
+async def lifespan(app):
+    # Same background work the UI starts: the watchlist refresher and client warm-up
+    start_prefetch()
+    warm_up(API_MODEL)
+    yield
+
+
+app = FastAPI(title="Career Assistant API", lifespan=lifespan)
+
+
+@app.post("/v1/chat")
+async def chat(request: ChatRequest):
+    """Free-text question, routed to the matching intent."""
+    return await respond(request.query, request)
+
+
+# The query text is still the quick-action wording: it keys the answer cache the
+# same way as the form in the UI, and the JD analysis reads the posting from it.
+@app.post("/v1/company")
+async def company(request: CompanyRequest):
+    route = Route("company", company=request.company.strip())
+    return await respond(QUICK_ACTION_QUERIES["company"].format(company=request.company), request, route)
+
+
+@app.post("/v1/interview")
+async def interview(request: InterviewRequest):
+    route = Route("interview", role=request.role.strip(), level=request.level)
+    query = QUICK_ACTION_QUERIES["interview"].format(role=request.role, level=request.level)
+    return await respond(query, request, route)
+
+
+@app.post("/v1/salary")
+async def salary(request: SalaryRequest):
+    route = Route("salary", role=request.role.strip(), location=request.location.strip(), level=request.level)
+    query = QUICK_ACTION_QUERIES["salary"].format(role=request.role, location=request.location)
+    return await respond(query, request, route)
+
+
+@app.post("/v1/resume")
+async def resume(request: ResumeRequest):
+    route = Route("resume", role=request.role.strip(), experience=request.experience.strip())
+    query = QUICK_ACTION_QUERIES["resume"].format(role=request.role, experience=request.experience)
+    return await respond(query, request, route)
+
+
+@app.post("/v1/trends")
+async def trends(request: TrendsRequest):
+    route = Route("trends", industry=request.industry.strip())
+    return await respond(QUICK_ACTION_QUERIES["trends"].format(industry=request.industry), request, route)
+
+
+@app.post("/v1/jd")
+async def job_description(request: JDRequest):
+    query = QUICK_ACTION_QUERIES["jd"].format(job_description=request.job_description)
+    return await respond(query, request, Route("jd"))
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus():
+    """This worker's metrics in the Prometheus text format."""
+    return metrics.render_prometheus()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the career assistant over HTTP.")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("API_WORKERS", "1")))
+    args = parser.parse_args()
+
+    import uvicorn
+
+    # Each worker process has its own rate limiters; split the configured limits between them
+    os.environ.setdefault("RATE_LIMIT_PROCESSES", str(args.workers))
+    uvicorn.run("api:app", host=args.host, port=args.port, workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import json
+import os
+
+import httpx
+
+from clients import registry
+
+# ---------------------
+# API client
+# ---------------------
+# When CAREER_API_URL is set the Streamlit UI is a thin client: answers come
+# from the HTTP API (api.py), which can run many workers behind a load
+# balancer, instead of from the pipeline in the Streamlit process.
+
+API_URL = os.getenv("CAREER_API_URL", "").rstrip("/")
+API_TIMEOUT = float(os.getenv("CAREER_API_TIMEOUT", "120"))
+
+
+def get_api_client() -> httpx.Client:
+    """Keep-alive connection pool to the API, shared by every session."""
+    return registry.get(
+        ("api", API_URL),
+        lambda: httpx.Client(base_url=API_URL, timeout=httpx.Timeout(API_TIMEOUT, connect=10.0)),
+    )
+
+
+def stream_remote(user_query: str, model_choice: str, on_queue=None, result: dict = None):
+    """Yield the answer as the API streams it, like assistant.stream_query.
+
+    on_queue(upstream, position) is called for queue events; result receives
+    the final "done" event (provider, intent, timing, stages). A request the
+    API could not answer yields its error message, as stream_query does, and
+    result receives the "error" event instead.
+    """
+    payload = {"query": user_query, "model": model_choice}
+    with get_api_client().stream("POST", "/v1/chat", json=payload) as response:
+        if response.status_code in (500, 503) and response.headers.get("content-type", "").startswith("application/json"):
+            # Failed before streaming started: the body is the "error" event
+            response.read()
+            data = response.json()
+            if result is not None:
+                result.update(data)
+            yield data["message"]
+            return
+        response.raise_for_status()
+        event = None
+        finished = False
+        for line in response.iter_lines():
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data = json.loads(line[len("data:"):])
+                if event == "chunk":
+                    yield data["text"]
+                elif event == "queue" and on_queue is not None:
+                    on_queue(data["upstream"], data["position"])
+                elif event == "done":
+                    finished = True
+                    if result is not None:
+                        result.update(data)
+                elif event == "error":
+                    finished = True
+                    if result is not None:
+                        result.update(data)
+                    yield data["message"]
+        if not finished:
+            # The connection closed mid-answer (e.g. the worker died)
+            raise httpx.RemoteProtocolError("The API closed the answer stream before it finished.")
@@ -0,0 +1,516 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from clients import LLM_MODELS, WARM_UP, get_llm, get_search, llm_configured, start_warm_up
+from dispatch import LLMDispatcher, LazyProvider
+from search_cache import get_search_cache, is_refreshing
+from research import fan_out_search
+from router import route_query
+from answer_cache import get_answer_cache
+from jd import JD_ANALYSIS, build_jd_prompt
+from context import DEFAULT_TOKEN_BUDGET, budget_for, build_context, get_encoding, query_terms
+from metrics import record, record_llm_usage, set_attribute, span
+from singleflight import answer_flights
+from prefetch import get_prefetcher
+from ratelimit import Overloaded
+from skills import analyze_job_description
+from salaries import NARRATIVE as SALARY_NARRATIVE, get_salary_dataset, parse_results, render_summary
+
+# ---------------------
+# Assistant pipeline
+# ---------------------
+# Routing, research, and LLM calls with no Streamlit dependency, shared by
+# the chat UI (file.py) and headless entry points.
+
+# Load API keys
+load_dotenv()
+OPENAI_KEY = os.getenv("OPENAI_API_KEY")
+GEMINI_KEY = os.getenv("GEMINI_API_KEY")
+TAVILY_KEY = os.getenv("TAVILY_API_KEY")
+
+# Queries sent by the quick-action forms, keyed by action
+QUICK_ACTION_QUERIES = {
+    "company": "Tell me about {company}. Include recent news, company culture, funding, and any important updates.",
+    "interview": "Give me interview questions for {role} at {level} level. Include both technical and behavioral questions with sample answers.",
+    "jd": "Analyze this job description and extract key skills, requirements, responsibilities, and suggest how I should tailor my resume:\n\n{job_description}",
+    "salary": "What is the salary range for {role} in {location}? Include base salary, total compensation, and any benefits information.",
+    "resume": "Give me resume tips for {role} with {experience} experience. Include formatting advice, key sections, and what recruiters look for.",
+    "trends": "What are the latest trends in {industry}? Include hot skills, emerging technologies, and job market insights.",
+}
+
+# Research steps of the answer being built that failed or found nothing; such answers are not cached
+_research_failures = contextvars.ContextVar("research_failures", default=None)
+
+
+@contextmanager
+def _collect_research_failures():
+    """Collect the research steps that fail inside this block (and threads it starts) into a list.
+
+    Blocks nest: failures are also passed on to the enclosing block's list.
+    """
+    outer = _research_failures.get()
+    failures = []
+    token = _research_failures.set(failures)
+    try:
+        yield failures
+    finally:
+        _research_failures.reset(token)
+        if outer is not None:
+            outer.extend(failures)
+
+
+def _research_failed(step: str):
+    failures = _research_failures.get()
+    if failures is not None:
+        failures.append(step)
+    set_attribute("research_failed", step)
+
+
+def _check_results(step: str, results) -> list:
+    if not isinstance(results, list) or not results:
+        _research_failed(step)
+    return results
+
+
+# ---------------------
+# Helper Functions
+# ---------------------
+def search_company_info(company_name: str, max_tokens: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Get latest news, funding, culture, and recent updates about a company."""
+    try:
+        search = get_search(TAVILY_KEY, search_depth="advanced")
+        queries = [
+            f"{company_name} company latest news 2024 2025",
+            f"{company_name} funding valuation investors revenue",
+            f"{company_name} company culture employee reviews work environment",
+            f"{company_name} recent updates hiring layoffs leadership changes",
+        ]
+        with span("search"):
+            results = fan_out_search(
+                queries, lambda query: get_search_cache().get_or_search("company", query, search.invoke)
+            )
+        _check_results("company", results)
+        
+        terms = query_terms(company_name, "news funding valuation culture employees hiring layoffs leadership")
+        return build_context(f"Company Research: {company_name}", results, terms, max_tokens)
+    except Overloaded:
+        # Backpressure reaches the caller instead of an answer without research
+        raise
+    except Exception as e:
+        _research_failed("company")
+        return f"Error searching company info: {str(e)}"
+
+
+def get_interview_questions(role: str, level: str = "mid", max_tokens: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Generate role-specific interview questions with answers."""
+    try:
+        search = get_search(TAVILY_KEY)
+        query = f"{role} {level} level interview questions answers 2024 2025"
+        with span("search"):
+            results = _check_results("interview", get_search_cache().get_or_search("interview", query, search.invoke))
+        
+        terms = query_terms(role, level, "interview question questions answer technical behavioral")
+        return build_context(
+            f"Interview Questions for {role} ({level} level)", results, terms, max_tokens,
+            label="Resource", show_urls=False,
+        )
+    except Overloaded:
+        raise
+    except Exception as e:
+        _research_failed("interview")
+        return f"Error getting interview questions: {str(e)}"
+
+
+def _salary_results(role: str, location: str, level: str = "") -> list:
+    """Salary search results; the figures in them are added to the salary dataset."""
+    search = get_search(TAVILY_KEY)
+    title = f"{level} {role}" if level else role
+    query = f"{title} salary {location} 2024 2025 compensation range total comp"
+    with span("search"):
+        results = get_search_cache().get_or_search("salary", query, search.invoke)
+    with span("salary_parse"):
+        get_salary_dataset().add(role, location, parse_results(results), level)
+    return results
+
+
+def salary_research(role: str, location: str, max_tokens: int = DEFAULT_TOKEN_BUDGET, level: str = "") -> str:
+    """Get salary ranges and compensation data."""
+    try:
+        results = _check_results("salary", _salary_results(role, location, level))
+        
+        title = f"{level} {role}" if level else role
+        terms = query_terms(title, location, "salary base total compensation bonus equity range average $ € £")
+        return build_context(f"Salary Research: {title} in {location}", results, terms, max_tokens)
+    except Overloaded:
+        raise
+    except Exception as e:
+        _research_failed("salary")
+        return f"Error researching salary: {str(e)}"
+
+
+def resume_tips(role: str, experience: str, max_tokens: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Get resume writing tips and best practices."""
+    try:
+        search = get_search(TAVILY_KEY)
+        query = f"{role} resume tips best practices {experience} 2024 ATS"
+        with span("search"):
+            results = _check_results("resume", get_search_cache().get_or_search("resume", query, search.invoke))
+        
+        terms = query_terms(role, experience, "resume ats keywords skills achievements format sections recruiters")
+        return build_context(f"Resume Tips for {role}", results, terms, max_tokens, label="Tip", show_urls=False)
+    except Overloaded:
+        raise
+    except Exception as e:
+        _research_failed("resume")
+        return f"Error getting resume tips: {str(e)}"
+
+
+def industry_trends(industry: str, max_tokens: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Get latest industry trends, hot skills, and market insights."""
+    try:
+        search = get_search(TAVILY_KEY, search_depth="advanced")
+        query = f"{industry} industry trends 2024 2025 hot skills in-demand jobs"
+        with span("search"):
+            results = _check_results("trends", get_search_cache().get_or_search("trends", query, search.invoke))
+        
+        terms = query_terms(industry, "trends growth skills demand jobs hiring emerging technologies")
+        return build_context(f"Industry Trends: {industry}", results, terms, max_tokens, label="Insight")
+    except Overloaded:
+        raise
+    except Exception as e:
+        _research_failed("trends")
+        return f"Error getting industry trends: {str(e)}"
+
+
+def initialize_llm(model_choice):
+    """Initialize the LLM based on model choice.
+
+    The chosen provider is preferred; the other one (when it has a key) is
+    used for hedged requests and failover, and is only built the first time
+    a request is sent to it.
+    """
+    keys = {"OpenAI": OPENAI_KEY, "Gemini": GEMINI_KEY}
+    providers = {model_choice: get_llm(model_choice, api_key=keys[model_choice], temperature=0.7)}
+    for name in keys:
+        if name != model_choice and llm_configured(keys[name]):
+            providers[name] = LazyProvider(
+                lambda name=name: get_llm(name, api_key=keys[name], temperature=0.7), model_name=LLM_MODELS[name]
+            )
+    return LLMDispatcher(providers, preferred=model_choice)
+
+
+def warm_up(model_choice):
+    """Build the selected LLM client, the search tools and the token encoder in the background, once per process.
+
+    The backup provider is left to its LazyProvider, so its SDK is only
+    imported when the dispatcher first hedges or fails over to it.
+    """
+    if not WARM_UP:
+        return None
+    keys = {"OpenAI": OPENAI_KEY, "Gemini": GEMINI_KEY}
+    return start_warm_up([
+        lambda: get_llm(model_choice, api_key=keys[model_choice], temperature=0.7),
+        lambda: get_search(TAVILY_KEY, search_depth="advanced"),
+        lambda: get_search(TAVILY_KEY),
+        get_encoding,
+    ])
+
+
+def model_name(llm) -> str:
+    """Model behind an LLM client, e.g. gpt-4o-mini"""
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or ""
+    return str(model).removeprefix("models/")
+
+
+def context_budget(llm) -> int:
+    """Research token budget for the model behind an LLM client"""
+    return budget_for(model_name(llm))
+
+
+def build_prompt(user_query: str, route=None, max_tokens: int = DEFAULT_TOKEN_BUDGET, llm=None) -> str:
+    """Route the query, run the matching research helper, and build the LLM prompt.
+
+    With an llm, long job descriptions are pre-analyzed section by section.
+    """
+    with span("prompt"):
+        return _build_prompt(user_query, route or route_query(user_query), max_tokens, llm)
+
+
+def _build_prompt(user_query: str, route, max_tokens: int, llm=None) -> str:
+    # Company research
+    if route.intent == "company" and route.company:
+        search_results = search_company_info(route.company, max_tokens)
+        
+        return f"""You are a career assistant. Based on this research about {route.company}, 
+        provide a comprehensive summary including recent news, company culture, and any important updates.
+        
+        Research Data:
+        {search_results}
+        
+        Provide a well-structured, informative response."""
+    
+    # Salary research
+    if route.intent == "salary" and route.role and route.location:
+        search_results = salary_research(route.role, route.location, max_tokens, route.level)
+        title = f"{route.level} {route.role}" if route.level else route.role
+        
+        return f"""You are a career assistant. Based on this salary research data, 
+        provide a comprehensive salary analysis for {title} in {route.location}.
+        
+        Research Data:
+        {search_results}
+        
+        Include base salary ranges, total compensation, and benefits information."""
+    
+    # Interview questions
+    if route.intent == "interview" and route.role:
+        search_results = get_interview_questions(route.role, route.level, max_tokens)
+        
+        return f"""You are a career assistant. Based on this interview questions research, 
+        provide comprehensive interview preparation guidance for {route.role} at {route.level} level.
+        
+        Research Data:
+        {search_results}
+        
+        Include both technical and behavioral questions with sample answers."""
+    
+    # Resume tips
+    if route.intent == "resume" and route.role:
+        search_results = resume_tips(route.role, route.experience, max_tokens)
+        
+        return f"""You are a career assistant. Based on this resume tips research, 
+        provide comprehensive resume guidance for {route.role}.
+        
+        Research Data:
+        {search_results}
+        
+        Include formatting advice, key sections, and what recruiters look for."""
+    
+    # Industry trends
+    if route.intent == "trends" and route.industry:
+        search_results = industry_trends(route.industry, max_tokens)
+        
+        return f"""You are a career assistant. Based on this industry trends research, 
+        provide comprehensive insights about the {route.industry} industry.
+        
+        Research Data:
+        {search_results}
+        
+        Include hot skills, emerging technologies, and job market insights."""
+    
+    # Job description analysis (long postings are analyzed section by section)
+    if route.intent == "jd":
+        return build_jd_prompt(user_query, llm)
+    
+    # General career advice (also the fallback when no details could be extracted)
+    return f"""You are a helpful career assistant specializing in job search, interview prep, 
+    resume optimization, and career advice. 
+    
+    User Question: {user_query}
+    
+    Provide helpful, actionable career advice."""
+
+
+def salary_from_dataset(route, max_tokens: int = DEFAULT_TOKEN_BUDGET):
+    """(table, narrative prompt or None) from the salary dataset, searching first if it has too few figures.
+
+    Returns None when there are still too few figures, so the answer comes from the LLM.
+    """
+    dataset = get_salary_dataset()
+    # Background refreshes always search again so new figures are added
+    summary = None if is_refreshing() else dataset.summary(route.role, route.location, level=route.level)
+    # A level with too few figures of its own is searched before falling back to every level's
+    if summary is None or (route.level and not summary["level"]):
+        try:
+            _salary_results(route.role, route.location, route.level)
+        except Exception:
+            if summary is None:
+                return None
+        else:
+            summary = dataset.summary(route.role, route.location, level=route.level)
+        if summary is None:
+            return None
+    set_attribute("salary_dataset", True)
+    table = render_summary(route.role, route.location, summary, route.level)
+    if not SALARY_NARRATIVE:
+        return table, None
+
+    research = salary_research(route.role, route.location, max_tokens, route.level)
+    title = f"{route.level} {route.role}" if route.level else route.role
+    return table, f"""You are a career assistant. These salary figures for {title} in {route.location} were already shown to the user:
+
+        {table}
+
+        Research Data:
+        {research}
+
+        In a short paragraph, explain what drives the spread (seniority, company type, equity) and mention
+        typical benefits. Do not repeat the table or restate the numbers."""
+
+
+def prepare_answer(user_query: str, route, llm) -> tuple:
+    """(preamble, prompt): text known before the LLM call, if any, and the prompt for the rest of the answer.
+
+    The prompt is None when the preamble is the whole answer.
+    """
+    local = None
+    if route.intent == "jd" and JD_ANALYSIS == "local":
+        with span("prompt"):
+            local = analyze_job_description(user_query)
+    elif route.intent == "salary" and route.role and route.location:
+        with span("prompt"):
+            local = salary_from_dataset(route, context_budget(llm))
+    if local is not None:
+        if local[1] is None:
+            set_attribute("provider", "local data")
+        return local
+    return "", build_prompt(user_query, route, context_budget(llm), llm)
+
+
+def format_error(e: Exception) -> str:
+    """User-facing message for a failed request"""
+    if isinstance(e, Overloaded):
+        return f"The assistant is very busy right now. {e}"
+    return f"I encountered an error processing your request: {str(e)}\n\nPlease try rephrasing your question or contact support."
+
+
+def _route(user_query: str, route=None):
+    # Callers that already know the intent and slots (the API's quick-action endpoints) pass a route
+    if route is None:
+        with span("routing"):
+            route = route_query(user_query)
+    set_attribute("intent", route.intent)
+    return route
+
+
+def request_key(user_query: str, route, llm) -> tuple:
+    """Identical requests (same model, intent, normalized slots and wording) share one upstream call"""
+    return (model_name(llm),) + get_answer_cache().request_key(user_query, route)
+
+
+def _cached_answer(user_query: str, route, llm):
+    """Cached answer for the query, or None; a stale one is served while a refresh is queued"""
+    entry = get_answer_cache().lookup_entry(user_query, route, allow_stale=True)
+    if entry is None:
+        return None
+    set_attribute("cached", True)
+    if entry["stale"]:
+        set_attribute("stale", True)
+        get_prefetcher().revalidate(user_query, llm)
+    return entry["answer"]
+
+
+def answer_query(user_query: str, llm) -> str:
+    """Process user query and return response, letting errors propagate"""
+    route = _route(user_query)
+    cached = _cached_answer(user_query, route, llm)
+    if cached is not None:
+        return cached
+
+    return answer_flights.do(request_key(user_query, route, llm), lambda: _invoke(user_query, route, llm))
+
+
+def refresh_answer(user_query: str, llm) -> str:
+    """Answer the query without reading the answer cache, replacing the cached answer"""
+    route = _route(user_query)
+    return answer_flights.do(request_key(user_query, route, llm), lambda: _invoke(user_query, route, llm))
+
+
+def _store(user_query: str, route, answer: str, latency: float, research_failures: list):
+    # An answer written without its research would be served long after the search recovers
+    if not research_failures:
+        get_answer_cache().store(user_query, route, answer, latency)
+
+
+def _invoke(user_query: str, route, llm) -> str:
+    start = time.perf_counter()
+    with _collect_research_failures() as failures:
+        preamble, prompt = prepare_answer(user_query, route, llm)
+    answer = preamble
+    if prompt is not None:
+        with span("llm"):
+            response = llm.invoke(prompt)
+        record_llm_usage(prompt, response.content, getattr(response, "usage_metadata", None))
+        answer += response.content
+    _store(user_query, route, answer, time.perf_counter() - start, failures)
+    return answer
+
+
+def process_query(user_query: str, llm):
+    """Process user query and return response"""
+    try:
+        return answer_query(user_query, llm)
+    except Exception as e:
+        return format_error(e)
+
+
+def stream_query(user_query: str, llm, timing: dict = None, route=None, raise_overloaded: bool = False):
+    """Process user query and yield the response as it is generated.
+
+    If a timing dict is passed it receives time_to_first_token and total
+    (seconds since the call started), and cached=True for cache hits. A
+    route skips routing the query text. Errors are yielded as their message;
+    with raise_overloaded, Overloaded is raised instead so the caller can
+    answer "try again later" in its own way (the HTTP API sends a 503).
+    """
+    timing = timing if timing is not None else {}
+    start = time.perf_counter()
+    try:
+        route = _route(user_query, route)
+        cached = _cached_answer(user_query, route, llm)
+        if cached is not None:
+            timing["cached"] = True
+            yield cached
+            return
+
+        key = request_key(user_query, route, llm)
+        for chunk in answer_flights.stream(key, lambda: _stream(user_query, route, llm)):
+            timing.setdefault("time_to_first_token", time.perf_counter() - start)
+            yield chunk
+    except Overloaded as e:
+        if raise_overloaded:
+            raise
+        yield format_error(e)
+    except Exception as e:
+        yield format_error(e)
+    finally:
+        timing.setdefault("time_to_first_token", time.perf_counter() - start)
+        timing["total"] = time.perf_counter() - start
+
+
+def _stream(user_query: str, route, llm):
+    start = time.perf_counter()
+    with _collect_research_failures() as failures:
+        preamble, prompt = prepare_answer(user_query, route, llm)
+    chunks = []
+    usage = None
+    if preamble:
+        # The locally built part of the answer shows before the LLM starts
+        yield preamble
+    if prompt is None:
+        _store(user_query, route, preamble, time.perf_counter() - start, failures)
+        return
+    # Only time spent waiting on the provider counts as "llm"; time between
+    # yields belongs to whoever consumes the stream (e.g. rendering)
+    stream = iter(llm.stream(prompt))
+    llm_seconds = 0.0
+    while True:
+        waited = time.perf_counter()
+        chunk = next(stream, None)
+        llm_seconds += time.perf_counter() - waited
+        if chunk is None:
+            break
+        usage = getattr(chunk, "usage_metadata", None) or usage
+        if not chunk.content:
+            continue
+        if not chunks:
+            record("llm", llm_seconds)
+            llm_seconds = 0.0
+        chunks.append(chunk.content)
+        yield chunk.content
+    record("llm", llm_seconds)
+    answer = "".join(chunks)
+    record_llm_usage(prompt, answer, usage)
+    _store(user_query, route, preamble + answer, time.perf_counter() - start, failures)
@@ -0,0 +1,170 @@
+"""Run a JSONL file of queries through the assistant pipeline without the UI.
+
+Each input line is either a free-text query or a quick action with its fields:
+
+    {"id": "q1", "query": "salary for data scientist in NYC"}
+    {"id": "q2", "action": "company", "company": "Stripe"}
+    {"id": "q3", "action": "interview", "role": "Product Manager", "level": "senior"}
+
+Results are appended to the output file as they finish, one JSON object per
+line. Re-running with the same output file skips ids that already succeeded,
+so an interrupted run resumes where it stopped.
+
+    python batch.py queries.jsonl -o answers.jsonl --workers 8 --model Gemini
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from assistant import QUICK_ACTION_QUERIES, _collect_research_failures, answer_query, initialize_llm
+from metrics import metrics, trace_request
+from ratelimit import Overloaded, priority
+from router import route_query
+
+QUICK_ACTION_DEFAULTS = {"level": "mid", "experience": ""}
+# When the upstream limiter turns a job away, wait and retry instead of recording an error
+OVERLOAD_RETRIES = int(os.getenv("BATCH_OVERLOAD_RETRIES", "5"))
+OVERLOAD_BACKOFF = float(os.getenv("BATCH_OVERLOAD_BACKOFF_SECONDS", "10"))
+
+
+def read_jobs(path: str):
+    """Yield (id, query) pairs from the input file, skipping blank and malformed lines."""
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                job_id = str(record.get("id", line_number))
+                if "query" in record:
+                    query = record["query"]
+                else:
+                    fields = {**QUICK_ACTION_DEFAULTS, **record}
+                    query = QUICK_ACTION_QUERIES[record["action"]].format(**fields)
+            except (ValueError, KeyError) as e:
+                print(f"Skipping line {line_number}: {e!r}", file=sys.stderr)
+                continue
+            yield job_id, query
+
+
+def completed_ids(path: str) -> set:
+    """Ids already answered without error in a previous run."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash can leave the last line half-written
+                continue
+            if not record.get("error"):
+                done.add(record["id"])
+    return done
+
+
+def terminate_partial_line(path: str):
+    """End a line left half-written by a crash so new results start on a fresh line."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def run_job(job_id: str, query: str, llm) -> dict:
+    start = time.perf_counter()
+    result = {"id": job_id, "query": query, "intent": route_query(query).intent}
+    try:
+        for attempt in range(OVERLOAD_RETRIES + 1):
+            try:
+                with trace_request("batch"), priority("batch"), _collect_research_failures() as failures:
+                    result["answer"] = answer_query(query, llm)
+                break
+            except Overloaded:
+                if attempt == OVERLOAD_RETRIES:
+                    raise
+                # Interactive traffic has the upstream; back off and let it through
+                time.sleep(OVERLOAD_BACKOFF * (attempt + 1))
+        # The answer was written without (some of) its research; keep it, but
+        # as an error so a re-run answers the query again
+        result["error"] = f"Research failed: {', '.join(failures)}" if failures else None
+    except Exception as e:
+        result["answer"] = None
+        result["error"] = str(e)
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def report(stats: dict, start: float, final: bool = False):
+    minutes = max(time.perf_counter() - start, 1e-9) / 60
+    label = "Finished" if final else "Progress"
+    print(
+        f"{label}: {stats['done']} answered, {stats['errors']} errors, {stats['skipped']} skipped, "
+        f"{stats['done'] / minutes:.1f} queries/min",
+        file=sys.stderr,
+    )
+
+
+def run_batch(input_path: str, output_path: str, model_choice: str, workers: int, report_every: int = 25) -> dict:
+    llm = initialize_llm(model_choice)
+    already_done = completed_ids(output_path)
+    stats = {"done": 0, "errors": 0, "skipped": 0}
+    start = time.perf_counter()
+
+    terminate_partial_line(output_path)
+
+    with open(output_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+
+        def drain(return_when):
+            nonlocal pending
+            finished, pending = wait(pending, return_when=return_when)
+            for future in finished:
+                result = future.result()
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                stats["done"] += 1
+                stats["errors"] += result["error"] is not None
+                if stats["done"] % report_every == 0:
+                    report(stats, start)
+
+        for job_id, query in read_jobs(input_path):
+            if job_id in already_done:
+                stats["skipped"] += 1
+                continue
+            # Keep the queue bounded so huge input files are streamed, not loaded
+            if len(pending) >= workers * 2:
+                drain(FIRST_COMPLETED)
+            pending.add(pool.submit(run_job, job_id, query, llm))
+        if pending:
+            drain(ALL_COMPLETED)
+
+    stats["queries_per_minute"] = stats["done"] / max(time.perf_counter() - start, 1e-9) * 60
+    report(stats, start, final=True)
+    metrics.dump()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a JSONL file of queries through the career assistant.")
+    parser.add_argument("input", help="JSONL file of queries")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file to append results to")
+    parser.add_argument("--model", choices=["OpenAI", "Gemini"], default="OpenAI")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent queries")
+    parser.add_argument("--report-every", type=int, default=25, help="print progress every N results")
+    args = parser.parse_args()
+
+    stats = run_batch(args.input, args.output, args.model, args.workers, args.report_every)
+    return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Concurrent SSE clients against the HTTP API (api.py) with 1 and more workers.
+
+The API is started in a subprocess with uvicorn, serving the pipeline over
+the stand-in Tavily and LLMs (caches off, as in bench_pipeline). Each client
+streams answers to the intent queries back to back; time to the first
+"chunk" event, total time and throughput are reported per worker count and
+concurrency level.
+
+    python -m benchmarks.bench_api --workers 1,4 --concurrency 16,64 --requests 4
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.bench_pipeline import INTENT_QUERIES, disable_caches, install_fakes, percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def serve_app():
+    """uvicorn app factory: the API over stand-in backends, built in each worker process."""
+    import api
+
+    args = argparse.Namespace(
+        scale=float(os.environ["BENCH_API_SCALE"]), chunks=40, content_chars=800,
+        spike_rate=0.0, spike_seconds=0.0, rate_limits=False,
+    )
+    install_fakes(args)
+    disable_caches(tempfile.mkdtemp(prefix="career-bench-api-"))
+    return api.app
+
+
+def start_server(port: int, workers: int, scale: float):
+    code = (
+        "import uvicorn; uvicorn.run('benchmarks.bench_api:serve_app', factory=True, "
+        f"port={port}, workers={workers}, log_level='warning')"
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-c", code], cwd=ROOT, env={**os.environ, "BENCH_API_SCALE": str(scale), "CLIENT_WARM_UP": "0"}
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/healthz").status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("API server did not start")
+
+
+async def ask(client: httpx.AsyncClient, query: str) -> tuple:
+    """(time to first chunk, total) for one streamed answer."""
+    start = time.perf_counter()
+    first = None
+    async with client.stream("POST", "/v1/chat", json={"query": query}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if first is None and line == "event: chunk":
+                first = time.perf_counter() - start
+    return first or 0.0, time.perf_counter() - start
+
+
+async def load(port: int, concurrency: int, requests: int) -> dict:
+    queries = list(INTENT_QUERIES.values())
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120) as client:
+        async def user(index: int):
+            return [await ask(client, queries[(index + i) % len(queries)]) for i in range(requests)]
+
+        start = time.perf_counter()
+        runs = [run for runs in await asyncio.gather(*(user(i) for i in range(concurrency))) for run in runs]
+        elapsed = time.perf_counter() - start
+    ttfts, totals = [r[0] for r in runs], [r[1] for r in runs]
+    return {
+        "requests": len(runs),
+        "throughput_rps": len(runs) / elapsed,
+        "ttft_p50": percentile(ttfts, 50),
+        "ttft_p95": percentile(ttfts, 95),
+        "p50": percentile(totals, 50),
+        "p95": percentile(totals, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,4", help="comma-separated uvicorn worker counts")
+    parser.add_argument("--concurrency", default="16,64", help="comma-separated concurrent clients")
+    parser.add_argument("--requests", type=int, default=4, help="answers streamed per client")
+    parser.add_argument("--scale", type=float, default=0.1, help="multiplier for all simulated latencies")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'workers':<9}{'clients':>8}{'requests':>10}{'req/s':>9}{'ttft50':>8}{'ttft95':>8}{'p50':>8}{'p95':>8}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        server = start_server(args.port, workers, args.scale)
+        try:
+            for concurrency in (int(c) for c in args.concurrency.split(",")):
+                stats = asyncio.run(load(args.port, concurrency, args.requests))
+                print(
+                    f"{workers:<9}{concurrency:>8}{stats['requests']:>10}{stats['throughput_rps']:>9.1f}"
+                    f"{stats['ttft_p50']:>8.3f}{stats['ttft_p95']:>8.3f}{stats['p50']:>8.3f}{stats['p95']:>8.3f}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
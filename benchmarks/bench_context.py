@@ -0,0 +1,119 @@
+"""Prompt size and latency before/after research context compaction.
+
+Builds realistic search results (long snippets with site boilerplate and
+syndicated duplicates), then compares the old verbatim formatting with
+build_context at the configured token budget: tokens, compaction time, and
+simulated LLM time with a per-prompt-token prefill cost.
+
+    python -m benchmarks.bench_context --queries 200 --budget 1500
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.fakes import FakeChatModel
+from context import build_context, count_tokens, query_terms
+
+ROLES = ["data scientist", "software engineer", "product manager", "nurse", "financial analyst", "UX designer"]
+LOCATIONS = ["New York", "Austin", "London", "Berlin", "Remote", "Toronto"]
+BOILERPLATE = [
+    "Accept all cookies to continue.", "Sign up for our free newsletter.", "Skip to main content.",
+    "Share this article on LinkedIn.", "All rights reserved.", "Create a free account to see more salaries.",
+    "Download our app for personalized insights.", "Read more.",
+]
+FILLER = [
+    "Our mission is to help people everywhere find jobs and companies they love.",
+    "This page is updated regularly based on anonymous submissions.",
+    "Explore related pages below to learn more about careers in this field.",
+    "Data may vary depending on company size, industry and experience.",
+    "Browse thousands of open positions from top employers.",
+]
+
+
+def relevant_sentences(role: str, location: str, rng: random.Random) -> list:
+    low = rng.randrange(60, 140) * 1000
+    high = low + rng.randrange(20, 80) * 1000
+    return [
+        f"The average base salary for a {role} in {location} is ${(low + high) // 2:,} per year.",
+        f"Total compensation for a {role} in {location} ranges from ${low:,} to ${high:,} including bonus.",
+        f"Senior {role} roles in {location} can earn equity on top of base salary.",
+        f"Entry-level {role} salaries in {location} start around ${low - 15000:,}.",
+        f"Compensation for a {role} depends on experience, with the top 10% earning over ${high + 30000:,}.",
+    ]
+
+
+def make_results(role: str, location: str, rng: random.Random, sources: int = 5, chars: int = 3000) -> list:
+    facts = relevant_sentences(role, location, rng)
+    syndicated = " ".join(rng.sample(facts, 2))
+    results = []
+    for index in range(sources):
+        sentences = []
+        while sum(len(s) for s in sentences) < chars:
+            pool = rng.choice([BOILERPLATE, FILLER, facts, FILLER])
+            sentences.append(rng.choice(pool))
+        if index % 2 == 0:
+            # The same wire copy shows up on several sites
+            sentences.insert(rng.randrange(len(sentences)), syndicated)
+        results.append({"url": f"https://site{index}.example.com/{role.replace(' ', '-')}", "content": " ".join(sentences)})
+    return results
+
+
+def legacy_context(title: str, results: list) -> str:
+    """The verbatim formatting the helpers used before compaction."""
+    content = f"# {title}\n\n"
+    for idx, item in enumerate(results, 1):
+        content += f"**Source {idx}:** {item.get('content', '')}\n"
+        content += f"URL: {item.get('url', '')}\n\n"
+    return content
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=1500, help="research token budget")
+    parser.add_argument("--chars", type=int, default=3000, help="characters per search result")
+    parser.add_argument("--llm-samples", type=int, default=10, help="simulated LLM calls per variant")
+    parser.add_argument("--prefill", type=float, default=0.0002, help="simulated seconds per prompt token")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    before_tokens, after_tokens, compaction_ms = [], [], []
+    samples = []
+    for _ in range(args.queries):
+        role, location = rng.choice(ROLES), rng.choice(LOCATIONS)
+        results = make_results(role, location, rng, chars=args.chars)
+        title = f"Salary Research: {role} in {location}"
+        before = legacy_context(title, results)
+
+        start = time.perf_counter()
+        after = build_context(title, results, query_terms(role, location, "salary base total compensation bonus equity"), args.budget)
+        compaction_ms.append((time.perf_counter() - start) * 1000)
+
+        before_tokens.append(count_tokens(before))
+        after_tokens.append(count_tokens(after))
+        if len(samples) < args.llm_samples:
+            samples.append((before, after))
+
+    llm = FakeChatModel(time_to_first_token=0.05, chunk_delay=0, chunks=1, jitter=0, prompt_token_seconds=args.prefill)
+
+    def timed(prompt):
+        start = time.perf_counter()
+        llm.invoke(prompt)
+        return time.perf_counter() - start
+
+    llm_before = sum(timed(before) for before, _ in samples) / len(samples)
+    llm_after = sum(timed(after) for _, after in samples) / len(samples)
+
+    mean = lambda values: sum(values) / len(values)
+    print(f"queries: {args.queries}  budget: {args.budget} tokens")
+    print(f"research tokens   before: {mean(before_tokens):8.0f}  after: {mean(after_tokens):8.0f}  "
+          f"saved: {1 - mean(after_tokens) / mean(before_tokens):.0%}")
+    print(f"compaction time   mean: {mean(compaction_ms):.2f} ms  max: {max(compaction_ms):.2f} ms")
+    print(f"simulated LLM     before: {llm_before:.3f}s  after: {llm_after:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Tail latency of a pinned provider vs hedged requests with failover.
+
+Both providers are local stand-ins with occasional latency spikes (and
+optionally errors). The same request stream is sent through an
+LLMDispatcher pinned to one provider and through one that hedges to the
+other provider; time to first token, total time, errors and the extra
+upstream calls spent on hedging are reported for each.
+
+    python -m benchmarks.bench_hedging --requests 300 --spike-rate 0.05
+    python -m benchmarks.bench_hedging --error-rate 0.1
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import dispatch
+from benchmarks.bench_pipeline import percentile
+from benchmarks.fakes import FakeChatModel
+from dispatch import LLMDispatcher
+
+PROMPT = "You are a career assistant. Provide a comprehensive salary analysis for data scientist in Austin."
+
+
+def make_providers(args) -> dict:
+    common = dict(
+        chunk_delay=0.01 * args.scale, chunks=args.chunks, spike_rate=args.spike_rate,
+        spike_seconds=args.spike_seconds * args.scale, error_rate=args.error_rate,
+    )
+    return {
+        "OpenAI": FakeChatModel("openai", time_to_first_token=0.4 * args.scale, seed=1, **common),
+        "Gemini": FakeChatModel("gemini", time_to_first_token=0.3 * args.scale, seed=2, **common),
+    }
+
+
+def run_one(llm) -> dict:
+    start = time.perf_counter()
+    ttft = None
+    try:
+        for chunk in llm.stream(PROMPT):
+            if ttft is None:
+                ttft = time.perf_counter() - start
+    except Exception:
+        return {"error": True}
+    return {"ttft": ttft, "total": time.perf_counter() - start, "error": False}
+
+
+def run_scenario(name: str, llm, providers: dict, args) -> dict:
+    # Rolling latency and breakers are process-wide; each scenario starts cold
+    dispatch._health.clear()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        runs = list(pool.map(lambda _: run_one(llm), range(args.requests)))
+    # Let cancelled attempts finish before reading call counts
+    time.sleep(args.spike_seconds * args.scale)
+    ok = [run for run in runs if not run["error"]]
+    ttfts = [run["ttft"] for run in ok]
+    totals = [run["total"] for run in ok]
+    calls = sum(fake.calls for fake in providers.values())
+    return {
+        "name": name,
+        "ttft_p50": percentile(ttfts, 50),
+        "ttft_p95": percentile(ttfts, 95),
+        "ttft_p99": percentile(ttfts, 99),
+        "total_p99": percentile(totals, 99),
+        "errors": len(runs) - len(ok),
+        "extra_calls": calls / args.requests - 1,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scale", type=float, default=0.25, help="multiplier for all simulated latencies")
+    parser.add_argument("--chunks", type=int, default=20, help="streamed chunks per answer")
+    parser.add_argument("--spike-rate", type=float, default=0.05, help="fraction of LLM calls with a latency spike")
+    parser.add_argument("--spike-seconds", type=float, default=5.0, help="extra latency of a spike (before --scale)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of LLM calls that fail")
+    args = parser.parse_args()
+
+    # Scale the hedge delay bounds along with the simulated latencies
+    dispatch.HEDGE_DELAY_SECONDS *= args.scale
+    dispatch.MIN_HEDGE_DELAY_SECONDS *= args.scale
+
+    results = []
+    providers = make_providers(args)
+    results.append(run_scenario("pinned", LLMDispatcher({"OpenAI": providers["OpenAI"]}, "OpenAI"), providers, args))
+    providers = make_providers(args)
+    results.append(run_scenario("hedged", LLMDispatcher(providers, "OpenAI"), providers, args))
+
+    print(f"requests: {args.requests}  concurrency: {args.concurrency}  "
+          f"spike rate: {args.spike_rate:.0%}  error rate: {args.error_rate:.0%}")
+    print(f"{'':<8}{'ttft50':>8}{'ttft95':>8}{'ttft99':>8}{'total99':>9}{'errors':>8}{'extra calls':>13}")
+    for r in results:
+        print(f"{r['name']:<8}{r['ttft_p50']:>8.3f}{r['ttft_p95']:>8.3f}{r['ttft_p99']:>8.3f}"
+              f"{r['total_p99']:>9.3f}{r['errors']:>8}{r['extra_calls']:>13.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Latency of job description analysis as postings grow: one prompt vs map-reduce.
+
+Generates postings of increasing length (responsibilities and requirements
+plus benefits, company and EEO boilerplate) and times the analysis against a
+stand-in LLM whose first-token delay grows with prompt size, as real
+providers' prefill does. "single" sends the whole posting in one prompt, as
+the app did before; "map-reduce" is build_jd_prompt followed by the answer.
+
+    python -m benchmarks.bench_jd --sizes 500,2000,8000,20000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from assistant import QUICK_ACTION_QUERIES
+from benchmarks.bench_pipeline import percentile
+from benchmarks.fakes import FakeChatModel
+from context import count_tokens
+from jd import build_jd_prompt, single_prompt
+
+SKILLS = ["Python", "SQL", "Spark", "Kafka", "Airflow", "dbt", "AWS", "GCP", "Terraform", "Kubernetes", "Docker", "Go"]
+VERBS = ["Build", "Own", "Design", "Maintain", "Improve", "Operate", "Review", "Mentor engineers on"]
+OBJECTS = ["batch pipelines", "streaming jobs", "data quality checks", "the warehouse schema", "CI/CD for data", "cost dashboards"]
+BOILERPLATE = {
+    "About us": "We are a fast-growing company on a mission to make data useful for everyone. Our team spans four continents.",
+    "Benefits": "- Health, dental and vision insurance\n- 401(k) matching and unlimited PTO\n- Home office stipend and wellness budget",
+}
+EEO = "We are an equal opportunity employer and value diversity. All applicants will receive consideration without regard to race, color, religion, sex or age."
+
+
+def make_posting(tokens: int, rng: random.Random) -> str:
+    """A posting of roughly the given size; about a third of it is boilerplate."""
+    parts = ["Senior Data Engineer", "", "About us", BOILERPLATE["About us"], ""]
+    responsibilities, requirements = ["Responsibilities"], ["Requirements"]
+    while count_tokens("\n".join(parts + responsibilities + requirements)) < tokens * 2 // 3:
+        responsibilities.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}")
+        requirements.append(f"- {rng.randrange(2, 8)}+ years of experience with {rng.choice(SKILLS)} and {rng.choice(SKILLS)}")
+    parts += responsibilities + [""] + requirements + ["", "Nice to have", f"- {rng.choice(SKILLS)}", ""]
+    benefits = ["Benefits"]
+    while count_tokens("\n".join(parts + benefits)) < tokens:
+        benefits.append(BOILERPLATE["Benefits"])
+    return "\n".join(parts + benefits + ["", EEO])
+
+
+def timed(llm, make_prompt) -> tuple:
+    start = time.perf_counter()
+    prompt = make_prompt()
+    ttft = None
+    for _ in llm.stream(prompt):
+        if ttft is None:
+            ttft = time.perf_counter() - start
+    return ttft, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="500,2000,5000,10000,20000", help="posting sizes in tokens")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--prefill", type=float, default=0.0002, help="simulated seconds per prompt token")
+    args = parser.parse_args()
+
+    llm = FakeChatModel(time_to_first_token=0.3, chunk_delay=0.005, chunks=40, jitter=0.05, prompt_token_seconds=args.prefill)
+    rng = random.Random(3)
+    print(f"{'tokens':>8}{'single ttft':>13}{'single total':>14}{'m-r ttft':>10}{'m-r total':>11}{'prompt tokens':>15}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        posting = make_posting(size, rng)
+        query = QUICK_ACTION_QUERIES["jd"].format(job_description=posting)
+        single = [timed(llm, lambda: single_prompt(query)) for _ in range(args.iterations)]
+        mapped = [timed(llm, lambda: build_jd_prompt(query, llm)) for _ in range(args.iterations)]
+        print(
+            f"{count_tokens(posting):>8}"
+            f"{percentile([t for t, _ in single], 50):>13.3f}{percentile([t for _, t in single], 50):>14.3f}"
+            f"{percentile([t for t, _ in mapped], 50):>10.3f}{percentile([t for _, t in mapped], 50):>11.3f}"
+            f"{count_tokens(build_jd_prompt(query, llm)):>15}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
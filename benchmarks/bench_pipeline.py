@@ -0,0 +1,228 @@
+"""End-to-end pipeline benchmark against local stand-ins for Tavily and the LLMs.
+
+Drives every intent path of the router and every quick-action form query
+through stream_query (what the chat UI uses) and reports, per path:
+p50/p95/p99 latency and time to first token, prompt size, and the peak and
+retained (still allocated afterwards) memory of one run, from tracemalloc;
+then throughput at several concurrency levels.
+
+    python -m benchmarks.bench_pipeline --iterations 20 --scale 0.2
+    python -m benchmarks.bench_pipeline --json bench_output.json
+
+Caches are swapped for ones that never hit, and identical concurrent requests
+are not coalesced, unless --with-caches is given, so the numbers reflect the
+full search + LLM path.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import answer_cache
+import ratelimit
+import salaries
+import search_cache
+import singleflight
+from assistant import QUICK_ACTION_QUERIES, initialize_llm, stream_query
+from benchmarks.fakes import FakeChatModel, FakeSearch
+from clients import use_backends
+
+SAMPLE_JD = """Senior Data Engineer
+
+About us
+We are a fast-growing fintech company.
+
+Responsibilities
+- Build and maintain batch and streaming pipelines in Python and Spark
+- Own our Airflow deployment and data quality checks
+
+Requirements
+- 5+ years of experience with SQL and Python
+- Experience with AWS, Kafka and dbt
+
+Nice to have
+- Terraform, Kubernetes
+
+Benefits
+- Health, dental and vision insurance
+- 401(k) matching and unlimited PTO
+
+We are an equal opportunity employer.
+"""
+
+INTENT_QUERIES = {
+    "company": "Tell me about Stripe",
+    "salary": "salary for data scientist in NYC",
+    "interview": "interview questions for senior product manager",
+    "resume": "resume tips for frontend developer with 3 years experience",
+    "trends": "What's trending in the fintech industry?",
+    "jd": "Please analyze this job description:\n\n" + SAMPLE_JD,
+    "general": "How do I negotiate a job offer?",
+}
+
+FORM_QUERIES = {
+    "form:company": QUICK_ACTION_QUERIES["company"].format(company="Stripe"),
+    "form:interview": QUICK_ACTION_QUERIES["interview"].format(role="Product Manager", level="senior"),
+    "form:jd": QUICK_ACTION_QUERIES["jd"].format(job_description=SAMPLE_JD),
+    "form:salary": QUICK_ACTION_QUERIES["salary"].format(role="Data Scientist", location="New York"),
+    "form:resume": QUICK_ACTION_QUERIES["resume"].format(role="Frontend Developer", experience="3 years"),
+    "form:trends": QUICK_ACTION_QUERIES["trends"].format(industry="Fintech"),
+    "form:custom": "Should I accept a counteroffer from my current employer?",
+}
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def install_fakes(args) -> dict:
+    llms = {
+        "OpenAI": FakeChatModel(
+            "openai", time_to_first_token=0.4 * args.scale, chunk_delay=0.01 * args.scale,
+            chunks=args.chunks, spike_rate=args.spike_rate, spike_seconds=args.spike_seconds * args.scale, seed=1,
+        ),
+        "Gemini": FakeChatModel(
+            "gemini", time_to_first_token=0.3 * args.scale, chunk_delay=0.008 * args.scale,
+            chunks=args.chunks, spike_rate=args.spike_rate, spike_seconds=args.spike_seconds * args.scale, seed=2,
+        ),
+    }
+    searches = {}
+
+    def search_factory(max_results, search_depth):
+        key = (max_results, search_depth)
+        if key not in searches:
+            latency = (0.3 if search_depth == "basic" else 0.6) * args.scale
+            searches[key] = FakeSearch(latency=latency, max_results=max_results, content_chars=args.content_chars)
+        return searches[key]
+
+    use_backends(llm_factory=llms.__getitem__, search_factory=search_factory)
+    if not args.rate_limits:
+        # The stand-ins have no quotas; keep the upstream limiter from shaping the numbers
+        ratelimit.UPSTREAM_RPM.update(dict.fromkeys(["tavily", "OpenAI", "Gemini"], 1e9))
+    return llms
+
+
+def disable_caches(tmpdir: str):
+    # Swap the process-wide caches for ones that never produce a hit
+    search_cache._cache = search_cache.SearchCache(
+        path=os.path.join(tmpdir, "bench_search_cache.sqlite3"),
+        ttls={tool: 0 for tool in search_cache.SEARCH_TTLS},
+    )
+    answer_cache._cache = answer_cache.AnswerCache(max_age={})
+    salaries._dataset = salaries.SalaryDataset(os.path.join(tmpdir, "bench_salaries.sqlite3"))
+    # Concurrent identical requests would otherwise share one call and inflate throughput
+    singleflight.answer_flights.coalesce = False
+    singleflight.search_flights.coalesce = False
+
+
+def run_once(query: str, llm) -> dict:
+    timing = {}
+    answer = "".join(stream_query(query, llm, timing))
+    timing["answer_chars"] = len(answer)
+    return timing
+
+
+def measure_path(query: str, llm, fake, iterations: int) -> dict:
+    totals, ttfts = [], []
+    for _ in range(iterations):
+        timing = run_once(query, llm)
+        totals.append(timing["total"])
+        ttfts.append(timing["time_to_first_token"])
+    prompt_bytes = fake.prompt_bytes[-1] if fake.prompt_bytes else 0
+
+    # One extra traced run for allocation sizes: peak, and what is still held afterwards
+    tracemalloc.start()
+    run_once(query, llm)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50": percentile(totals, 50),
+        "p95": percentile(totals, 95),
+        "p99": percentile(totals, 99),
+        "ttft_p50": percentile(ttfts, 50),
+        "ttft_p95": percentile(ttfts, 95),
+        "prompt_bytes": prompt_bytes,
+        "prompt_tokens_est": prompt_bytes // 4,
+        "peak_alloc_kib": peak / 1024,
+        "retained_kib": retained / 1024,
+    }
+
+
+def measure_concurrency(queries: list, llm, concurrency: int, requests: int) -> dict:
+    work = [queries[i % len(queries)] for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        totals = [timing["total"] for timing in pool.map(lambda q: run_once(q, llm), work)]
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "throughput_rps": requests / elapsed,
+        "p50": percentile(totals, 50),
+        "p95": percentile(totals, 95),
+        "p99": percentile(totals, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10, help="sequential runs per path")
+    parser.add_argument("--scale", type=float, default=0.1, help="multiplier for all simulated latencies")
+    parser.add_argument("--model", choices=["OpenAI", "Gemini"], default="OpenAI")
+    parser.add_argument("--chunks", type=int, default=40, help="streamed chunks per answer")
+    parser.add_argument("--content-chars", type=int, default=800, help="characters per search result")
+    parser.add_argument("--spike-rate", type=float, default=0.0, help="fraction of LLM calls with a latency spike")
+    parser.add_argument("--spike-seconds", type=float, default=5.0, help="extra latency of a spike (before --scale)")
+    parser.add_argument("--no-hedging", action="store_true", help="pin the model instead of hedging to the other one")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated worker counts")
+    parser.add_argument("--rate-limits", action="store_true", help="apply the configured upstream rate limits")
+    parser.add_argument("--with-caches", action="store_true", help="keep the search and answer caches enabled")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    fakes = install_fakes(args)
+    tmpdir = tempfile.mkdtemp(prefix="career-bench-")
+    if not args.with_caches:
+        disable_caches(tmpdir)
+    llm = initialize_llm(args.model)
+    llm.hedging = not args.no_hedging
+
+    results = {"paths": {}, "concurrency": []}
+    print(f"{'path':<16}{'p50':>8}{'p95':>8}{'p99':>8}{'ttft50':>8}{'prompt B':>10}{'~tokens':>9}{'peak KiB':>10}{'kept KiB':>10}")
+    for name, query in {**INTENT_QUERIES, **FORM_QUERIES}.items():
+        stats = measure_path(query, llm, fakes[args.model], args.iterations)
+        results["paths"][name] = stats
+        print(
+            f"{name:<16}{stats['p50']:>8.3f}{stats['p95']:>8.3f}{stats['p99']:>8.3f}{stats['ttft_p50']:>8.3f}"
+            f"{stats['prompt_bytes']:>10}{stats['prompt_tokens_est']:>9}{stats['peak_alloc_kib']:>10.1f}{stats['retained_kib']:>10.1f}"
+        )
+
+    print(f"\n{'workers':<10}{'requests':>10}{'req/s':>10}{'p50':>8}{'p95':>8}{'p99':>8}")
+    queries = list(INTENT_QUERIES.values())
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        stats = measure_concurrency(queries, llm, concurrency, max(concurrency * 4, len(queries)))
+        results["concurrency"].append(stats)
+        print(
+            f"{concurrency:<10}{stats['requests']:>10}{stats['throughput_rps']:>10.2f}"
+            f"{stats['p50']:>8.3f}{stats['p95']:>8.3f}{stats['p99']:>8.3f}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
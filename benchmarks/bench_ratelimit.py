@@ -0,0 +1,120 @@
+"""Traffic spike against a provider quota, with and without the upstream limiter.
+
+A stand-in provider accepts a fixed number of calls per second and answers
+429 to anything above it, as OpenAI and Gemini do. Batch workers saturate it
+while interactive users send occasional requests. Without the limiter every
+call over quota fails; with it, calls wait in the priority queue and the
+interactive ones go first. Reported per priority: calls, failures and latency.
+
+    python -m benchmarks.bench_ratelimit --quota 20 --seconds 10 --batch-workers 16
+"""
+
+import argparse
+import collections
+import random
+import sys
+import threading
+import time
+
+import ratelimit
+from benchmarks.bench_pipeline import percentile
+from benchmarks.fakes import FakeChatModel
+
+
+class QuotaExceeded(RuntimeError):
+    status_code = 429
+
+
+class QuotaModel(FakeChatModel):
+    """Chat model stand-in that rejects calls beyond quota per second with a 429."""
+
+    def __init__(self, quota: float, **kwargs):
+        super().__init__(**kwargs)
+        self.quota = quota
+        self._window = collections.deque()
+        self.rejected = 0
+
+    def _first_token_delay(self, prompt="") -> float:
+        with self._lock:
+            now = time.monotonic()
+            while self._window and now - self._window[0] > 1:
+                self._window.popleft()
+            if len(self._window) >= self.quota:
+                self.rejected += 1
+                raise QuotaExceeded("429 Too Many Requests: rate limit exceeded")
+            self._window.append(now)
+        return super()._first_token_delay(prompt)
+
+
+def run_scenario(client, args) -> dict:
+    """Batch workers call back to back and interactive users with think time, for args.seconds."""
+    runs = collections.defaultdict(list)
+    lock = threading.Lock()
+    stop = time.monotonic() + args.seconds
+
+    def worker(name: str, think: float, seed: int):
+        rng = random.Random(seed)
+        with ratelimit.priority(name):
+            while time.monotonic() < stop:
+                start = time.perf_counter()
+                try:
+                    client.invoke("prompt")
+                    ok = True
+                except Exception:
+                    ok = False
+                    # A rejected call still costs a round trip
+                    time.sleep(args.latency)
+                with lock:
+                    runs[name].append((ok, time.perf_counter() - start))
+                time.sleep(rng.uniform(0, 2 * think))
+
+    threads = [threading.Thread(target=worker, args=("batch", 0, i)) for i in range(args.batch_workers)]
+    threads += [
+        threading.Thread(target=worker, args=("interactive", args.think, 100 + i)) for i in range(args.users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quota", type=float, default=20, help="provider calls accepted per second")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--batch-workers", type=int, default=16)
+    parser.add_argument("--users", type=int, default=8, help="interactive users")
+    parser.add_argument("--think", type=float, default=1.0, help="mean seconds between a user's requests")
+    parser.add_argument("--latency", type=float, default=0.2, help="provider seconds per call")
+    args = parser.parse_args()
+
+    # Limit a little under the quota with no burst, as a deployment would configure it
+    ratelimit.BURST_SECONDS = 0
+    ratelimit.UPSTREAM_RPM["OpenAI"] = args.quota * 60 * 0.9
+    ratelimit.RATE_LIMIT_RETRIES = 1
+
+    def model():
+        return QuotaModel(args.quota, time_to_first_token=args.latency, chunk_delay=0, chunks=1, seed=1)
+
+    scenarios = []
+    direct = model()
+    scenarios.append(("no limiter", run_scenario(direct, args), direct))
+    limited_model = model()
+    scenarios.append(("limiter", run_scenario(ratelimit.Limited(limited_model, "OpenAI"), args), limited_model))
+
+    print(f"quota: {args.quota:g}/s  batch workers: {args.batch_workers}  users: {args.users}  seconds: {args.seconds:g}")
+    print(f"{'':<12}{'priority':<13}{'calls':>8}{'failed':>8}{'p50':>8}{'p95':>8}{'429s':>7}")
+    for name, runs, upstream in scenarios:
+        for priority_name in ("interactive", "batch"):
+            calls = runs[priority_name]
+            seconds = [s for ok, s in calls if ok]
+            failed = sum(not ok for ok, _ in calls)
+            p50 = percentile(seconds, 50) if seconds else float("nan")
+            p95 = percentile(seconds, 95) if seconds else float("nan")
+            print(f"{name:<12}{priority_name:<13}{len(calls):>8}{failed:>8}{p50:>8.3f}{p95:>8.3f}{upstream.rejected:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Routing accuracy over the labelled corpus and per-query routing cost.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_router
+
+Exits non-zero if any labelled case is misrouted or has wrong slots.
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.router_corpus import build_corpus
+from router import route_query
+
+
+def check(cases) -> list:
+    """Cases whose intent or slots differ; slots a case does not list must be empty."""
+    failures = []
+    for query, intent, slots in cases:
+        route = route_query(query)
+        if route.intent != intent or route.slots() != slots:
+            failures.append((query, intent, slots, route))
+    return failures
+
+
+def time_routing(queries, repeat: int) -> float:
+    """Mean microseconds per route_query call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            route_query(query)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(queries)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the corpus when timing")
+    args = parser.parse_args()
+
+    cases = build_corpus()
+    failures = check(cases)
+    for query, intent, slots, route in failures[:20]:
+        print(f"MISS {query[:70]!r}\n     expected {intent} {slots}\n     got      {route}")
+
+    per_query = time_routing([case[0] for case in cases], args.repeat)
+    print(f"cases: {len(cases)}  correct: {len(cases) - len(failures)}  accuracy: {1 - len(failures) / len(cases):.2%}")
+    print(f"routing cost: {per_query:.1f} us/query")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
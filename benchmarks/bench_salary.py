@@ -0,0 +1,108 @@
+"""Salary answers from the parsed dataset vs the LLM summarizing search snippets.
+
+A stand-in Tavily returns snippets quoting salary figures in the formats real
+sources use (ranges, "K" suffixes, hourly rates, other currencies). Reports
+parser throughput, the first salary question for a role/location (search +
+parse), a repeat question answered from the dataset, the previous
+search + LLM path, and percentile aggregation over a large dataset.
+
+    python -m benchmarks.bench_salary --iterations 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import answer_cache
+import salaries
+import search_cache
+from assistant import build_prompt, stream_query
+from benchmarks.bench_jd import timed
+from benchmarks.bench_pipeline import percentile
+from benchmarks.fakes import FakeChatModel, FakeSearch
+from clients import use_backends
+from router import route_query
+
+TEMPLATES = [
+    "The average salary for a {role} in {location} is ${mid:,} per year. Salaries typically range from ${low}K to ${high}K.",
+    "{role} jobs in {location} pay between ${low},000 and ${high},000 annually, depending on experience.",
+    "Total compensation for a {role} in {location} ranges from ${tc_low}K - ${tc_high}K including bonus and stock.",
+    "Base pay: ${low}k–${high}k. Signing bonus of $15,000. Contractors earn ${hourly}/hr.",
+    "Average base salary ${mid:,} /yr; additional pay ${bonus:,}/yr. Our company raised $40M last year.",
+]
+
+
+class SalarySearch(FakeSearch):
+    def _results(self, query: str) -> list:
+        role, _, rest = query.partition(" salary ")
+        location = rest.split(" 20")[0]
+        results = []
+        for index in range(self.max_results):
+            low = self._random.randint(90, 130)
+            high = low + self._random.randint(20, 60)
+            fields = {
+                "role": role, "location": location, "low": low, "high": high, "mid": (low + high) * 500,
+                "tc_low": high, "tc_high": high + self._random.randint(40, 120),
+                "hourly": self._random.randint(50, 90), "bonus": self._random.randint(5, 30) * 1000,
+            }
+            content = f"{self.BOILERPLATE}{self._random.choice(TEMPLATES).format(**fields)} {self.BOILERPLATE}"
+            results.append({"url": f"https://example.com/salary/{index}", "content": content})
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--snippets", type=int, default=20000, help="snippets for the parser throughput test")
+    parser.add_argument("--figures", type=int, default=100000, help="dataset rows for the aggregation test")
+    args = parser.parse_args()
+
+    llm = FakeChatModel(time_to_first_token=0.4, chunk_delay=0.01, chunks=60, seed=1)
+    search = SalarySearch(latency=0.3, max_results=5, seed=2)
+    use_backends(llm_factory=lambda name: llm, search_factory=lambda max_results, search_depth: search)
+    tmpdir = tempfile.mkdtemp(prefix="bench_salary_")
+    search_cache._cache = search_cache.SearchCache(
+        path=os.path.join(tmpdir, "search.sqlite3"),
+        ttls={tool: 0 for tool in search_cache.SEARCH_TTLS}
+    )
+    answer_cache._cache = answer_cache.AnswerCache(max_age={})
+    salaries._dataset = salaries.SalaryDataset(os.path.join(tmpdir, "salaries.sqlite3"))
+
+    snippets = [r["content"] for r in search._results("Data Scientist salary New York 2024") for _ in range(args.snippets // 5)]
+    start = time.perf_counter()
+    parsed = sum(len(salaries.parse_salaries(s)) for s in snippets)
+    seconds = time.perf_counter() - start
+    print(f"parser: {len(snippets) / seconds:,.0f} snippets/s ({parsed / len(snippets):.1f} figures per snippet)")
+
+    rng = random.Random(4)
+    pairs = [(f"Role {i}", f"City {i}") for i in range(args.iterations)]
+    cold, warm, llm_path = [], [], []
+    for role, location in pairs:
+        query = f"salary for {role} in {location}"
+        for runs in (cold, warm):
+            timing = {}
+            "".join(stream_query(query, llm, timing))
+            runs.append(timing["total"])
+        route = route_query(query)
+        llm_path.append(timed(llm, lambda: build_prompt(query, route))[1])
+    print(f"{'path':<28}{'p50':>8}{'p95':>8}")
+    for label, runs in (("search + LLM (before)", llm_path), ("first query (search+parse)", cold), ("repeat query (dataset)", warm)):
+        print(f"{label:<28}{percentile(runs, 50):>8.3f}{percentile(runs, 95):>8.3f}")
+
+    figures = [
+        salaries.SalaryFigure(rng.choice(salaries.KINDS), low, low + rng.randint(0, 60000), "USD", "year", f"s{i % 50}")
+        for i, low in enumerate(rng.randint(60000, 200000) for _ in range(args.figures))
+    ]
+    salaries.get_salary_dataset().add("Data Scientist", "New York", figures)
+    start = time.perf_counter()
+    summary = salaries.get_salary_dataset().summary("Data Scientist", "New York", min_figures=1)
+    seconds = time.perf_counter() - start
+    print(f"aggregate {args.figures:,} figures (read + percentiles): {seconds * 1000:.1f} ms, median base {summary['kinds']['base']['percentiles'][50]:,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
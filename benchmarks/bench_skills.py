@@ -0,0 +1,71 @@
+"""Throughput of local skill extraction over many job descriptions.
+
+Generates postings of mixed length (see bench_jd) and runs extract_skills on
+each, reporting the automaton build time, JDs per second and per-JD latency.
+"regex" is the obvious alternative for comparison: one compiled
+word-boundary regex per lexicon alias, run over the whole posting.
+
+    python -m benchmarks.bench_skills --postings 5000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+from benchmarks.bench_jd import make_posting
+from benchmarks.bench_pipeline import percentile
+from skill_lexicon import SKILL_LEXICON
+from skills import SkillMatcher, extract_skills, get_matcher
+
+
+def regex_baseline(postings: list) -> float:
+    aliases = [name.lstrip("=") for entries in SKILL_LEXICON.values() for entry in entries for name in entry.split("|")]
+    regexes = [re.compile(r"(?<!\w)" + re.escape(alias) + r"(?!\w)", re.IGNORECASE) for alias in aliases if len(alias) > 1]
+    start = time.perf_counter()
+    for posting in postings:
+        for regex in regexes:
+            regex.search(posting)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--postings", type=int, default=2000)
+    parser.add_argument("--min-tokens", type=int, default=300)
+    parser.add_argument("--max-tokens", type=int, default=3000)
+    parser.add_argument("--baseline", type=int, default=200, help="postings to run the regex baseline on (0 to skip)")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    postings = [make_posting(rng.randint(args.min_tokens, args.max_tokens), rng) for _ in range(args.postings)]
+    size = sum(len(p) for p in postings)
+
+    start = time.perf_counter()
+    SkillMatcher()
+    build = time.perf_counter() - start
+    get_matcher()
+
+    latencies = []
+    found = 0
+    start = time.perf_counter()
+    for posting in postings:
+        t = time.perf_counter()
+        found += len(extract_skills(posting))
+        latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+
+    print(f"postings: {len(postings)} ({size / len(postings) / 1024:.1f} KB avg), skills found: {found / len(postings):.1f} avg")
+    print(f"automaton build: {build * 1000:.1f} ms")
+    print(f"aho-corasick: {len(postings) / elapsed:,.0f} JDs/s, {size / elapsed / 1e6:.1f} MB/s")
+    print(f"  per JD: p50 {percentile(latencies, 50) * 1000:.2f} ms, p99 {percentile(latencies, 99) * 1000:.2f} ms")
+    if args.baseline:
+        sample = postings[: args.baseline]
+        seconds = regex_baseline(sample)
+        print(f"regex per alias: {len(sample) / seconds:,.0f} JDs/s ({seconds / len(sample) * 1000:.2f} ms per JD)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Cold-start cost of the app's imports: import time and peak RSS per scenario.
+
+Each scenario runs in a fresh interpreter (like a new Streamlit worker), and
+the median of several runs is reported. "eager" reproduces the old clients.py,
+which imported both LLM SDKs and the Tavily tool at import time; "lazy" is the
+current import of the pipeline, with SDKs loaded by the first client built.
+
+    python -m benchmarks.bench_startup --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROVIDER_IMPORTS = """
+import langchain_openai
+import langchain_google_genai
+import langchain_community.tools.tavily_search
+"""
+
+SCENARIOS = {
+    "interpreter": "pass",
+    "eager (before)": "import assistant" + PROVIDER_IMPORTS,
+    "lazy (after)": "import assistant",
+    "lazy + one provider": "import assistant, clients\nclients.get_llm('OpenAI', api_key='sk-startup-bench')",
+    "streamlit (for scale)": "import streamlit",
+}
+
+CHILD = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, rss / 1024 if sys.platform == "darwin" else rss)
+"""
+
+
+def measure(code: str, runs: int) -> tuple:
+    """Median (seconds, peak RSS in MB) over fresh interpreters; None if the scenario fails."""
+    seconds, rss = [], []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", CHILD.format(root=ROOT, code=code)],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        if result.returncode != 0:
+            return None
+        elapsed, kilobytes = result.stdout.split()[-2:]
+        seconds.append(float(elapsed))
+        rss.append(float(kilobytes) / 1024)
+    return statistics.median(seconds), statistics.median(rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<24}{'import s':>10}{'peak RSS MB':>13}")
+    for name, code in SCENARIOS.items():
+        result = measure(code, args.runs)
+        if result is None:
+            print(f"{name:<24}{'failed (missing package?)':>23}")
+            continue
+        seconds, rss = result
+        print(f"{name:<24}{seconds:>10.3f}{rss:>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Local stand-ins for the chat models and Tavily search.
+
+They expose the subset of the ChatOpenAI / ChatGoogleGenerativeAI and
+TavilySearchResults interfaces the assistant uses (invoke, stream, ainvoke),
+with configurable latency and payload sizes, so the pipeline can be timed
+without API keys or network access.
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+
+class FakeMessage:
+    """Minimal AIMessage/AIMessageChunk look-alike."""
+
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeChatModel:
+    """Chat model that sleeps like a real provider and returns filler text."""
+
+    def __init__(
+        self,
+        name: str = "fake",
+        time_to_first_token: float = 0.3,
+        chunk_delay: float = 0.01,
+        chunks: int = 40,
+        chunk_chars: int = 24,
+        jitter: float = 0.2,
+        spike_rate: float = 0.0,
+        spike_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        prompt_token_seconds: float = 0.0,
+        seed: int = 0,
+    ):
+        self.name = name
+        self.time_to_first_token = time_to_first_token
+        self.chunk_delay = chunk_delay
+        self.chunks = chunks
+        self.chunk_chars = chunk_chars
+        self.jitter = jitter
+        self.spike_rate = spike_rate
+        self.spike_seconds = spike_seconds
+        self.error_rate = error_rate
+        # Prefill cost: extra first-token delay per prompt token (about 4 characters)
+        self.prompt_token_seconds = prompt_token_seconds
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_bytes = []
+
+    def _first_token_delay(self, prompt="") -> float:
+        with self._lock:
+            self.calls += 1
+            roll = self._random.random()
+            delay = self.time_to_first_token * (1 + self._random.uniform(-self.jitter, self.jitter))
+            delay += len(str(prompt)) / 4 * self.prompt_token_seconds
+        if roll < self.error_rate:
+            raise RuntimeError(f"{self.name}: simulated provider error")
+        if roll < self.error_rate + self.spike_rate:
+            delay += self.spike_seconds
+        return delay
+
+    def _record(self, prompt):
+        with self._lock:
+            self.prompt_bytes.append(len(str(prompt).encode()))
+
+    def _chunk(self, index: int) -> str:
+        return (f"{self.name}-{index} " * self.chunk_chars)[: self.chunk_chars]
+
+    def stream(self, prompt, **kwargs):
+        self._record(prompt)
+        time.sleep(self._first_token_delay(prompt))
+        for index in range(self.chunks):
+            if index:
+                time.sleep(self.chunk_delay)
+            yield FakeMessage(self._chunk(index))
+
+    def invoke(self, prompt, **kwargs):
+        return FakeMessage("".join(chunk.content for chunk in self.stream(prompt)))
+
+    async def ainvoke(self, prompt, **kwargs):
+        self._record(prompt)
+        await asyncio.sleep(self._first_token_delay(prompt) + self.chunk_delay * (self.chunks - 1))
+        return FakeMessage("".join(self._chunk(index) for index in range(self.chunks)))
+
+
+class FakeSearch:
+    """Tavily search tool that sleeps and returns synthetic results."""
+
+    BOILERPLATE = "Accept all cookies. Sign up for our newsletter. "
+
+    def __init__(self, latency: float = 0.2, max_results: int = 5, content_chars: int = 800, jitter: float = 0.2, seed: int = 0):
+        self.latency = latency
+        self.max_results = max_results
+        self.content_chars = content_chars
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _delay(self) -> float:
+        with self._lock:
+            self.calls += 1
+            return self.latency * (1 + self._random.uniform(-self.jitter, self.jitter))
+
+    def _results(self, query: str) -> list:
+        words = query.split()
+        results = []
+        for index in range(self.max_results):
+            body = f"{self.BOILERPLATE}{' '.join(words)} result {index}. "
+            results.append({
+                "url": f"https://example.com/{words[0].lower() if words else 'q'}/{index}",
+                "content": (body * (self.content_chars // len(body) + 1))[: self.content_chars],
+            })
+        return results
+
+    def invoke(self, query, **kwargs):
+        time.sleep(self._delay())
+        return self._results(query)
+
+    async def ainvoke(self, query, **kwargs):
+        await asyncio.sleep(self._delay())
+        return self._results(query)
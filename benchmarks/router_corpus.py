@@ -0,0 +1,110 @@
+"""Labelled routing corpus: every template is expanded over the entity lists below.
+
+Each case is (query, expected intent, expected slots). Slots not listed are
+expected to be empty, except interview level which defaults to "mid".
+"""
+
+import itertools
+
+COMPANIES = [
+    "Google", "Microsoft", "Tesla", "Goldman Sachs", "Jane Street", "OpenAI", "Stripe",
+    "Johnson & Johnson", "JPMorgan Chase", "Meta", "Shopify", "Deloitte", "Airbnb", "Nvidia",
+    "Booking.com", "Ernst and Young", "Marks and Spencer",
+]
+ROLES = [
+    "Software Engineer", "Data Scientist", "Product Manager", "machine learning engineer",
+    "Frontend Developer", "DevOps engineer", "UX designer", "registered nurse", "data analyst",
+    "engineering manager", "site reliability engineer", "financial analyst",
+    "Node.js Developer", "Research Scientist",
+]
+LOCATIONS = [
+    "San Francisco", "New York", "NYC", "Austin", "London", "Remote", "Berlin", "Toronto", "Bangalore",
+    "St. Louis", "Washington, D.C.", "Austin, TX",
+]
+INDUSTRIES = ["AI/ML", "Fintech", "Healthcare", "renewable energy", "cybersecurity", "EdTech", "biotech", "gaming"]
+LEVELS = {"entry": "entry", "mid": "mid", "senior": "senior", "junior": "entry", "staff": "senior"}
+EXPERIENCE = ["2", "3", "5", "10", "1-2"]
+
+# Form-generated queries (copied from the quick actions in file.py) and common free-text phrasings
+COMPANY_TEMPLATES = [
+    "Tell me about {company}. Include recent news, company culture, funding, and any important updates.",
+    "tell me about {company}",
+    "Research {company} for me",
+    "What is it like to work at {company}?",
+    "Can you tell me about {company}'s culture?",
+]
+SALARY_TEMPLATES = [
+    "What is the salary range for {role} in {location}? Include base salary, total compensation, and any benefits information.",
+    "salary for {role} in {location}",
+    "{role} compensation in {location}",
+    "How much does a {role} make in {location}?",
+    "What's the typical pay for a {role} in {location}",
+    "What is the salary range for {level} {role} in {location}?",
+    "How much does a {level} level {role} make in {location}?",
+]
+INTERVIEW_TEMPLATES = [
+    "Give me interview questions for {role} at {level} level. Include both technical and behavioral questions with sample answers.",
+    "interview questions for {level} {role}",
+    "How do I prepare for a {role} interview?",
+]
+RESUME_TEMPLATES = [
+    "Give me resume tips for {role} with {experience} years experience. Include formatting advice, key sections, and what recruiters look for.",
+    "How should I write my resume as a {role} with {experience} years of experience?",
+    "CV tips for {role}, {experience} yrs",
+]
+TRENDS_TEMPLATES = [
+    "What are the latest trends in {industry}? Include hot skills, emerging technologies, and job market insights.",
+    "{industry} industry trends",
+    "What's trending in the {industry} industry?",
+    "hot skills in {industry}",
+]
+JD_TEMPLATES = [
+    "Analyze this job description and extract key skills, requirements, responsibilities, and suggest how I should tailor my resume:\n\nAbout us: we build engineering tools in {location}.\nSalary: competitive. Interview process: 3 rounds.",
+    "Please analyze this job description for a {role}:\n\nWe are hiring in {location}.",
+]
+GENERAL_QUERIES = [
+    "How do I negotiate a job offer?",
+    "Should I accept a counteroffer from my current employer?",
+    "How can I switch careers into tech?",
+    "What should I wear to a video call with a recruiter?",
+    "How do I ask for a promotion?",
+    "Is it okay to follow up after applying?",
+    "What does a good LinkedIn headline look like?",
+    "How long should I stay in my first job?",
+    "What does a job description usually include?",
+    # Intent keywords, but nothing that fits a role, location or company
+    "What are interview questions about leadership?",
+    "What should I include in my resume about my pay history?",
+    "How do you answer interview questions about weaknesses?",
+]
+
+
+def _expand(templates, **values):
+    keys = list(values)
+    for template in templates:
+        used = [key for key in keys if "{" + key + "}" in template]
+        for combo in itertools.product(*(values[key] for key in used)):
+            yield template, dict(zip(used, combo))
+
+
+def build_corpus() -> list:
+    cases = []
+    for template, v in _expand(COMPANY_TEMPLATES, company=COMPANIES):
+        cases.append((template.format(**v), "company", {"company": v["company"]}))
+    for template, v in _expand(SALARY_TEMPLATES, role=ROLES, location=LOCATIONS, level=list(LEVELS)):
+        slots = {"role": v["role"], "location": v["location"]}
+        if "level" in v:
+            slots["level"] = LEVELS[v["level"]]
+        cases.append((template.format(**v), "salary", slots))
+    for template, v in _expand(INTERVIEW_TEMPLATES, role=ROLES, level=list(LEVELS)):
+        expected_level = LEVELS[v["level"]] if "level" in v else "mid"
+        cases.append((template.format(**v), "interview", {"role": v["role"], "level": expected_level}))
+    for template, v in _expand(RESUME_TEMPLATES, role=ROLES, experience=EXPERIENCE):
+        cases.append((template.format(**v), "resume", {"role": v["role"], "experience": f"{v['experience']} years"}))
+    for template, v in _expand(TRENDS_TEMPLATES, industry=INDUSTRIES):
+        cases.append((template.format(**v), "trends", {"industry": v["industry"]}))
+    for template, v in _expand(JD_TEMPLATES, role=ROLES, location=LOCATIONS):
+        cases.append((template.format(**v), "jd", {}))
+    for query in GENERAL_QUERIES:
+        cases.append((query, "general", {}))
+    return cases
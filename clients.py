@@ -0,0 +1,201 @@
+import os
+import threading
+
+import httpx
+
+from ratelimit import Limited
+
+# ---------------------
+# Shared clients
+# ---------------------
+# One registry per process. Streamlit re-executes the page script on every
+# rerun but imports this module once, so clients created here are shared by
+# every session and thread instead of being rebuilt per session. Provider
+# SDKs are imported when their first client is built, not at import time, so
+# a cold start only pays for the providers a session actually uses. Every
+# client handed out is wrapped so its calls go through the upstream's shared
+# rate limiter (ratelimit.py).
+
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+# Build the provider clients in the background once the first page is shown
+WARM_UP = os.getenv("CLIENT_WARM_UP", "1") != "0"
+
+LLM_MODELS = {
+    "OpenAI": "gpt-4o-mini",
+    "Gemini": "gemini-2.0-flash-exp",
+}
+
+
+class ClientRegistry:
+    """Thread-safe get-or-create store for long-lived client objects."""
+
+    def __init__(self):
+        self._clients = {}
+        # Guards the dicts only; factories run under their key's own lock
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._created = {}
+        self._reused = {}
+
+    def _key_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: tuple, factory):
+        client = self._clients.get(key)
+        if client is None:
+            # A slow first build (SDK import, client set-up) only holds up callers of the same key
+            with self._key_lock(key):
+                client = self._clients.get(key)
+                if client is None:
+                    client = factory()
+                    with self._lock:
+                        self._clients[key] = client
+                        self._created[key] = self._created.get(key, 0) + 1
+                    return client
+        with self._lock:
+            self._reused[key] = self._reused.get(key, 0) + 1
+        return client
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                ":".join(str(part) for part in key): {
+                    "created": self._created.get(key, 0),
+                    "reused": self._reused.get(key, 0),
+                }
+                for key in self._clients
+            }
+
+
+class PoolCounter:
+    """Counts requests going through the shared HTTP pool via httpx event hooks."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.received = 0
+
+    def on_request(self, request):
+        with self._lock:
+            self.sent += 1
+
+    def on_response(self, response):
+        with self._lock:
+            self.received += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.sent,
+                "in_flight": self.sent - self.received,
+                "max_connections": MAX_CONNECTIONS,
+                "max_keepalive": MAX_KEEPALIVE,
+            }
+
+
+registry = ClientRegistry()
+pool_counter = PoolCounter()
+
+# Stand-in factories installed by use_backends(), e.g. for benchmarks
+_backends = {}
+
+
+def use_backends(llm_factory=None, search_factory=None):
+    """Route get_llm/get_search to stand-in factories (None restores the real clients).
+
+    llm_factory(model_choice) and search_factory(max_results, search_depth)
+    must return objects with the same invoke/stream interface.
+    """
+    _backends["llm"] = llm_factory
+    _backends["search"] = search_factory
+
+
+def get_http_client() -> httpx.Client:
+    """Keep-alive connection pool shared by every HTTP-based LLM client."""
+    return registry.get(
+        ("http",),
+        lambda: httpx.Client(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            event_hooks={"request": [pool_counter.on_request], "response": [pool_counter.on_response]},
+        ),
+    )
+
+
+def llm_configured(api_key: str) -> bool:
+    """Whether get_llm can build a provider's client: it has a key, or stand-ins are installed."""
+    return bool(api_key or _backends.get("llm"))
+
+
+def get_llm(model_choice: str, api_key: str, temperature: float = 0.7):
+    """Shared chat model for a provider; identical settings always return the same instance."""
+    if _backends.get("llm"):
+        return Limited(_backends["llm"](model_choice), model_choice)
+    model = LLM_MODELS[model_choice]
+    if model_choice == "OpenAI":
+        def factory():
+            from langchain_openai import ChatOpenAI
+
+            client = ChatOpenAI(model=model, api_key=api_key, temperature=temperature, http_client=get_http_client())
+            return Limited(client, model_choice)
+    else:
+        def factory():
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            # The Gemini SDK manages its own channel; sharing the instance shares that channel
+            return Limited(ChatGoogleGenerativeAI(model=model, api_key=api_key, temperature=temperature), model_choice)
+    return registry.get(("llm", model_choice, model, temperature), factory)
+
+
+def get_search(api_key: str, max_results: int = 5, search_depth: str = None):
+    """Shared Tavily search tool (TavilySearchResults) for a given result count and depth.
+
+    Without a search_depth the tool's own default is used.
+    """
+    if _backends.get("search"):
+        return Limited(_backends["search"](max_results, search_depth), "tavily")
+
+    def factory():
+        from langchain_community.tools.tavily_search import TavilySearchResults
+
+        options = {"search_depth": search_depth} if search_depth else {}
+        return Limited(TavilySearchResults(max_results=max_results, api_key=api_key, **options), "tavily")
+
+    return registry.get(("search", max_results, search_depth), factory)
+
+
+_warm_up_thread = None
+_warm_up_lock = threading.Lock()
+
+
+def start_warm_up(factories: list):
+    """Call each client factory in a daemon thread, once per process, so first requests find them built.
+
+    Failures are ignored: the same client is built (and the error raised) again on first real use.
+    """
+    global _warm_up_thread
+
+    def run():
+        for factory in factories:
+            try:
+                factory()
+            except Exception:
+                pass
+
+    with _warm_up_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=run, name="client-warm-up", daemon=True)
+            _warm_up_thread.start()
+    return _warm_up_thread
+
+
+def client_stats() -> dict:
+    """Registry and connection pool usage for the sidebar."""
+    return {"clients": registry.stats(), "http_pool": pool_counter.stats()}
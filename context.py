@@ -0,0 +1,137 @@
+import os
+import re
+from functools import lru_cache
+
+# ---------------------
+# Research context compaction
+# ---------------------
+# Search snippets are split into passages, stripped of site boilerplate,
+# deduplicated, ranked by relevance to the query's slots, and packed into a
+# per-model token budget before they are pasted into the prompt.
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+
+# Research tokens allowed in one prompt, per model
+TOKEN_BUDGETS = {
+    "gpt-4o-mini": DEFAULT_TOKEN_BUDGET,
+    "gemini-2.0-flash-exp": int(DEFAULT_TOKEN_BUDGET * 4 / 3),
+}
+
+PASSAGE_WORDS = 30
+DUPLICATE_SIMILARITY = 0.7
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[a-z0-9$€£%+#]+")
+_BOILERPLATE = re.compile(
+    r"cooki|sign\s*(?:up|in)|log\s*in|subscribe|newsletter|all rights reserved|privacy policy|terms of (?:use|service)"
+    r"|click here|read more|advertisement|share (?:this|on)|follow us|skip to (?:main )?content|enable javascript"
+    r"|download (?:the|our) app|create (?:a free )?account|\bmenu\b|\bbreadcrumb",
+    re.IGNORECASE,
+)
+_MARKUP = re.compile(r"!\[[^\]]*\]\([^)]*\)|\[([^\]]*)\]\([^)]*\)|[#*_`>|]{2,}|\s{2,}")
+
+
+@lru_cache(maxsize=None)
+def get_encoding():
+    """tiktoken's cl100k_base encoding, loaded on first use; None if it cannot be loaded.
+
+    The first load may download the BPE file, so it is not done at import
+    (and a failed load is not retried on every call).
+    """
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Token count with tiktoken when available, else about 4 characters per token."""
+    encoding = get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def budget_for(model_name: str) -> int:
+    return TOKEN_BUDGETS.get(model_name or "", DEFAULT_TOKEN_BUDGET)
+
+
+def _clean(text: str) -> str:
+    return _MARKUP.sub(lambda m: m.group(1) or " ", text).strip()
+
+
+def _passages(text: str, seen: set) -> list:
+    """Split a snippet into passages of whole sentences, dropping boilerplate and sentences already in seen."""
+    passages, current, words = [], [], 0
+    for sentence in _SENTENCE_SPLIT.split(_clean(text)):
+        sentence = sentence.strip()
+        if len(sentence) < 3 or sentence.lower() in seen or _BOILERPLATE.search(sentence):
+            continue
+        seen.add(sentence.lower())
+        current.append(sentence)
+        words += len(sentence.split())
+        if words >= PASSAGE_WORDS:
+            passages.append(" ".join(current))
+            current, words = [], 0
+    if current:
+        passages.append(" ".join(current))
+    return passages
+
+
+def _shingles(text: str) -> set:
+    words = _WORD.findall(text.lower())
+    return {" ".join(words[i:i + 3]) for i in range(max(1, len(words) - 2))}
+
+
+def _score(passage: str, terms: set, source_rank: int) -> float:
+    words = _WORD.findall(passage.lower())
+    if not words:
+        return 0.0
+    hits = sum(1 for word in words if word in terms)
+    distinct = len(terms.intersection(words))
+    # Distinct term coverage matters most; search rank breaks ties
+    return distinct * 2 + hits / len(words) ** 0.5 + 1 / (source_rank + 1)
+
+
+def query_terms(*texts: str) -> set:
+    return {word for text in texts if text for word in _WORD.findall(text.lower()) if len(word) > 1}
+
+
+def build_context(title: str, results: list, terms: set, max_tokens: int = DEFAULT_TOKEN_BUDGET,
+                  label: str = "Source", show_urls: bool = True) -> str:
+    """Compact search results into a Markdown research block within max_tokens."""
+    candidates = []
+    kept_shingles = []
+    # Sentences syndicated across sites are kept only at their first source
+    seen_sentences = set()
+    for source_rank, item in enumerate(results):
+        for position, passage in enumerate(_passages(item.get("content") or "", seen_sentences)):
+            shingles = _shingles(passage)
+            if any(len(shingles & seen) / len(shingles | seen) >= DUPLICATE_SIMILARITY for seen in kept_shingles):
+                continue
+            kept_shingles.append(shingles)
+            candidates.append((_score(passage, terms, source_rank), source_rank, position, passage))
+
+    content = f"# {title}\n\n"
+    used = count_tokens(content)
+    chosen = {}
+    for score, source_rank, position, passage in sorted(candidates, key=lambda c: -c[0]):
+        url = results[source_rank].get("url", "")
+        # A new source also costs its label and URL line
+        overhead = 0 if source_rank in chosen else count_tokens(f"**{label} 0:** \nURL: {url}\n\n")
+        cost = count_tokens(passage) + 1 + overhead
+        if used + cost > max_tokens:
+            continue
+        used += cost
+        chosen.setdefault(source_rank, []).append((position, passage))
+
+    # Emit in search order so sources read naturally
+    for idx, source_rank in enumerate(sorted(chosen), 1):
+        text = " ".join(passage for _, passage in sorted(chosen[source_rank]))
+        content += f"**{label} {idx}:** {text}\n"
+        if show_urls:
+            content += f"URL: {results[source_rank].get('url', '')}\n"
+        content += "\n"
+    return content
@@ -0,0 +1,157 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+# ---------------------
+# Conversation store
+# ---------------------
+# Append-only chat history in SQLite (WAL mode, so several Streamlit workers
+# can share the file). Records are compact: the role is a small integer and
+# long texts are zlib-compressed. The UI keeps only the visible window of
+# messages in memory and pages older ones in from here on demand.
+
+STORE_PATH = os.getenv("CONVERSATION_DB_PATH", os.path.join(".cache", "conversations.sqlite3"))
+
+# Texts at least this long are stored compressed
+COMPRESS_MIN_BYTES = 512
+
+ROLES = ["user", "assistant"]
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+
+
+def _encode(text: str):
+    data = text.encode()
+    if len(data) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(data, 6)
+        if len(compressed) < len(data):
+            return compressed
+    return text
+
+
+def _decode(value) -> str:
+    # Compressed texts are stored as BLOBs, short ones as TEXT
+    return zlib.decompress(value).decode() if isinstance(value, bytes) else value
+
+
+class ConversationStore:
+    """Per-session message log backed by a SQLite file."""
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS messages (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role INTEGER NOT NULL,
+                model TEXT,
+                created REAL NOT NULL,
+                body NOT NULL,
+                PRIMARY KEY (session_id, seq)
+            ) WITHOUT ROWID"""
+        )
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _row_to_message(self, row) -> dict:
+        seq, role, model, body = row
+        return {"seq": seq, "role": ROLES[role], "model": model, "text": _decode(body)}
+
+    def append(self, session_id: str, role: str, text: str, model: str = None) -> int:
+        """Append a message and return its sequence number within the session."""
+        conn = self._connection()
+        with conn:
+            # BEGIN IMMEDIATE so two workers cannot pick the same seq
+            conn.execute("BEGIN IMMEDIATE")
+            (last,) = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            seq = last + 1
+            conn.execute(
+                "INSERT INTO messages (session_id, seq, role, model, created, body) VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, seq, _ROLE_CODES[role], model, time.time(), _encode(text)),
+            )
+        return seq
+
+    def page(self, session_id: str, before_seq: int = None, limit: int = 20) -> list:
+        """Up to `limit` messages older than before_seq (newest page when None), oldest first."""
+        if before_seq is None:
+            before_seq = sys.maxsize
+        rows = self._connection().execute(
+            "SELECT seq, role, model, body FROM messages WHERE session_id = ? AND seq < ? "
+            "ORDER BY seq DESC LIMIT ?",
+            (session_id, before_seq, limit),
+        ).fetchall()
+        return [self._row_to_message(row) for row in reversed(rows)]
+
+    def iter_messages(self, session_id: str, batch: int = 200):
+        """Yield every message of a session, oldest first, reading in batches."""
+        after = 0
+        while True:
+            rows = self._connection().execute(
+                "SELECT seq, role, model, body FROM messages WHERE session_id = ? AND seq > ? "
+                "ORDER BY seq LIMIT ?",
+                (session_id, after, batch),
+            ).fetchall()
+            for row in rows:
+                yield self._row_to_message(row)
+            if len(rows) < batch:
+                return
+            after = rows[-1][0]
+
+    def count(self, session_id: str) -> int:
+        (total,) = self._connection().execute(
+            "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return total
+
+    def transfer(self, from_session: str, to_session: str) -> int:
+        """Move a session's messages to a new id, leaving the old id empty; returns how many moved."""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                "UPDATE messages SET session_id = ? WHERE session_id = ?", (to_session, from_session)
+            )
+        return cursor.rowcount
+
+    def clear(self, session_id: str):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+
+
+def memory_bytes(messages: list) -> int:
+    """Approximate RAM held by an in-memory message list."""
+    total = sys.getsizeof(messages)
+    for message in messages:
+        total += sys.getsizeof(message) + sum(sys.getsizeof(value) for value in message.values())
+    return total
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_conversation_store() -> ConversationStore:
+    """Process-wide store instance."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ConversationStore()
+    return _store
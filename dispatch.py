@@ -0,0 +1,278 @@
+import contextvars
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+from metrics import metrics, set_attribute
+from ratelimit import Overloaded
+
+# ---------------------
+# LLM dispatch: hedging and failover
+# ---------------------
+# The model picked in the UI is a preference, not a pin. Each call starts on
+# the preferred provider; if it has not produced a first token after a delay
+# taken from that provider's recent latency (a high percentile), the same
+# prompt is also sent to the other provider and whichever answers first wins.
+# The loser is cancelled between chunks. Errors before the first token fail
+# over to the other provider, and a circuit breaker stops sending traffic to
+# a provider that keeps failing. Latency and breaker state are per process.
+
+HEDGING = os.getenv("LLM_HEDGING", "1") != "0"
+HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+# Used until a provider has MIN_SAMPLES latencies, and as the upper bound
+HEDGE_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "2.0"))
+MIN_HEDGE_DELAY_SECONDS = 0.25
+MIN_SAMPLES = 5
+LATENCY_WINDOW = 100
+CIRCUIT_FAILURES = int(os.getenv("LLM_CIRCUIT_FAILURES", "3"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30"))
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures; after a cool-down traffic is let through again on trial."""
+
+    def __init__(self, failures: int = CIRCUIT_FAILURES, reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        self.max_failures = failures
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            # A failed trial call re-opens the circuit straight away
+            if self.failures >= self.max_failures or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class ProviderHealth:
+    """Rolling first-token latency and circuit breaker for one provider."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker()
+        self._latencies = {"stream": deque(maxlen=LATENCY_WINDOW), "invoke": deque(maxlen=LATENCY_WINDOW)}
+        self._lock = threading.Lock()
+
+    def observe(self, mode: str, seconds: float):
+        with self._lock:
+            self._latencies[mode].append(seconds)
+
+    def percentile(self, mode: str, pct: float):
+        with self._lock:
+            samples = sorted(self._latencies[mode])
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+    def hedge_delay(self, mode: str) -> float:
+        delay = self.percentile(mode, HEDGE_PERCENTILE)
+        if delay is None:
+            return HEDGE_DELAY_SECONDS
+        return min(HEDGE_DELAY_SECONDS, max(MIN_HEDGE_DELAY_SECONDS, delay))
+
+    def stats(self) -> dict:
+        return {
+            "p50": self.percentile("stream", 50),
+            "p95": self.percentile("stream", 95),
+            "samples": len(self._latencies["stream"]),
+            "circuit": self.breaker.state,
+        }
+
+
+_health = {}
+_health_lock = threading.Lock()
+
+
+def provider_health(name: str) -> ProviderHealth:
+    with _health_lock:
+        if name not in _health:
+            _health[name] = ProviderHealth(name)
+        return _health[name]
+
+
+def provider_stats() -> dict:
+    with _health_lock:
+        return {name: health.stats() for name, health in _health.items()}
+
+
+class LazyProvider:
+    """Chat model built on first use, so a backup provider's SDK is only loaded if a request goes to it."""
+
+    def __init__(self, factory, model_name: str = ""):
+        self.model_name = model_name
+        self._factory = factory
+        self._model = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._factory()
+        return self._model
+
+
+class _Attempt:
+    """One provider call running in a daemon thread, reporting to a shared queue."""
+
+    def __init__(self, name: str, calls, events: queue.Queue):
+        self.name = name
+        self.cancelled = threading.Event()
+        self.started = time.perf_counter()
+        self._calls = calls
+        self._events = events
+        # Run in a copy of the caller's context so request-scoped state carries over
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(self._run,), name=f"llm-{name}", daemon=True).start()
+
+    def _run(self):
+        items = None
+        try:
+            items = iter(self._calls())
+            for item in items:
+                if self.cancelled.is_set():
+                    break
+                self._events.put(("chunk", self.name, item))
+            self._events.put(("done", self.name, None))
+        except Exception as e:
+            self._events.put(("error", self.name, e))
+        finally:
+            # Closing the stream lets the provider client drop the connection
+            close = getattr(items, "close", None)
+            if close is not None and self.cancelled.is_set():
+                close()
+
+
+class LLMDispatcher:
+    """Chat model facade that hedges and fails over between providers.
+
+    providers maps a provider name (e.g. "OpenAI") to a chat model or a
+    LazyProvider; the preferred one is tried first and lends its model name to
+    the prompt budget.
+    """
+
+    def __init__(self, providers: dict, preferred: str, hedging: bool = HEDGING):
+        self.providers = providers
+        self.preferred = preferred if preferred in providers else next(iter(providers))
+        self.hedging = hedging and len(providers) > 1
+        primary = providers[self.preferred]
+        self.model_name = getattr(primary, "model_name", None) or getattr(primary, "model", None) or ""
+
+    def model(self, name: str):
+        provider = self.providers[name]
+        return provider.get() if isinstance(provider, LazyProvider) else provider
+
+    def _order(self) -> list:
+        others = [name for name in self.providers if name != self.preferred]
+        order = [self.preferred] + others
+        allowed = [name for name in order if provider_health(name).breaker.allow()]
+        # With every circuit open, still try the preferred provider rather than fail outright
+        return allowed or [self.preferred]
+
+    def _race(self, mode: str, call):
+        """Yield the items of call(llm) from whichever provider produces content first."""
+        candidates = self._order()
+        events = queue.Queue()
+        attempts = {}
+        pending = {}
+        errors = []
+
+        def launch(name):
+            attempts[name] = _Attempt(name, lambda: call(self.model(name)), events)
+            pending[name] = []
+
+        launch(candidates.pop(0))
+        primary = next(iter(attempts))
+        hedge_at = time.perf_counter() + provider_health(primary).hedge_delay(mode)
+        winner = None
+        try:
+            while winner is None:
+                timeout = None
+                if candidates and self.hedging:
+                    timeout = max(0.0, hedge_at - time.perf_counter())
+                try:
+                    kind, name, item = events.get(timeout=timeout)
+                except queue.Empty:
+                    backup = candidates.pop(0)
+                    metrics.inc("llm_hedges_total", help="Hedged requests sent to a backup provider", provider=backup)
+                    launch(backup)
+                    continue
+
+                if kind == "error":
+                    # Turned away by our own rate limiter: the provider itself did nothing wrong
+                    if not isinstance(item, Overloaded):
+                        provider_health(name).breaker.failure()
+                    metrics.inc("llm_errors_total", help="LLM provider errors before the first token", provider=name)
+                    errors.append(item)
+                    attempts.pop(name)
+                    if candidates:
+                        backup = candidates.pop(0)
+                        metrics.inc("llm_failovers_total", help="Requests failed over to another provider", provider=backup)
+                        launch(backup)
+                    elif not attempts:
+                        raise errors[0]
+                    continue
+
+                if kind == "chunk":
+                    pending[name].append(item)
+                    if not getattr(item, "content", True):
+                        # Metadata-only chunk; wait for real content
+                        continue
+                winner = name
+
+            for name, attempt in attempts.items():
+                if name != winner:
+                    attempt.cancelled.set()
+            health = provider_health(winner)
+            health.observe(mode, time.perf_counter() - attempts[winner].started)
+            health.breaker.success()
+            metrics.inc("llm_wins_total", help="Requests answered per provider", provider=winner)
+            set_attribute("provider", winner)
+
+            yield from pending[winner]
+            if kind == "done":
+                return
+            while True:
+                kind, name, item = events.get()
+                if name != winner:
+                    continue
+                if kind == "chunk":
+                    yield item
+                elif kind == "done":
+                    return
+                else:
+                    # Too late to switch providers mid-answer
+                    raise item
+        finally:
+            for attempt in attempts.values():
+                attempt.cancelled.set()
+
+    def stream(self, prompt, **kwargs):
+        return self._race("stream", lambda llm: llm.stream(prompt, **kwargs))
+
+    def invoke(self, prompt, **kwargs):
+        race = self._race("invoke", lambda llm: [llm.invoke(prompt, **kwargs)])
+        try:
+            return next(race)
+        finally:
+            race.close()
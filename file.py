@@ -1,311 +1,202 @@
-import streamlit as st
 import os
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
-from langchain_community.tools.tavily_search import TavilySearchResults
-
-# Load API keys
-load_dotenv()
-OPENAI_KEY = os.getenv("OPENAI_API_KEY")
-GEMINI_KEY = os.getenv("GEMINI_API_KEY")
-TAVILY_KEY = os.getenv("TAVILY_API_KEY")
+import tempfile
+import threading
+import uuid
+import streamlit as st
+from itertools import chain
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from clients import client_stats
+from dispatch import provider_stats
+from search_cache import get_search_cache
+from answer_cache import get_answer_cache
+from assistant import QUICK_ACTION_QUERIES, initialize_llm, stream_query, warm_up
+from api_client import API_URL, stream_remote
+from singleflight import answer_flights, search_flights
+from prefetch import get_prefetcher, start_prefetch
+from conversation_store import get_conversation_store, memory_bytes
+from salaries import get_salary_dataset
+from metrics import METRICS_FILE, metrics, span, start_metrics_server, trace_request
+from ratelimit import limiter_stats, queue_listener
+
+# Messages shown per page of chat history; only these are kept in memory
+CHAT_WINDOW = 20
+
+store = get_conversation_store()
+
+def chat_entry(seq, role, text, model=None):
+    # Markdown is rendered once here instead of on every rerun
+    model_label = f" *({model})*" if role != "user" and model else ""
+    return {"seq": seq, "role": role, "text": text, "model": model, "markdown": f"{text}{model_label}"}
 
 # ---------------------
 # Session state
 # ---------------------
+# The session id is always issued here, never taken from the URL. The id in the
+# URL (?sid=) only hands its history over to the new id, so reloads keep the
+# conversation, but a crafted or shared link cannot open a history that its
+# sender can still read: the old id is left empty once it has been used.
+if "session_id" not in st.session_state:
+    session_id = uuid.uuid4().hex
+    previous = st.query_params.get("sid")
+    if previous:
+        store.transfer(previous, session_id)
+    st.session_state.session_id = session_id
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = [chat_entry(**m) for m in store.page(st.session_state.session_id, limit=CHAT_WINDOW)]
+if "message_count" not in st.session_state:
+    st.session_state.message_count = store.count(st.session_state.session_id)
 if "llm" not in st.session_state:
     st.session_state.llm = None
 if "current_model" not in st.session_state:
     st.session_state.current_model = None
+if "latency" not in st.session_state:
+    st.session_state.latency = []
+if "last_trace" not in st.session_state:
+    st.session_state.last_trace = None
+if "chat_window" not in st.session_state:
+    st.session_state.chat_window = CHAT_WINDOW
+if "chat_export" not in st.session_state:
+    st.session_state.chat_export = None
+
+# Prometheus scrape endpoint, when METRICS_PORT is set
+start_metrics_server()
+# Watchlist refresh worker, when a watchlist file exists (the API runs its own)
+if not API_URL:
+    start_prefetch()
 
 def add_message(role, text, model=None):
-    st.session_state.messages.append({"role": role, "text": text, "model": model})
+    seq = store.append(st.session_state.session_id, role, text, model)
+    st.session_state.messages.append(chat_entry(seq, role, text, model))
+    st.session_state.message_count += 1
+    # Messages that scrolled out of the window are only kept on disk
+    del st.session_state.messages[:-st.session_state.chat_window]
+
+def load_older_messages():
+    """Page the previous window of messages in from the store"""
+    messages = st.session_state.messages
+    before = messages[0]["seq"] if messages else None
+    older = store.page(st.session_state.session_id, before_seq=before, limit=CHAT_WINDOW)
+    messages[:0] = [chat_entry(**m) for m in older]
+    st.session_state.chat_window += CHAT_WINDOW
+
+def clear_chat():
+    store.clear(st.session_state.session_id)
+    st.session_state.messages = []
+    st.session_state.message_count = 0
+    st.session_state.chat_window = CHAT_WINDOW
+    discard_chat_export()
+
+def iter_chat_log():
+    """Yield the chat log one message at a time, read from the store in batches"""
+    for i, m in enumerate(store.iter_messages(st.session_state.session_id)):
+        yield ("\n\n" if i else "") + f"{m['role'].upper()} ({m.get('model') or ''}): {m['text']}"
 
 def export_chat_log():
-    return "\n\n".join(
-        [f"{m['role'].upper()} ({m.get('model','')}): {m['text']}" for m in st.session_state.messages]
-    )
+    return "".join(iter_chat_log())
+
+def build_chat_export():
+    """Write the log to a temp file chunk by chunk; the session only keeps its path until the history changes"""
+    discard_chat_export()
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", prefix="career-chat-", suffix=".txt", delete=False
+    ) as f:
+        for part in iter_chat_log():
+            f.write(part)
+    st.session_state.chat_export = (st.session_state.message_count, f.name)
+
+def discard_chat_export():
+    export = st.session_state.chat_export
+    st.session_state.chat_export = None
+    if export is not None:
+        try:
+            os.remove(export[1])
+        except OSError:
+            pass
+
 
 # ---------------------
-# Helper Functions
+# Chat helpers
 # ---------------------
-def search_company_info(company_name: str) -> str:
-    """Get latest news, funding, culture, and recent updates about a company."""
-    try:
-        search = TavilySearchResults(max_results=5, api_key=TAVILY_KEY, search_depth="advanced")
-        query = f"{company_name} company news funding culture recent updates 2024 2025"
-        results = search.invoke(query)
-        
-        content = f"# Company Research: {company_name}\n\n"
-        for idx, item in enumerate(results, 1):
-            content += f"**Source {idx}:** {item.get('content', '')}\n"
-            content += f"URL: {item.get('url', '')}\n\n"
-        return content
-    except Exception as e:
-        return f"Error searching company info: {str(e)}"
-
-
-def get_interview_questions(role: str, level: str = "mid") -> str:
-    """Generate role-specific interview questions with answers."""
-    try:
-        search = TavilySearchResults(max_results=5, api_key=TAVILY_KEY)
-        query = f"{role} {level} level interview questions answers 2024 2025"
-        results = search.invoke(query)
-        
-        content = f"# Interview Questions for {role} ({level} level)\n\n"
-        for idx, item in enumerate(results, 1):
-            content += f"**Resource {idx}:** {item.get('content', '')}\n\n"
-        return content
-    except Exception as e:
-        return f"Error getting interview questions: {str(e)}"
-
-
-def salary_research(role: str, location: str) -> str:
-    """Get salary ranges and compensation data."""
-    try:
-        search = TavilySearchResults(max_results=5, api_key=TAVILY_KEY)
-        query = f"{role} salary {location} 2024 2025 compensation range total comp"
-        results = search.invoke(query)
-        
-        content = f"# Salary Research: {role} in {location}\n\n"
-        for idx, item in enumerate(results, 1):
-            content += f"**Source {idx}:** {item.get('content', '')}\n"
-            content += f"URL: {item.get('url', '')}\n\n"
-        return content
-    except Exception as e:
-        return f"Error researching salary: {str(e)}"
-
-
-def resume_tips(role: str, experience: str) -> str:
-    """Get resume writing tips and best practices."""
-    try:
-        search = TavilySearchResults(max_results=5, api_key=TAVILY_KEY)
-        query = f"{role} resume tips best practices {experience} 2024 ATS"
-        results = search.invoke(query)
-        
-        content = f"# Resume Tips for {role}\n\n"
-        for idx, item in enumerate(results, 1):
-            content += f"**Tip {idx}:** {item.get('content', '')}\n\n"
-        return content
-    except Exception as e:
-        return f"Error getting resume tips: {str(e)}"
-
-
-def industry_trends(industry: str) -> str:
-    """Get latest industry trends, hot skills, and market insights."""
-    try:
-        search = TavilySearchResults(max_results=5, api_key=TAVILY_KEY, search_depth="advanced")
-        query = f"{industry} industry trends 2024 2025 hot skills in-demand jobs"
-        results = search.invoke(query)
-        
-        content = f"# Industry Trends: {industry}\n\n"
-        for idx, item in enumerate(results, 1):
-            content += f"**Insight {idx}:** {item.get('content', '')}\n"
-            content += f"URL: {item.get('url', '')}\n\n"
-        return content
-    except Exception as e:
-        return f"Error getting industry trends: {str(e)}"
-
-
-def initialize_llm(model_choice):
-    """Initialize the LLM based on model choice"""
-    if model_choice == "OpenAI":
-        return ChatOpenAI(model="gpt-4o-mini", api_key=OPENAI_KEY, temperature=0.7)
-    else:
-        return ChatGoogleGenerativeAI(model="gemini-2.0-flash-exp", api_key=GEMINI_KEY, temperature=0.7)
+def record_latency(model_choice, timing):
+    """Keep recent time-to-first-token / total timings per model for the sidebar"""
+    st.session_state.latency.append({"model": model_choice, **timing})
+    del st.session_state.latency[:-50]
 
 
-def process_query(user_query: str, llm):
-    """Process user query and return response"""
-    
-    # Determine which tool to use based on keywords
-    query_lower = user_query.lower()
-    
-    try:
-        # Company research
-        if any(word in query_lower for word in ["company", "about", "tell me about"]):
-            # Extract company name (simple approach)
-            words = user_query.split()
-            for i, word in enumerate(words):
-                if word.lower() in ["about", "company"]:
-                    if i + 1 < len(words):
-                        company_name = words[i + 1].strip(".,!?")
-                        search_results = search_company_info(company_name)
-                        
-                        prompt = f"""You are a career assistant. Based on this research about {company_name}, 
-                        provide a comprehensive summary including recent news, company culture, and any important updates.
-                        
-                        Research Data:
-                        {search_results}
-                        
-                        Provide a well-structured, informative response."""
-                        
-                        response = llm.invoke(prompt)
-                        return response.content
-        
-        # Salary research
-        elif "salary" in query_lower or "compensation" in query_lower:
-            words = user_query.split()
-            role = ""
-            location = ""
-            
-            # Simple extraction
-            if "for" in query_lower:
-                role_start = query_lower.find("for") + 4
-                role_end = query_lower.find("in") if "in" in query_lower else len(query_lower)
-                role = user_query[role_start:role_end].strip()
-            
-            if "in" in query_lower:
-                loc_start = query_lower.find("in") + 3
-                location = user_query[loc_start:].strip("?.,!")
-            
-            if role and location:
-                search_results = salary_research(role, location)
-                
-                prompt = f"""You are a career assistant. Based on this salary research data, 
-                provide a comprehensive salary analysis for {role} in {location}.
-                
-                Research Data:
-                {search_results}
-                
-                Include base salary ranges, total compensation, and benefits information."""
-                
-                response = llm.invoke(prompt)
-                return response.content
-        
-        # Interview questions
-        elif "interview" in query_lower or "questions" in query_lower:
-            words = user_query.split()
-            role = ""
-            level = "mid"
-            
-            if "entry" in query_lower:
-                level = "entry"
-            elif "senior" in query_lower:
-                level = "senior"
-            
-            # Extract role
-            for i, word in enumerate(words):
-                if word.lower() in ["for", "as"]:
-                    if i + 1 < len(words):
-                        role = words[i + 1].strip(".,!?")
-                        break
-            
-            if role:
-                search_results = get_interview_questions(role, level)
-                
-                prompt = f"""You are a career assistant. Based on this interview questions research, 
-                provide comprehensive interview preparation guidance for {role} at {level} level.
-                
-                Research Data:
-                {search_results}
-                
-                Include both technical and behavioral questions with sample answers."""
-                
-                response = llm.invoke(prompt)
-                return response.content
-        
-        # Resume tips
-        elif "resume" in query_lower or "cv" in query_lower:
-            words = user_query.split()
-            role = ""
-            experience = ""
-            
-            # Simple extraction
-            for i, word in enumerate(words):
-                if word.lower() == "for":
-                    if i + 1 < len(words):
-                        role = words[i + 1].strip(".,!?")
-                if word.lower() in ["years", "experience"]:
-                    if i > 0:
-                        experience = words[i - 1] + " years"
-            
-            if role:
-                search_results = resume_tips(role, experience)
-                
-                prompt = f"""You are a career assistant. Based on this resume tips research, 
-                provide comprehensive resume guidance for {role}.
-                
-                Research Data:
-                {search_results}
-                
-                Include formatting advice, key sections, and what recruiters look for."""
-                
-                response = llm.invoke(prompt)
-                return response.content
-        
-        # Industry trends
-        elif "trend" in query_lower or "industry" in query_lower:
-            words = user_query.split()
-            industry = ""
-            
-            for i, word in enumerate(words):
-                if word.lower() in ["in", "about"]:
-                    if i + 1 < len(words):
-                        industry = words[i + 1].strip(".,!?")
-                        break
-            
-            if industry:
-                search_results = industry_trends(industry)
-                
-                prompt = f"""You are a career assistant. Based on this industry trends research, 
-                provide comprehensive insights about the {industry} industry.
-                
-                Research Data:
-                {search_results}
-                
-                Include hot skills, emerging technologies, and job market insights."""
-                
-                response = llm.invoke(prompt)
-                return response.content
-        
-        # Job description analysis
-        elif "analyze" in query_lower and "job description" in query_lower:
-            prompt = f"""You are a career assistant. Analyze this job description and provide:
-            
-            1. KEY SKILLS REQUIRED (technical and soft skills)
-            2. MUST-HAVE vs NICE-TO-HAVE qualifications
-            3. MAIN RESPONSIBILITIES
-            4. EXPERIENCE LEVEL required
-            5. RESUME TAILORING SUGGESTIONS
-            
-            Job Description:
-            {user_query}
-            
-            Provide a detailed, structured analysis."""
-            
-            response = llm.invoke(prompt)
-            return response.content
-        
-        # General career advice
+def queue_notice(placeholder):
+    """Queue-position listener that shows the user's place in line in the placeholder."""
+    ctx = get_script_run_ctx()
+
+    def show(upstream, position):
+        # Called from research and provider worker threads, which need the session's context to draw
+        add_script_run_ctx(threading.current_thread(), ctx)
+        if position:
+            placeholder.caption(f"⏳ {upstream} is busy — you are #{position} in the queue")
         else:
-            prompt = f"""You are a helpful career assistant specializing in job search, interview prep, 
-            resume optimization, and career advice. 
-            
-            User Question: {user_query}
-            
-            Provide helpful, actionable career advice."""
-            
-            response = llm.invoke(prompt)
-            return response.content
-            
-    except Exception as e:
-        return f"I encountered an error processing your request: {str(e)}\n\nPlease try rephrasing your question or contact support."
+            placeholder.empty()
+
+    return show
+
+
+def stream_answer(user_query, model_choice, spinner_text):
+    """Stream the answer into an assistant bubble, then commit it to the chat history"""
+    if st.session_state.llm is None and not API_URL:
+        st.session_state.llm = initialize_llm(model_choice)
+
+    timing = {}
+    remote = {}
+    with trace_request("chat") as trace, live_chat:
+        with st.chat_message("user"):
+            st.markdown(st.session_state.messages[-1]["text"])
+        with st.chat_message("assistant"):
+            # Research and the wait for the first token happen under the spinner
+            with st.spinner(spinner_text):
+                queue_note = st.empty()
+                if API_URL:
+                    stream = stream_remote(user_query, model_choice, queue_notice(queue_note), remote)
+                    first_chunk = next(stream, "")
+                else:
+                    with queue_listener(queue_notice(queue_note)):
+                        stream = stream_query(user_query, st.session_state.llm, timing)
+                        first_chunk = next(stream, "")
+                queue_note.empty()
+            with span("render"):
+                answer = st.write_stream(chain([first_chunk], stream))
+
+    if API_URL and "error" in remote:
+        # The API could not answer: its message is shown as the answer, with no trace or timings
+        st.session_state.last_trace = None
+        add_message("assistant", answer)
+        return
+    if API_URL:
+        # The API traced the request; show its stages and timings
+        timing = remote.pop("timing", timing)
+        st.session_state.last_trace = remote
+    else:
+        st.session_state.last_trace = {"stages": trace.stages, **trace.attributes}
+    # The selected model is only a preference; label the answer with the provider that won
+    provider = st.session_state.last_trace.get("provider", model_choice)
+    record_latency(provider, timing)
+    add_message("assistant", answer, model=provider)
 
 
 def render_chat():
     """Display chat messages"""
+    with span("render_history"):
+        _render_messages()
+
+
+def _render_messages():
+    # Only the latest window of messages is rendered; older ones load on demand
+    hidden = st.session_state.message_count - len(st.session_state.messages)
+    if hidden > 0:
+        if st.button(f"⬆️ Load older messages ({hidden} hidden)"):
+            load_older_messages()
+            st.rerun()
+
     for msg in st.session_state.messages:
-        if msg["role"] == "user":
-            with st.chat_message("user"):
-                st.markdown(msg['text'])
-        else:
-            with st.chat_message("assistant"):
-                model_label = f" *({msg.get('model', '')})*" if msg.get("model") else ""
-                st.markdown(f"{msg['text']}{model_label}")
+        with st.chat_message("user" if msg["role"] == "user" else "assistant"):
+            st.markdown(msg["markdown"])
 
 
 # ---------------------
@@ -318,6 +209,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Keep the current session id in the URL so a reload reopens the same history
+if st.query_params.get("sid") != st.session_state.session_id:
+    st.query_params["sid"] = st.session_state.session_id
+
 # Header
 st.title("💼 Career & Interview Prep Assistant")
 st.markdown("*Your AI-powered career companion for job search, interview prep, and salary research*")
@@ -340,21 +235,117 @@ with st.sidebar:
     
     # Clear chat
     if st.button("🧹 Clear Chat", use_container_width=True):
-        st.session_state.messages = []
+        clear_chat()
         st.rerun()
     
-    # Download chat log
-    if st.session_state.messages:
-        st.download_button(
-            "💾 Download Chat Log",
-            export_chat_log().encode(),
-            file_name="career_assistant_log.txt",
-            mime="text/plain",
-            use_container_width=True
+    # History size: everything is on disk, only the visible window is in memory
+    if st.session_state.message_count:
+        st.caption(
+            f"History: {st.session_state.message_count} messages · In memory: "
+            f"{len(st.session_state.messages)} ({memory_bytes(st.session_state.messages) / 1024:.0f} KB)"
         )
-    
+
+    # Download chat log (written to a temp file on request, reused until the history changes)
+    if st.session_state.messages:
+        export = st.session_state.chat_export
+        if export is not None and (export[0] != st.session_state.message_count or not os.path.exists(export[1])):
+            discard_chat_export()
+            export = None
+        if export is None:
+            if st.button("📦 Prepare Chat Log", use_container_width=True):
+                build_chat_export()
+                export = st.session_state.chat_export
+        if export is not None:
+            with open(export[1], "rb") as f:
+                st.download_button(
+                    "💾 Download Chat Log",
+                    f,
+                    file_name="career_assistant_log.txt",
+                    mime="text/plain",
+                    use_container_width=True
+                )
+
+    # Time-to-first-token for the current session
+    if st.session_state.latency:
+        with st.expander("⏱️ Latency"):
+            last = st.session_state.latency[-1]
+            st.metric("Time to first token", f"{last['time_to_first_token']:.2f}s")
+            for name in ["OpenAI", "Gemini"]:
+                ttfts = sorted(
+                    t["time_to_first_token"]
+                    for t in st.session_state.latency
+                    if t["model"] == name and not t.get("cached")
+                )
+                if ttfts:
+                    st.caption(f"{name}: median TTFT {ttfts[len(ttfts) // 2]:.2f}s over {len(ttfts)} answers")
+
+    # Per-stage timings of the last answer
+    if st.checkbox("🐞 Debug timings") and st.session_state.last_trace:
+        last_trace = st.session_state.last_trace
+        st.caption(f"Intent: {last_trace.get('intent', 'unknown')} · Total: {last_trace['total']:.2f}s")
+        for stage, seconds in last_trace["stages"].items():
+            st.caption(f"{stage}: {seconds * 1000:.0f} ms")
+        if "prompt_bytes" in last_trace:
+            st.caption(
+                f"Prompt: {last_trace['prompt_bytes']} bytes · Tokens in/out: "
+                f"{last_trace['input_tokens']}/{last_trace['output_tokens']}"
+            )
+        if st.button("💾 Dump metrics", use_container_width=True):
+            metrics.dump()
+            st.caption(f"Written to {METRICS_FILE}")
+
+    if API_URL:
+        st.caption(f"🔌 Answers served by {API_URL}")
+    else:
+        # Shared client and connection pool usage
+        with st.expander("🔌 Connections"):
+            pool = client_stats()["http_pool"]
+            st.caption(
+                f"HTTP requests: {pool['requests']} · In flight: {pool['in_flight']} · "
+                f"Pool limit: {pool['max_connections']}"
+            )
+            for name, counts in client_stats()["clients"].items():
+                st.caption(f"{name} — created {counts['created']}, reused {counts['reused']}")
+            for name, health in provider_stats().items():
+                p95 = f"{health['p95']:.2f}s" if health["p95"] is not None else "n/a"
+                st.caption(f"{name} — TTFT p95 {p95} over {health['samples']} answers · circuit {health['circuit']}")
+            for name, limiter in limiter_stats().items():
+                st.caption(
+                    f"{name} rate limit — waiting {limiter['waiting']} · queued {limiter['queued']} · "
+                    f"rejected {limiter['rejected']} · 429s {limiter['throttled']}"
+                )
+
+        # Cache counters
+        with st.expander("📊 Caches"):
+            cache_stats = get_search_cache().stats()
+            st.metric("Search hit rate", f"{cache_stats['hit_rate']:.0%}")
+            st.caption(
+                f"Memory hits: {cache_stats['memory_hits']} · Disk hits: {cache_stats['disk_hits']} · "
+                f"Misses: {cache_stats['misses']} · Evictions: {cache_stats['evictions']}"
+            )
+            answer_stats = get_answer_cache().stats()
+            st.metric("Answer hit rate", f"{answer_stats['hit_rate']:.0%}")
+            st.caption(
+                f"Hits: {answer_stats['hits']} of {answer_stats['lookups']} · "
+                f"Time saved: {answer_stats['saved_seconds']:.1f}s · Entries: {answer_stats['entries']}"
+            )
+            st.caption(
+                f"Coalesced in-flight requests: {answer_flights.stats()['coalesced']} answers · "
+                f"{search_flights.stats()['coalesced']} searches"
+            )
+            prefetch_stats = get_prefetcher().stats()
+            st.caption(
+                f"Stale answers served: {answer_stats['stale_served']} · Background refreshes: "
+                f"{prefetch_stats['refreshed']} · Budget left this hour: {prefetch_stats['budget_left']}"
+            )
+            salary_stats = get_salary_dataset().stats()
+            if salary_stats["available"]:
+                st.caption(f"Salary dataset: {salary_stats['figures']} figures for {salary_stats['pairs']} role/location pairs")
+            else:
+                st.caption("Salary dataset: unavailable (its file could not be opened)")
+
     st.markdown("---")
-    
+
     # Quick Actions
     st.header("⚡ Quick Actions")
     
@@ -365,6 +356,7 @@ with st.sidebar:
             "Research a Company",
             "Get Interview Questions",
             "Analyze Job Description",
+            "Bulk JD Analysis",
             "Salary Research",
             "Resume Tips",
             "Industry Trends"
@@ -393,6 +385,9 @@ if st.session_state.messages:
 else:
     st.info("👋 Hi! I'm your Career Assistant. Ask me anything about job search, interviews, companies, or salaries!")
 
+# New answers stream in here, below the existing history
+live_chat = st.container()
+
 st.markdown("---")
 
 # Input section based on quick action
@@ -402,19 +397,14 @@ if quick_action == "Research a Company":
         submitted = st.form_submit_button("🔍 Research Company", use_container_width=True)
         
         if submitted and company_name.strip():
-            user_query = f"Tell me about {company_name}. Include recent news, company culture, funding, and any important updates."
+            user_query = QUICK_ACTION_QUERIES["company"].format(company=company_name)
             add_message("user", user_query)
             
-            with st.spinner(f"🔍 Researching {company_name}..."):
-                try:
-                    if st.session_state.llm is None:
-                        st.session_state.llm = initialize_llm(model_choice)
-                    
-                    answer = process_query(user_query, st.session_state.llm)
-                    add_message("assistant", answer, model=model_choice)
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"❌ Error: {str(e)}")
+            try:
+                stream_answer(user_query, model_choice, f"🔍 Researching {company_name}...")
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
 
 elif quick_action == "Get Interview Questions":
     with st.form("interview_questions_form"):
@@ -427,19 +417,14 @@ elif quick_action == "Get Interview Questions":
         submitted = st.form_submit_button("📝 Get Questions", use_container_width=True)
         
         if submitted and role.strip():
-            user_query = f"Give me interview questions for {role} at {level} level. Include both technical and behavioral questions with sample answers."
+            user_query = QUICK_ACTION_QUERIES["interview"].format(role=role, level=level)
             add_message("user", user_query)
             
-            with st.spinner("📝 Generating interview questions..."):
-                try:
-                    if st.session_state.llm is None:
-                        st.session_state.llm = initialize_llm(model_choice)
-                    
-                    answer = process_query(user_query, st.session_state.llm)
-                    add_message("assistant", answer, model=model_choice)
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"❌ Error: {str(e)}")
+            try:
+                stream_answer(user_query, model_choice, "📝 Generating interview questions...")
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
 
 elif quick_action == "Analyze Job Description":
     with st.form("job_description_form"):
@@ -452,19 +437,43 @@ elif quick_action == "Analyze Job Description":
         submitted = st.form_submit_button("🔍 Analyze JD", use_container_width=True)
         
         if submitted and job_desc.strip():
-            user_query = f"Analyze this job description and extract key skills, requirements, responsibilities, and suggest how I should tailor my resume:\n\n{job_desc}"
+            user_query = QUICK_ACTION_QUERIES["jd"].format(job_description=job_desc)
             add_message("user", "Analyzing job description...")
             
-            with st.spinner("🔍 Analyzing job description..."):
-                try:
-                    if st.session_state.llm is None:
-                        st.session_state.llm = initialize_llm(model_choice)
-                    
-                    answer = process_query(user_query, st.session_state.llm)
-                    add_message("assistant", answer, model=model_choice)
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"❌ Error: {str(e)}")
+            try:
+                stream_answer(user_query, model_choice, "🔍 Analyzing job description...")
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
+
+elif quick_action == "Bulk JD Analysis":
+    with st.form("bulk_jd_form"):
+        uploads = st.file_uploader(
+            "📦 Job Descriptions (.txt, .md, .csv or .zip)",
+            type=["txt", "md", "csv", "zip"],
+            accept_multiple_files=True,
+        )
+        resume_text = st.text_area(
+            "📄 Your Resume (optional)",
+            height=150,
+            placeholder="Paste your resume to see which requested skills it is missing..."
+        )
+        
+        submitted = st.form_submit_button("📊 Analyze All", use_container_width=True)
+        
+        if submitted and uploads:
+            # NumPy/SciPy analytics are only loaded when this form is used
+            from jd_bulk import analyze, render_report
+            add_message("user", f"Analyzing job descriptions in {len(uploads)} uploaded file(s)...")
+            
+            try:
+                # Skills are extracted locally, so this needs no LLM calls
+                with st.spinner("📊 Extracting skills..."):
+                    report = analyze(uploads, resume_text)
+                add_message("assistant", render_report(report), model="local")
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
 
 elif quick_action == "Salary Research":
     with st.form("salary_research_form"):
@@ -477,19 +486,14 @@ elif quick_action == "Salary Research":
         submitted = st.form_submit_button("💰 Research Salary", use_container_width=True)
         
         if submitted and role.strip() and location.strip():
-            user_query = f"What is the salary range for {role} in {location}? Include base salary, total compensation, and any benefits information."
+            user_query = QUICK_ACTION_QUERIES["salary"].format(role=role, location=location)
             add_message("user", user_query)
             
-            with st.spinner("💰 Researching salary data..."):
-                try:
-                    if st.session_state.llm is None:
-                        st.session_state.llm = initialize_llm(model_choice)
-                    
-                    answer = process_query(user_query, st.session_state.llm)
-                    add_message("assistant", answer, model=model_choice)
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"❌ Error: {str(e)}")
+            try:
+                stream_answer(user_query, model_choice, "💰 Researching salary data...")
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
 
 elif quick_action == "Resume Tips":
     with st.form("resume_tips_form"):
@@ -502,19 +506,14 @@ elif quick_action == "Resume Tips":
         submitted = st.form_submit_button("📄 Get Resume Tips", use_container_width=True)
         
         if submitted and role.strip():
-            user_query = f"Give me resume tips for {role} with {experience} experience. Include formatting advice, key sections, and what recruiters look for."
+            user_query = QUICK_ACTION_QUERIES["resume"].format(role=role, experience=experience)
             add_message("user", user_query)
             
-            with st.spinner("📄 Generating resume tips..."):
-                try:
-                    if st.session_state.llm is None:
-                        st.session_state.llm = initialize_llm(model_choice)
-                    
-                    answer = process_query(user_query, st.session_state.llm)
-                    add_message("assistant", answer, model=model_choice)
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"❌ Error: {str(e)}")
+            try:
+                stream_answer(user_query, model_choice, "📄 Generating resume tips...")
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
 
 elif quick_action == "Industry Trends":
     with st.form("industry_trends_form"):
@@ -523,19 +522,14 @@ elif quick_action == "Industry Trends":
         submitted = st.form_submit_button("📈 Get Trends", use_container_width=True)
         
         if submitted and industry.strip():
-            user_query = f"What are the latest trends in {industry}? Include hot skills, emerging technologies, and job market insights."
+            user_query = QUICK_ACTION_QUERIES["trends"].format(industry=industry)
             add_message("user", user_query)
             
-            with st.spinner("📈 Researching industry trends..."):
-                try:
-                    if st.session_state.llm is None:
-                        st.session_state.llm = initialize_llm(model_choice)
-                    
-                    answer = process_query(user_query, st.session_state.llm)
-                    add_message("assistant", answer, model=model_choice)
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"❌ Error: {str(e)}")
+            try:
+                stream_answer(user_query, model_choice, "📈 Researching industry trends...")
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
 
 else:  # Custom Question
     with st.form("custom_question_form"):
@@ -550,13 +544,13 @@ else:  # Custom Question
         if submitted and custom_prompt.strip():
             add_message("user", custom_prompt)
             
-            with st.spinner("🤖 Thinking..."):
-                try:
-                    if st.session_state.llm is None:
-                        st.session_state.llm = initialize_llm(model_choice)
-                    
-                    answer = process_query(custom_prompt, st.session_state.llm)
-                    add_message("assistant", answer, model=model_choice)
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"❌ Error: {str(e)}")
\ No newline at end of file
+            try:
+                stream_answer(custom_prompt, model_choice, "🤖 Thinking...")
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
+
+# The page is on screen; build the provider clients in the background so the
+# first question doesn't wait for SDK imports
+if not API_URL:
+    warm_up(model_choice)
\ No newline at end of file
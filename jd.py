@@ -0,0 +1,258 @@
+import contextvars
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from context import count_tokens
+from metrics import record_llm_usage, span
+
+# ---------------------
+# Job description map-reduce
+# ---------------------
+# A pasted posting is split into sections by its headings. Sections that say
+# nothing about the job itself (benefits, about the company, EEO statements,
+# how to apply) are dropped. Short postings go to the LLM as they are; long
+# ones are cut into bounded chunks that are summarized concurrently (map) and
+# the notes are merged into the usual 5-part analysis (reduce), so latency
+# tracks one chunk rather than the whole posting.
+
+# "local": skills, requirements, responsibilities and experience are extracted
+# without the LLM (skills.py), which only writes the tailoring suggestions;
+# "llm": the whole analysis comes from the LLM
+JD_ANALYSIS = os.getenv("JD_ANALYSIS", "local")
+# Postings above this many tokens (after skipping sections) use map-reduce
+MAP_REDUCE_MIN_TOKENS = int(os.getenv("JD_MAP_REDUCE_MIN_TOKENS", "3000"))
+MAP_WORKERS = int(os.getenv("JD_MAP_WORKERS", "8"))
+# Chunks are at least this big; longer postings get bigger chunks so all of
+# them are mapped in a single concurrent wave
+MAP_CHUNK_TOKENS = 700
+
+NOTE_FIELDS = ["SKILLS", "MUST-HAVE", "NICE-TO-HAVE", "RESPONSIBILITIES", "EXPERIENCE"]
+
+SECTION_PATTERNS = [
+    ("benefits", r"benefit|perks|what we offer|why (?:join|work)|compensation|salary|total rewards|we offer"),
+    ("eeo", r"equal (?:employment )?opportunit|\beeo\b|diversity|inclusion|accommodation"),
+    ("apply", r"how to apply|application process|next steps|interview process"),
+    ("preferred", r"nice[- ]to[- ]have|preferred|bonus points|\bplus(?:es)?\b|desired|good to have"),
+    ("requirements", r"requirement|qualification|what you(?:'ll)? bring|must[- ]have|who you are|skills|experience|about you"),
+    ("responsibilities", r"responsibilit|what you(?:'ll)? do|about the (?:role|job|position|opportunity)|duties|role|role overview|day[- ]to[- ]day|what you'll work on"),
+    ("about", r"about (?:us|the company|the team|[a-z]+$)|who we are|our (?:mission|story|values|culture)|company overview"),
+]
+SKIPPED_SECTIONS = {"benefits", "eeo", "apply", "about"}
+
+_SECTION_REGEXES = [(kind, re.compile(pattern, re.IGNORECASE)) for kind, pattern in SECTION_PATTERNS]
+_HEADING_MARKUP = re.compile(r"^[#*_\s]+|[#*_:\s]+$")
+_HEADING_PREFIXES = {"key", "main", "core", "your", "our", "minimum", "basic", "required", "additional", "general", "job", "the"}
+_BULLET = re.compile(r"^\s*(?:[-•*·▪●]|\d+[.)])\s+")
+_EEO_PARAGRAPH = re.compile(
+    r"equal (?:employment )?opportunity|without regard to (?:race|age|sex)|reasonable accommodation", re.IGNORECASE
+)
+_NOTE_FIELD = re.compile(r"^[\s*#-]*(" + "|".join(NOTE_FIELDS) + r")[\s*]*:\s*(.*)$", re.IGNORECASE)
+_NOTE_VALUE_SPLIT = re.compile(r"[;,]\s+|^\s*(?:[-•*]|\d+[.)])\s+")
+_QUERY_PREFIX = re.compile(r"^(?:please\s+)?analy[sz]e this job description[^\n]*\n", re.IGNORECASE)
+
+_executor = ThreadPoolExecutor(max_workers=MAP_WORKERS, thread_name_prefix="jd-map")
+
+ANALYSIS_SECTIONS = """1. KEY SKILLS REQUIRED (technical and soft skills)
+        2. MUST-HAVE vs NICE-TO-HAVE qualifications
+        3. MAIN RESPONSIBILITIES
+        4. EXPERIENCE LEVEL required
+        5. RESUME TAILORING SUGGESTIONS"""
+
+
+def heading_kind(line: str):
+    """Section kind if the line looks like a heading, else None ("other" for unknown headings)."""
+    stripped = line.strip()
+    if not stripped or _BULLET.match(stripped) or len(stripped) > 60:
+        return None
+    text = _HEADING_MARKUP.sub("", stripped)
+    if not text or len(text.split()) > 7 or text.endswith((".", ",", ";")):
+        return None
+    formatted = stripped.endswith(":") or stripped.startswith(("#", "**", "__")) or text.isupper()
+    if formatted:
+        for kind, regex in _SECTION_REGEXES:
+            if regex.search(text):
+                return kind
+        return "other"
+    # A plain line must open with a heading phrase that makes up most of it,
+    # so body lines like "SQL experience" or "The role is remote" stay body text
+    words = text.lower().split()
+    while words and words[0] in _HEADING_PREFIXES:
+        words.pop(0)
+    plain = " ".join(words)
+    if len(words) > 5:
+        return None
+    for kind, regex in _SECTION_REGEXES:
+        match = regex.match(plain)
+        if match and sum(len(m.group()) for m in regex.finditer(plain)) * 2 >= len(plain.replace(" ", "")):
+            return kind
+    return None
+
+
+def split_sections(text: str) -> list:
+    """Split a posting into (kind, heading, body) sections; text before the first heading is "overview"."""
+    sections = []
+    kind, heading, lines = "overview", "", []
+    for line in text.splitlines():
+        line_kind = heading_kind(line)
+        if line_kind is None:
+            lines.append(line)
+            continue
+        if "\n".join(lines).strip() or heading:
+            sections.append((kind, heading, "\n".join(lines).strip()))
+        kind, heading, lines = line_kind, _HEADING_MARKUP.sub("", line.strip()), []
+    sections.append((kind, heading, "\n".join(lines).strip()))
+    return [section for section in sections if section[2]]
+
+
+def relevant_sections(text: str) -> list:
+    """Sections worth analyzing, with EEO boilerplate paragraphs removed wherever they appear."""
+    kept = []
+    for kind, heading, body in split_sections(text):
+        if kind in SKIPPED_SECTIONS:
+            continue
+        paragraphs = [p for p in re.split(r"\n\s*\n", body) if not _EEO_PARAGRAPH.search(p)]
+        body = "\n\n".join(paragraphs).strip()
+        if body:
+            kept.append((kind, heading, body))
+    return kept
+
+
+def responsibilities(posting: str, limit: int = 8) -> list:
+    """The first bullet points of the responsibilities sections, without bullet markers."""
+    lines = []
+    for kind, _, body in relevant_sections(posting):
+        if kind == "responsibilities":
+            lines += [_BULLET.sub("", line).strip() for line in body.splitlines() if line.strip()]
+    return lines[:limit]
+
+
+def job_description(user_query: str) -> str:
+    """The posting itself, without the quick-action instruction line in front of it."""
+    return _QUERY_PREFIX.sub("", user_query.lstrip(), count=1).strip()
+
+
+def render_sections(sections: list) -> str:
+    return "\n\n".join(f"{heading}\n{body}" if heading else body for _, heading, body in sections)
+
+
+def _chunks(sections: list) -> list:
+    """Pack section lines into at most MAP_WORKERS chunks of at least MAP_CHUNK_TOKENS each, headings included."""
+    lines = []
+    for _, heading, body in sections:
+        lines += [(heading, line, count_tokens(line) + 1) for line in ([heading] if heading else []) + body.splitlines()]
+    total = sum(tokens for _, _, tokens in lines)
+    # Room for a continuation heading and the line that overflows a chunk
+    chunk_tokens = max(MAP_CHUNK_TOKENS, total // MAP_WORKERS + max((tokens for *_, tokens in lines), default=0) + 10)
+
+    chunks, current, used = [], [], 0
+    for heading, line, tokens in lines:
+        if used + tokens > chunk_tokens and current:
+            chunks.append("\n".join(current))
+            current, used = [], 0
+            if heading and line != heading:
+                current, used = [f"{heading} (continued)"], count_tokens(heading) + 3
+        current.append(line)
+        used += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _map_prompt(text: str) -> str:
+    return f"""Extract facts from this part of a job description. Be terse; write "none" where nothing applies.
+Qualifications under "preferred" or "nice to have" headings are NICE-TO-HAVE.
+
+SKILLS: technical and soft skills mentioned
+MUST-HAVE: required qualifications
+NICE-TO-HAVE: optional or preferred qualifications
+RESPONSIBILITIES: main duties
+EXPERIENCE: years or seniority mentioned
+
+Job description part:
+{text}"""
+
+
+def _map_one(llm, text: str) -> str:
+    prompt = _map_prompt(text)
+    response = llm.invoke(prompt)
+    record_llm_usage(prompt, response.content, getattr(response, "usage_metadata", None))
+    return response.content
+
+
+def map_sections(sections: list, llm) -> list:
+    """Summarize the chunks concurrently; chunks whose call fails are left out unless all fail."""
+    futures = [_executor.submit(contextvars.copy_context().run, _map_one, llm, text) for text in _chunks(sections)]
+    notes, errors = [], []
+    for future in futures:
+        try:
+            notes.append(future.result())
+        except Exception as e:
+            errors.append(e)
+    if errors and not notes:
+        raise errors[0]
+    return notes
+
+
+def merge_notes(notes: list) -> str:
+    """Merge the per-chunk notes field by field, dropping repeats and "none" values."""
+    merged = {field: [] for field in NOTE_FIELDS}
+    other = []
+    seen = set()
+    for note in notes:
+        field = None
+        for line in note.splitlines():
+            match = _NOTE_FIELD.match(line)
+            if match:
+                field, values = match.group(1).upper(), match.group(2)
+            elif field and line.strip():
+                values = line
+            else:
+                if line.strip() and line.strip().lower() not in seen:
+                    seen.add(line.strip().lower())
+                    other.append(line.strip())
+                continue
+            for value in _NOTE_VALUE_SPLIT.split(values):
+                value = value.strip(" .")
+                key = (field, value.lower())
+                if value and value.lower() not in ("none", "n/a", "not mentioned") and key not in seen:
+                    seen.add(key)
+                    merged[field].append(value)
+    lines = [f"{field}: {'; '.join(values)}" for field, values in merged.items() if values]
+    return "\n".join(lines + other)
+
+
+def single_prompt(posting: str) -> str:
+    return f"""You are a career assistant. Analyze this job description and provide:
+
+        {ANALYSIS_SECTIONS}
+
+        Job Description:
+        {posting}
+
+        Provide a detailed, structured analysis."""
+
+
+def reduce_prompt(title: str, notes: list) -> str:
+    return f"""You are a career assistant. These notes were extracted from a job description{f' for {title}' if title else ''}.
+        Based on them, provide:
+
+        {ANALYSIS_SECTIONS}
+
+        Notes:
+        {merge_notes(notes)}
+
+        Provide a detailed, structured analysis."""
+
+
+def build_jd_prompt(user_query: str, llm=None) -> str:
+    """Prompt for the JD analysis: the trimmed posting, or merged per-section notes for long postings."""
+    sections = relevant_sections(job_description(user_query))
+    posting = render_sections(sections)
+    if llm is None or count_tokens(posting) < MAP_REDUCE_MIN_TOKENS:
+        return single_prompt(posting)
+
+    with span("jd_map"):
+        notes = map_sections(sections, llm)
+    title = sections[0][2].splitlines()[0] if sections and sections[0][0] == "overview" else ""
+    return reduce_prompt(title[:80], notes)
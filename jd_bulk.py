@@ -0,0 +1,305 @@
+"""Skill analytics over many job descriptions at once, without LLM calls.
+
+Postings are read one at a time from folders, ZIP archives and CSV files,
+run through the local skill extractor (skills.py) and collected into a sparse
+postings x skills matrix. Aggregates are computed on the matrix with NumPy and
+SciPy: how often each skill is asked for (and how often as a must-have),
+which skills appear together, and which of them a resume is missing.
+
+Folders and ZIP archives may hold .txt/.md files (one posting each) and CSV
+files. In a CSV the posting text is taken from a "description" column (or
+"job_description", "jd", "text", "body"), else from the longest field.
+
+    python jd_bulk.py postings.zip --resume resume.txt --top 25 --json report.json
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from array import array
+
+import numpy as np
+from scipy import sparse
+
+from metrics import metrics, span
+from skills import extract_skills, get_matcher
+
+TEXT_EXTENSIONS = (".txt", ".md")
+DESCRIPTION_COLUMNS = ["description", "job_description", "jd", "text", "body"]
+TITLE_COLUMNS = ["title", "job_title", "role", "position"]
+# Matrix values
+NICE, MUST = 1, 2
+
+# Job descriptions in CSV exports can exceed the default 128 KB field limit
+csv.field_size_limit(16 * 1024 * 1024)
+
+
+# ---------------------
+# Reading postings
+# ---------------------
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8-sig", errors="replace")
+
+
+def _iter_csv(name: str, stream):
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline=""))
+    columns = {(column or "").strip().lower(): column for column in reader.fieldnames or []}
+    text_column = next((columns[c] for c in DESCRIPTION_COLUMNS if c in columns), None)
+    title_column = next((columns[c] for c in TITLE_COLUMNS if c in columns), None)
+    for row_number, row in enumerate(reader, 2):
+        if text_column:
+            text = row.get(text_column) or ""
+        else:
+            text = max((value for value in row.values() if isinstance(value, str)), key=len, default="")
+        if title_column and row.get(title_column) and not text.lstrip().startswith(row[title_column]):
+            # The title line is what experience and seniority are read from
+            text = f"{row[title_column]}\n{text}"
+        yield f"{name}:{row_number}", text
+
+
+def _iter_file(name: str, stream):
+    lowered = name.lower()
+    if lowered.endswith(".csv"):
+        yield from _iter_csv(name, stream)
+    elif lowered.endswith(".zip"):
+        with zipfile.ZipFile(stream) as archive:
+            for member in archive.infolist():
+                if member.is_dir() or os.path.basename(member.filename).startswith((".", "__MACOSX")):
+                    continue
+                with archive.open(member) as inner:
+                    yield from _iter_file(f"{name}/{member.filename}", inner)
+    elif lowered.endswith(TEXT_EXTENSIONS):
+        yield name, _decode(stream.read())
+
+
+def iter_postings(sources: list):
+    """Yield (name, text) for every posting in the given paths and uploaded files, one at a time.
+
+    A source is a folder, a .zip/.csv/.txt/.md path, or a binary file object
+    with a name (such as a Streamlit upload). Unsupported files are skipped.
+    """
+    for source in sources:
+        if isinstance(source, (str, os.PathLike)):
+            if os.path.isdir(source):
+                for root, dirs, files in os.walk(source):
+                    dirs.sort()
+                    for filename in sorted(files):
+                        path = os.path.join(root, filename)
+                        with open(path, "rb") as f:
+                            yield from _iter_file(path, f)
+            else:
+                with open(source, "rb") as f:
+                    yield from _iter_file(str(source), f)
+        else:
+            yield from _iter_file(getattr(source, "name", "upload"), source)
+
+
+# ---------------------
+# Postings x skills matrix
+# ---------------------
+class SkillMatrix:
+    """Sparse postings x skills matrix (MUST or NICE per cell) over the whole lexicon."""
+
+    def __init__(self, matrix, skills: list, names: list):
+        self.matrix = matrix
+        # (name, category) per column, in lexicon order
+        self.skills = skills
+        # Posting name per row
+        self.names = names
+
+    @property
+    def present(self):
+        """0/1 matrix of which postings mention which skills."""
+        present = self.matrix.astype(np.int32)
+        present.data[:] = 1
+        return present
+
+    @property
+    def must(self):
+        must = self.matrix.copy()
+        must.data = (must.data == MUST).astype(np.int8)
+        must.eliminate_zeros()
+        return must
+
+    def skill_vector(self, text: str):
+        """Boolean vector over the columns for the skills found in plain text such as a resume."""
+        vector = np.zeros(len(self.skills), dtype=bool)
+        columns = _columns()
+        vector[[columns[s.name] for s in extract_skills(text, job_description=False)]] = True
+        return vector
+
+
+_column_index = None
+
+
+def _columns() -> dict:
+    global _column_index
+    if _column_index is None:
+        _column_index = {name: i for i, (name, _) in enumerate(get_matcher().skills)}
+    return _column_index
+
+
+def build_matrix(postings) -> SkillMatrix:
+    """Extract skills from each (name, text) posting as it arrives and build the sparse matrix."""
+    columns = _columns()
+    indices, values, indptr = array("i"), array("b"), array("q", [0])
+    names = []
+    for name, text in postings:
+        if not text.strip():
+            continue
+        for skill in extract_skills(text):
+            indices.append(columns[skill.name])
+            values.append(MUST if skill.requirement == "must" else NICE)
+        indptr.append(len(indices))
+        names.append(name)
+    skills = get_matcher().skills
+    matrix = sparse.csr_matrix(
+        (np.frombuffer(values, dtype=np.int8), np.frombuffer(indices, dtype=np.int32), np.frombuffer(indptr, dtype=np.int64)),
+        shape=(len(names), len(skills)),
+    )
+    return SkillMatrix(matrix, skills, names)
+
+
+# ---------------------
+# Aggregates
+# ---------------------
+def top_skills(m: SkillMatrix, top: int = 20) -> list:
+    """Most requested skills with the share of postings mentioning them and the must-have share."""
+    postings = max(m.matrix.shape[0], 1)
+    counts = np.asarray(m.present.sum(axis=0)).ravel()
+    must = np.asarray(m.must.sum(axis=0)).ravel()
+    order = np.argsort(-counts, kind="stable")[:top]
+    return [
+        {
+            "skill": m.skills[i][0],
+            "category": m.skills[i][1],
+            "postings": int(counts[i]),
+            "share": round(float(counts[i] / postings), 3),
+            "must_share": round(float(must[i] / counts[i]), 3),
+        }
+        for i in order
+        if counts[i] > 0
+    ]
+
+
+def co_occurrence(m: SkillMatrix, top: int = 20, min_count: int = 2) -> list:
+    """Skill pairs asked for together most often, with lift (how much more often than by chance)."""
+    present = m.present.tocsc()
+    counts = np.asarray(present.sum(axis=0)).ravel()
+    pairs = sparse.triu(present.T @ present, k=1).tocoo()
+    keep = pairs.data >= min_count
+    rows, cols, together = pairs.row[keep], pairs.col[keep], pairs.data[keep]
+    lift = together * m.matrix.shape[0] / (counts[rows].astype(np.float64) * counts[cols])
+    order = np.lexsort((-lift, -together))[:top]
+    return [
+        {
+            "skills": [m.skills[rows[i]][0], m.skills[cols[i]][0]],
+            "postings": int(together[i]),
+            "lift": round(float(lift[i]), 2),
+        }
+        for i in order
+    ]
+
+
+def resume_gaps(m: SkillMatrix, resume: str, top: int = 20) -> dict:
+    """Requested skills missing from the resume, and how well it covers each posting's must-haves."""
+    have = m.skill_vector(resume)
+    counts = np.asarray(m.present.sum(axis=0)).ravel()
+    must = m.must
+    must_counts = np.asarray(must.sum(axis=0)).ravel()
+    missing = np.where(have, 0, counts)
+    order = np.argsort(-missing, kind="stable")[:top]
+
+    required = np.asarray(must.sum(axis=1)).ravel()
+    covered = must @ have.astype(np.int8)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        coverage = np.where(required > 0, covered / required, 1.0)
+    return {
+        "resume_skills": [m.skills[i][0] for i in np.flatnonzero(have)],
+        "missing": [
+            {"skill": m.skills[i][0], "postings": int(counts[i]), "must_postings": int(must_counts[i])}
+            for i in order
+            if missing[i] > 0
+        ],
+        "coverage_median": round(float(np.median(coverage)), 3) if coverage.size else None,
+        "postings_fully_covered": int((coverage >= 1).sum()),
+        "postings_mostly_covered": int((coverage >= 0.8).sum()),
+    }
+
+
+def analyze(sources: list, resume: str = "", top: int = 20) -> dict:
+    """Read, extract and aggregate; the full bulk analysis as a JSON-friendly dict."""
+    start = time.perf_counter()
+    with span("jd_bulk_extract"):
+        m = build_matrix(iter_postings(sources))
+    extract_seconds = time.perf_counter() - start
+    with span("jd_bulk_stats"):
+        report = {
+            "postings": m.matrix.shape[0],
+            "distinct_skills": int((m.matrix.getnnz(axis=0) > 0).sum()),
+            "top_skills": top_skills(m, top),
+            "co_occurrence": co_occurrence(m, top),
+        }
+        if resume.strip():
+            report["resume"] = resume_gaps(m, resume, top)
+    report["seconds"] = {"extract": round(extract_seconds, 3), "total": round(time.perf_counter() - start, 3)}
+    metrics.inc("jd_bulk_postings_total", report["postings"], help="Job descriptions processed in bulk")
+    return report
+
+
+def render_report(report: dict) -> str:
+    """Markdown summary of an analyze() result."""
+    if not report["postings"]:
+        return "No job descriptions were found (expected .txt, .md, .csv or .zip files)."
+    lines = [f"**Bulk analysis of {report['postings']} job descriptions** ({report['distinct_skills']} distinct skills)", ""]
+
+    lines += ["**Top skills**", "", "| Skill | Postings | Must-have |", "|---|---|---|"]
+    lines += [f"| {s['skill']} | {s['postings']} ({s['share']:.0%}) | {s['must_share']:.0%} |" for s in report["top_skills"]]
+
+    if report["co_occurrence"]:
+        lines += ["", "**Often asked for together**", ""]
+        lines += [f"- {' + '.join(p['skills'])}: {p['postings']} postings (lift {p['lift']})" for p in report["co_occurrence"][:10]]
+
+    resume = report.get("resume")
+    if resume:
+        lines += ["", "**Your resume**", ""]
+        lines.append(
+            f"- Covers all must-haves in {resume['postings_fully_covered']} postings "
+            f"and at least 80% in {resume['postings_mostly_covered']} (median coverage {resume['coverage_median']:.0%})"
+        )
+        if resume["missing"]:
+            lines.append(
+                "- Most requested skills you don't list: "
+                + ", ".join(f"{s['skill']} ({s['postings']})" for s in resume["missing"][:10])
+            )
+    lines += ["", f"*Processed in {report['seconds']['total']:.2f}s without LLM calls.*"]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill frequency analysis over many job descriptions.")
+    parser.add_argument("sources", nargs="+", help="folders, .zip, .csv, .txt or .md files")
+    parser.add_argument("--resume", help="resume as a text file, for gap analysis")
+    parser.add_argument("--top", type=int, default=20, help="rows per table")
+    parser.add_argument("--json", help="also write the full report to this file")
+    args = parser.parse_args()
+
+    resume = ""
+    if args.resume:
+        with open(args.resume, encoding="utf-8", errors="replace") as f:
+            resume = f.read()
+    report = analyze(args.sources, resume, args.top)
+    print(render_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
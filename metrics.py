@@ -0,0 +1,268 @@
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ---------------------
+# Request tracing and metrics
+# ---------------------
+# Spans time each stage of a request (routing, search, prompt, llm, render).
+# A span's recorded time excludes nested spans, so stages add up to the
+# request total, except that a streamed answer is produced on its own thread
+# (see singleflight) and rendering overlaps the LLM stream: "render" is only
+# the reader's own time, and the stages can add up to slightly more. Inside trace_request() stage times are summed per request
+# and observed once per stage when the request ends; outside a trace every
+# span is observed directly. Histograms render in the Prometheus text format.
+
+METRICS_FILE = os.getenv("METRICS_FILE", os.path.join(".cache", "metrics.prom"))
+METRICS_PORT = os.getenv("METRICS_PORT")
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+BYTES_BUCKETS = (256, 1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072)
+PREFIX = "career_assistant"
+
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+class Metrics:
+    """Thread-safe registry of labelled histograms, counters and gauges."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+        self._help = {}
+
+    def observe(self, name: str, value: float, buckets: tuple = SECONDS_BUCKETS, help: str = "", **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(buckets)
+            series[key].observe(value)
+            if help:
+                self._help.setdefault(name, help)
+
+    def inc(self, name: str, value: float = 1, help: str = "", **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+            if help:
+                self._help.setdefault(name, help)
+
+    def set(self, name: str, value: float, help: str = "", **labels):
+        """Set a gauge to its current value."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+            if help:
+                self._help.setdefault(name, help)
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = f"{PREFIX}_{name}"
+                if name in self._help:
+                    lines.append(f"# HELP {full} {self._help[name]}")
+                lines.append(f"# TYPE {full} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{full}{fmt(labels)} {value}")
+            for name, series in sorted(self._gauges.items()):
+                full = f"{PREFIX}_{name}"
+                if name in self._help:
+                    lines.append(f"# HELP {full} {self._help[name]}")
+                lines.append(f"# TYPE {full} gauge")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{full}{fmt(labels)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                full = f"{PREFIX}_{name}"
+                if name in self._help:
+                    lines.append(f"# HELP {full} {self._help[name]}")
+                lines.append(f"# TYPE {full} histogram")
+                for labels, histogram in sorted(series.items()):
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f"{full}_bucket{fmt(labels, [('le', bound)])} {count}")
+                    lines.append(f"{full}_bucket{fmt(labels, [('le', '+Inf')])} {histogram.count}")
+                    lines.append(f"{full}_sum{fmt(labels)} {histogram.sum}")
+                    lines.append(f"{full}_count{fmt(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str = METRICS_FILE):
+        """Write the Prometheus text to a file (atomically, for node-exporter style scraping)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+
+metrics = Metrics()
+
+
+class Trace:
+    """Stage timings and attributes collected for one request."""
+
+    def __init__(self):
+        self.stages = {}
+        self.attributes = {}
+        self.started = time.perf_counter()
+        self._stack = []
+
+    def add(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+# Per-thread stack of open spans, used to subtract nested time from parents
+_open_spans = threading.local()
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def _stack() -> list:
+    if not hasattr(_open_spans, "stack"):
+        _open_spans.stack = []
+    return _open_spans.stack
+
+
+def record(stage: str, seconds: float):
+    """Record time measured outside a span (counts as nested in any open span)."""
+    stack = _stack()
+    if stack:
+        stack[-1][1] += seconds
+    trace = current_trace()
+    if trace is not None:
+        trace.add(stage, seconds)
+    else:
+        metrics.observe("stage_seconds", seconds, help="Time spent per request stage", stage=stage)
+
+
+def exclude(seconds: float):
+    """Leave time spent waiting on work timed elsewhere (e.g. another thread) out of the open span."""
+    stack = _stack()
+    if stack:
+        stack[-1][1] += seconds
+
+
+@contextmanager
+def span(stage: str):
+    """Time a stage; time spent in nested spans is attributed to them, not this one."""
+    stack = _stack()
+    frame = [stage, 0.0]
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        record(stage, elapsed - frame[1])
+        if stack:
+            # record() credited the self time; parents must exclude the full nested time
+            stack[-1][1] += frame[1]
+
+
+def set_attribute(name: str, value):
+    trace = current_trace()
+    if trace is not None:
+        trace.attributes[name] = value
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token) when the provider reports none."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def record_llm_usage(prompt: str, answer: str, usage: dict = None):
+    """Record prompt size and token counts, preferring provider-reported usage."""
+    prompt_bytes = len(prompt.encode())
+    input_tokens = (usage or {}).get("input_tokens") or estimate_tokens(prompt)
+    output_tokens = (usage or {}).get("output_tokens") or estimate_tokens(answer)
+    metrics.observe("prompt_bytes", prompt_bytes, buckets=BYTES_BUCKETS, help="Prompt size in bytes")
+    metrics.inc("tokens_total", input_tokens, help="LLM tokens (estimated when not reported)", direction="input")
+    metrics.inc("tokens_total", output_tokens, direction="output")
+    set_attribute("prompt_bytes", prompt_bytes)
+    set_attribute("input_tokens", input_tokens)
+    set_attribute("output_tokens", output_tokens)
+
+
+@contextmanager
+def trace_request(kind: str = "chat"):
+    """Collect stage timings for one request and observe them when it ends."""
+    trace = Trace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        total = time.perf_counter() - trace.started
+        for stage, seconds in trace.stages.items():
+            metrics.observe("stage_seconds", seconds, help="Time spent per request stage", stage=stage)
+        intent = trace.attributes.get("intent", "unknown")
+        metrics.observe("request_seconds", total, help="End-to-end request time", kind=kind, intent=intent)
+        trace.attributes["total"] = total
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT):
+    """Serve /metrics on the given port in a daemon thread (once per process; no-op without a port)."""
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer(("0.0.0.0", int(port)), _MetricsHandler)
+            except OSError:
+                # Another worker process already owns the port
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
@@ -0,0 +1,176 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from answer_cache import get_answer_cache
+from metrics import metrics, trace_request
+from ratelimit import priority
+from router import route_query
+from search_cache import refreshing
+
+# ---------------------
+# Background prefetch and stale-while-revalidate
+# ---------------------
+# A worker thread keeps research and answers for a watchlist of popular
+# companies, salary searches and industries warm: each pass refreshes the
+# entries that are missing or close to their max age. Interactive requests
+# that hit a stale answer are served it straight away and a refresh is queued
+# here. All refreshes share one small thread pool and an hourly budget.
+
+WATCHLIST_PATH = os.getenv("PREFETCH_WATCHLIST", "watchlist.json")
+PREFETCH_INTERVAL = float(os.getenv("PREFETCH_INTERVAL_SECONDS", "300"))
+PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", "2"))
+PREFETCH_MAX_PER_HOUR = int(os.getenv("PREFETCH_MAX_PER_HOUR", "120"))
+PREFETCH_MODEL = os.getenv("PREFETCH_MODEL", "OpenAI")
+
+# Watchlist answers are refreshed once this fraction of their max age has passed
+REFRESH_AHEAD = 0.8
+
+
+def load_watchlist(path: str = WATCHLIST_PATH) -> list:
+    """Read a watchlist file into (action, fields) pairs, in file order.
+
+    Format: {"companies": ["Google", ...],
+             "salaries": [{"role": "Data Scientist", "location": "New York"}, ...],
+             "industries": ["Fintech", ...]}
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    items = [("company", {"company": name}) for name in data.get("companies", [])]
+    items += [("salary", {"role": s["role"], "location": s["location"]}) for s in data.get("salaries", [])]
+    items += [("trends", {"industry": name}) for name in data.get("industries", [])]
+    return items
+
+
+class Prefetcher:
+    """Runs answer refreshes in the background within a concurrency and hourly budget."""
+
+    def __init__(self, concurrency: int = PREFETCH_CONCURRENCY, max_per_hour: int = PREFETCH_MAX_PER_HOUR):
+        self.max_per_hour = max_per_hour
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="prefetch")
+        self._pending = set()
+        self._spent = deque()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._counters = {"refreshed": 0, "revalidations": 0, "over_budget": 0, "errors": 0}
+
+    def _reserve(self, query: str) -> bool:
+        with self._lock:
+            if query in self._pending:
+                return False
+            now = time.monotonic()
+            while self._spent and now - self._spent[0] > 3600:
+                self._spent.popleft()
+            if len(self._spent) >= self.max_per_hour:
+                self._counters["over_budget"] += 1
+                return False
+            self._spent.append(now)
+            self._pending.add(query)
+            return True
+
+    def submit(self, query: str, llm) -> bool:
+        """Queue a refresh of the answer (and research) for query; False if already queued or over budget."""
+        if not self._reserve(query):
+            return False
+        self._executor.submit(self._refresh, query, llm)
+        return True
+
+    def revalidate(self, query: str, llm):
+        """Refresh a stale answer that was just served."""
+        if self.submit(query, llm):
+            with self._lock:
+                self._counters["revalidations"] += 1
+
+    def _refresh(self, query: str, llm):
+        # Imported here because the assistant pipeline imports this module
+        from assistant import refresh_answer
+
+        try:
+            with trace_request("prefetch"), refreshing(), priority("prefetch"):
+                refresh_answer(query, llm)
+            outcome = "refreshed"
+        except Exception:
+            outcome = "errors"
+        finally:
+            with self._lock:
+                self._pending.discard(query)
+        with self._lock:
+            self._counters[outcome] += 1
+        metrics.inc("prefetch_total", help="Background answer refreshes", outcome=outcome)
+
+    def due(self, queries: list) -> list:
+        """Queries whose cached answer is missing or past REFRESH_AHEAD of its max age."""
+        cache = get_answer_cache()
+        due = []
+        for query in queries:
+            route = route_query(query)
+            max_age = cache.max_age.get(route.intent, 0)
+            if max_age <= 0:
+                continue
+            age = cache.age(query, route)
+            if age is None or age >= max_age * REFRESH_AHEAD:
+                due.append(query)
+        return due
+
+    def run_once(self, queries: list, llm) -> int:
+        """Queue refreshes for the due queries, in watchlist order; returns how many were queued."""
+        return sum(self.submit(query, llm) for query in self.due(queries))
+
+    def start(self, path: str = WATCHLIST_PATH, interval: float = PREFETCH_INTERVAL, model: str = PREFETCH_MODEL):
+        """Start the watchlist worker (once per process; no-op without a watchlist file)."""
+        with self._lock:
+            if self._thread is None and os.path.exists(path):
+                self._thread = threading.Thread(
+                    target=self._loop, args=(path, interval, model), name="prefetch-watchlist", daemon=True
+                )
+                self._thread.start()
+        return self._thread
+
+    def _loop(self, path: str, interval: float, model: str):
+        from assistant import QUICK_ACTION_QUERIES, initialize_llm
+
+        llm = None
+        while True:
+            try:
+                # Built inside the guard so a missing key or SDK is retried next pass, not fatal
+                if llm is None:
+                    llm = initialize_llm(model)
+                # Re-read every pass so watchlist edits apply without a restart
+                queries = [QUICK_ACTION_QUERIES[action].format(**fields) for action, fields in load_watchlist(path)]
+                self.run_once(queries, llm)
+            except Exception as e:
+                with self._lock:
+                    self._counters["errors"] += 1
+                print(f"Prefetch pass failed: {e!r}", file=sys.stderr)
+            time.sleep(interval)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["pending"] = len(self._pending)
+            stats["budget_left"] = max(0, self.max_per_hour - len(self._spent))
+            stats["watching"] = self._thread is not None
+        return stats
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> Prefetcher:
+    """Process-wide prefetcher shared by all sessions."""
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                _prefetcher = Prefetcher()
+    return _prefetcher
+
+
+def start_prefetch():
+    """Start the watchlist worker when a watchlist file exists."""
+    return get_prefetcher().start()
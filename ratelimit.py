@@ -0,0 +1,294 @@
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import metrics, record
+
+# ---------------------
+# Upstream rate limiting and priority scheduling
+# ---------------------
+# Every call to Tavily and each LLM provider takes a token from that
+# upstream's bucket, shared by all sessions in the process. When the bucket
+# is empty callers wait in a bounded priority queue: interactive requests go
+# before batch runs, which go before background prefetch. A full queue makes
+# room for a more important caller by turning away the least important one,
+# and a provider's 429 pauses its bucket and retries instead of surfacing as
+# an error. The request's priority and queue-position listener travel in
+# context variables, which the pipeline copies into its worker threads.
+
+PRIORITIES = {"interactive": 0, "batch": 1, "prefetch": 2}
+# Requests per minute per upstream; the bucket holds RATE_LIMIT_BURST_SECONDS worth of them
+UPSTREAM_RPM = {
+    "tavily": float(os.getenv("RATE_LIMIT_TAVILY_RPM", "300")),
+    "OpenAI": float(os.getenv("RATE_LIMIT_OPENAI_RPM", "500")),
+    "Gemini": float(os.getenv("RATE_LIMIT_GEMINI_RPM", "300")),
+}
+# Server processes sharing those limits (each process has its own buckets)
+PROCESSES = max(1, int(os.getenv("RATE_LIMIT_PROCESSES", "1")))
+BURST_SECONDS = float(os.getenv("RATE_LIMIT_BURST_SECONDS", "2"))
+MAX_QUEUE = int(os.getenv("RATE_LIMIT_MAX_QUEUE", "100"))
+# How long each kind of caller will wait for a token before giving up
+MAX_WAIT = {
+    "interactive": float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "30")),
+    "batch": 600.0,
+    "prefetch": 120.0,
+}
+# Retries after a 429 before the error is passed on
+RATE_LIMIT_RETRIES = 3
+
+_priority = contextvars.ContextVar("upstream_priority", default="interactive")
+_listener = contextvars.ContextVar("queue_listener", default=None)
+
+
+class Overloaded(RuntimeError):
+    """Raised when a call could not get a slot: queue full, displaced, or waited too long."""
+
+
+@contextmanager
+def priority(name: str):
+    """Run upstream calls made inside this block (and threads it starts) at the given priority."""
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """Priority that upstream calls made here would run at."""
+    return _priority.get()
+
+
+@contextmanager
+def queue_listener(callback):
+    """Call callback(upstream, position) while calls made inside this block wait; position 0 = admitted."""
+    token = _listener.set(callback)
+    try:
+        yield
+    finally:
+        _listener.reset(token)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if status == 429:
+        return True
+    text = str(error).lower()
+    return "429" in text or "rate limit" in text or "resource_exhausted" in text or "too many requests" in text
+
+
+def _retry_after(error: Exception, attempt: int) -> float:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return min(60.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return min(30.0, 2.0 ** attempt)
+
+
+class _Waiter:
+    def __init__(self, rank: int, seq: int, name: str):
+        self.rank = rank
+        self.seq = seq
+        self.name = name
+        self.evicted = False
+
+    def __lt__(self, other):
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+
+class UpstreamLimiter:
+    """Token bucket for one upstream with a bounded priority queue of waiting callers."""
+
+    def __init__(self, name: str, rpm: float, burst_seconds: float = BURST_SECONDS, max_queue: int = MAX_QUEUE):
+        self.name = name
+        self.rate = rpm / 60
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.max_queue = max_queue
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._queue = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._counters = {"admitted": 0, "queued": 0, "rejected": 0, "throttled": 0}
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _token_wait(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is now)."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._refill(now)
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def _publish_depth(self):
+        metrics.set("upstream_queue_depth", len(self._queue), help="Calls waiting for an upstream slot", upstream=self.name)
+
+    def _make_room(self, waiter: _Waiter):
+        """Displace the least important waiter for a more important one; raise if the newcomer is least."""
+        worst = max(self._queue)
+        if worst.rank <= waiter.rank:
+            self._reject(waiter.name, "queue_full")
+            raise Overloaded(f"Too many requests are waiting for {self.name}. Please try again in a moment.")
+        self._queue.remove(worst)
+        heapq.heapify(self._queue)
+        worst.evicted = True
+
+    def _reject(self, priority_name: str, reason: str):
+        self._counters["rejected"] += 1
+        metrics.inc("upstream_rejected_total", help="Upstream calls turned away by the limiter",
+                    upstream=self.name, priority=priority_name, reason=reason)
+
+    def acquire(self):
+        """Block until this caller may make one call, in priority order; returns the seconds waited."""
+        name = _priority.get()
+        listener = _listener.get()
+        start = time.monotonic()
+        with self._cond:
+            if not self._queue and self._token_wait(start) == 0:
+                self._tokens -= 1
+                self._counters["admitted"] += 1
+                return self._admitted(name, 0.0)
+
+            waiter = _Waiter(PRIORITIES.get(name, len(PRIORITIES)), next(self._seq), name)
+            if len(self._queue) >= self.max_queue:
+                self._make_room(waiter)
+            heapq.heappush(self._queue, waiter)
+            self._counters["queued"] += 1
+            self._publish_depth()
+            self._cond.notify_all()
+        deadline = start + MAX_WAIT.get(name, MAX_WAIT["interactive"])
+        position = None
+        admitted = False
+        try:
+            while True:
+                moved = None
+                with self._cond:
+                    now = time.monotonic()
+                    if waiter.evicted:
+                        self._reject(name, "displaced")
+                        raise Overloaded(f"{self.name} is busy with higher-priority requests; try again later.")
+                    timeout = deadline - now
+                    if timeout <= 0:
+                        self._reject(name, "timeout")
+                        raise Overloaded(f"{self.name} is overloaded right now. Please try again in a moment.")
+                    if self._queue[0] is waiter:
+                        wait = self._token_wait(now)
+                        if wait == 0:
+                            heapq.heappop(self._queue)
+                            self._tokens -= 1
+                            self._counters["admitted"] += 1
+                            admitted = True
+                            break
+                        timeout = min(timeout, wait)
+                    rank = sorted(self._queue).index(waiter) + 1
+                    if listener is not None and rank != position:
+                        position = moved = rank
+                    else:
+                        self._cond.wait(timeout)
+                if moved is not None:
+                    # Called without the lock held: a listener may be slow (e.g. sending an event)
+                    listener(self.name, moved)
+        finally:
+            with self._cond:
+                if not admitted and not waiter.evicted and waiter in self._queue:
+                    self._queue.remove(waiter)
+                    heapq.heapify(self._queue)
+                self._publish_depth()
+                # The next waiter may now be at the head (or a slot opened up)
+                self._cond.notify_all()
+        if listener is not None:
+            listener(self.name, 0)
+        return self._admitted(name, time.monotonic() - start)
+
+    def _admitted(self, priority_name: str, waited: float) -> float:
+        metrics.observe("upstream_wait_seconds", waited, help="Time spent waiting for an upstream slot",
+                        upstream=self.name, priority=priority_name)
+        if waited:
+            record("queue", waited)
+        return waited
+
+    def throttled(self, seconds: float):
+        """The upstream answered 429: stop handing out tokens for a while."""
+        with self._cond:
+            self._counters["throttled"] += 1
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+        metrics.inc("upstream_throttled_total", help="429 responses from upstreams", upstream=self.name)
+
+    def call(self, fn):
+        """Run fn() once admitted, retrying after a pause when the upstream rate-limits it."""
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self.acquire()
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == RATE_LIMIT_RETRIES or not is_rate_limited(e):
+                    raise
+                self.throttled(_retry_after(e, attempt))
+
+    def stream(self, fn):
+        """Yield from fn() once admitted; a 429 before the first item is retried like call()."""
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self.acquire()
+            items = iter(fn())
+            try:
+                first = next(items, None)
+            except Exception as e:
+                if attempt == RATE_LIMIT_RETRIES or not is_rate_limited(e):
+                    raise
+                self.throttled(_retry_after(e, attempt))
+                continue
+            if first is not None:
+                yield first
+                yield from items
+            return
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._counters)
+            stats["waiting"] = len(self._queue)
+            stats["tokens"] = round(self._tokens, 1)
+        return stats
+
+
+class Limited:
+    """Client wrapper whose invoke/stream calls go through an upstream's limiter; other attributes pass through."""
+
+    def __init__(self, client, upstream: str):
+        self._client = client
+        self._limiter = get_limiter(upstream)
+
+    def invoke(self, *args, **kwargs):
+        return self._limiter.call(lambda: self._client.invoke(*args, **kwargs))
+
+    def stream(self, *args, **kwargs):
+        return self._limiter.stream(lambda: self._client.stream(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(upstream: str) -> UpstreamLimiter:
+    """Process-wide limiter for an upstream ("tavily", "OpenAI", "Gemini")."""
+    with _limiters_lock:
+        if upstream not in _limiters:
+            rpm = UPSTREAM_RPM.get(upstream, 60.0) / PROCESSES
+            _limiters[upstream] = UpstreamLimiter(upstream, rpm, BURST_SECONDS, MAX_QUEUE)
+        return _limiters[upstream]
+
+
+def limiter_stats() -> dict:
+    with _limiters_lock:
+        return {name: limiter.stats() for name, limiter in _limiters.items()}
@@ -0,0 +1,73 @@
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from ratelimit import Overloaded
+
+# ---------------------
+# Concurrent research fan-out
+# ---------------------
+# Several focused searches are issued at once and gathered under one deadline,
+# so wall-clock time tracks the slowest search rather than the sum of them.
+
+SEARCH_DEADLINE = float(os.getenv("SEARCH_DEADLINE_SECONDS", "8"))
+
+# Shared pool so a timed-out search never blocks the caller: abandoned threads
+# finish in the background instead of being joined at the end of asyncio.run().
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="research")
+
+
+def dedupe_by_url(results: list) -> list:
+    """Drop results whose URL was already seen, keeping the first occurrence."""
+    seen = set()
+    unique = []
+    for item in results:
+        url = item.get("url", "").rstrip("/").lower()
+        if url and url in seen:
+            continue
+        seen.add(url)
+        unique.append(item)
+    return unique
+
+
+async def afan_out_search(queries: list, search_fn, deadline: float = SEARCH_DEADLINE) -> list:
+    """Run search_fn for every query concurrently and return the merged, deduplicated results.
+
+    Queries that miss the deadline, raise, or return something other than a
+    list of results are dropped instead of failing the whole research step.
+    When none succeeds and the rate limiter turned any of them away, that
+    Overloaded is raised so backpressure reaches the caller.
+    """
+    loop = asyncio.get_running_loop()
+    # Each search runs in a copy of the caller's context (request-scoped settings carry over)
+    tasks = [
+        loop.run_in_executor(_executor, contextvars.copy_context().run, search_fn, query) for query in queries
+    ]
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    merged = []
+    succeeded = 0
+    overloaded = None
+    for task in tasks:
+        if task not in done:
+            continue
+        error = task.exception()
+        if error is not None:
+            if isinstance(error, Overloaded):
+                overloaded = error
+            continue
+        results = task.result()
+        if isinstance(results, list):
+            succeeded += 1
+            merged.extend(results)
+    if not succeeded and overloaded is not None:
+        raise overloaded
+    return dedupe_by_url(merged)
+
+
+def fan_out_search(queries: list, search_fn, deadline: float = SEARCH_DEADLINE) -> list:
+    """Blocking wrapper around afan_out_search for synchronous callers."""
+    return asyncio.run(afan_out_search(queries, search_fn, deadline))
@@ -0,0 +1,200 @@
+import re
+from dataclasses import dataclass, fields
+
+# ---------------------
+# Intent routing
+# ---------------------
+# All patterns are compiled once at import. A single scan of the query with
+# the keyword alternation finds every intent cue; the winning intent is the
+# highest-priority cue present, then only that intent's slot patterns run.
+
+INTENTS = ["jd", "salary", "interview", "resume", "trends", "company", "general"]
+
+_KEYWORDS = {
+    "jd": r"job\s+description|\bjd\b",
+    "salary": r"salar(?:y|ies)|compensation|\bpay(?:s|ing)?\b|\btc\b|\bwages?\b|how\s+much\s+(?:do|does|can)",
+    "interview": r"interview(?:s|ing)?|questions?",
+    "resume": r"r[eé]sum[eé]s?|\bcv\b|cover\s+letter",
+    "trends": r"trends?|trending|industry|sector|outlook|hot\s+skills|in-demand",
+    "company": r"tell\s+me\s+about|\babout\b|\bcompany\b|\bresearch\b|\bwork(?:ing)?\s+at\b",
+}
+_KEYWORD_SCAN = re.compile(
+    "|".join(f"(?P<{intent}>{pattern})" for intent, pattern in _KEYWORDS.items()),
+    re.IGNORECASE,
+)
+_PRIORITY = {intent: rank for rank, intent in enumerate(INTENTS)}
+_ANALYZE = re.compile(r"\b(?:analy[sz]e|extract|review|break\s+down)\b", re.IGNORECASE)
+
+# Slot patterns. A slot runs up to punctuation, but a "." only ends it at the
+# end of a sentence: not inside a name ("Node.js", "Booking.com"), after an
+# abbreviation ("St. Louis") or within initials ("D.C.", "U.S.").
+_ABBREVIATION_DOT = r"(?<=\b(?:st|mt|ft))\.|(?<=\.[a-z])\."
+_SLOT = rf"(?:[^?.!,;:\n]|\.(?!\s|$)|{_ABBREVIATION_DOT})"
+# Initials end a sentence only when a capitalized word follows ("in the U.S. Include ...")
+_END = r"[?!,;:\n]|(?<!\bst)(?<!\bmt)(?<!\bft)(?<!\.[a-z])\.(?:\s|$)|(?<=\.[a-z]\.)(?=\s+(?-i:[A-Z]))|$"
+_STATE_CODE = r",\s*(?-i:[A-Z]\.?[A-Z]\b)"
+_STOP = rf"(?=\s+(?:in|at|with|level|position|role|job|jobs|based|who|that|and\s+what|include|including)\b|{_END})"
+# The level goes in its own slot, not the role
+_LEVEL_PREFIX = r"(?:(?:entry|junior|mid|senior|staff|principal|lead)(?:[\s-]+level)?\s+)?"
+_ROLE_AFTER_FOR = re.compile(
+    r"\b(?:for|as)\s+(?:an?\s+|the\s+)?" + _LEVEL_PREFIX + rf"(?P<role>{_SLOT}+?)" + _STOP,
+    re.IGNORECASE,
+)
+_ROLE_BEFORE_KEYWORD = re.compile(
+    r"^(?:what(?:'s|\s+is|\s+are)?\s+(?:the\s+|a\s+|an\s+)?|how\s+much\s+(?:do|does|can)\s+(?:an?\s+)?)?"
+    + _LEVEL_PREFIX + r"(?P<role>[a-z][\w.+#/\- ]*?)\s+(?:salary|salaries|compensation|pay|tc|wages?|interview|resume|cv|make|earn)\b",
+    re.IGNORECASE,
+)
+# A comma inside a location is kept before a state or district code ("Austin, TX", "Washington, D.C.")
+_LOCATION = re.compile(
+    rf"\bin\s+(?:the\s+)?(?P<location>(?:{_SLOT}|{_STATE_CODE})+?)"
+    rf"(?=\s+(?:for|with|at|as)\b|(?!{_STATE_CODE})(?:{_END}))",
+    re.IGNORECASE,
+)
+_LEVEL = re.compile(r"\b(?P<level>entry|junior|intern|graduate|new\s+grad|mid|intermediate|senior|staff|principal|lead)\b", re.IGNORECASE)
+_EXPERIENCE = re.compile(r"\b(?P<experience>\d+(?:\.\d+)?\+?(?:\s*(?:-|to)\s*\d+)?)\s*(?:years?|yrs?)\b", re.IGNORECASE)
+_INDUSTRY = re.compile(
+    rf"\b(?:in|about|for|of)\s+(?:the\s+)?(?P<industry>{_SLOT}+?)"
+    rf"(?=\s+(?:industry|sector|space|market|field)\b|\s+(?:for|in|with)\b|{_END})",
+    re.IGNORECASE,
+)
+_INDUSTRY_BEFORE = re.compile(r"\b(?P<industry>[\w/&+\- ]+?)\s+(?:industry|sector)\s+trends?\b", re.IGNORECASE)
+# "research" only introduces a company as a request ("Research Stripe"), not in a
+# job title ("Research Scientist"); "and" is part of names like "Ernst and Young"
+_COMPANY = re.compile(
+    r"(?:\b(?:tell\s+me\s+about|about|work(?:ing)?\s+at|company)|(?:^|\b(?:please|can\s+you|could\s+you)\s+)research)"
+    r"\s+(?:the\s+)?(?:company\s+)?"
+    rf"(?P<company>{_SLOT}+?)(?=\s+(?:company|for|include|including|culture|news|as\s+an?)\b"
+    rf"|\s+and\s+(?:its|their|the|what|how|why|any|also|whether)\b|'s\b|{_END})",
+    re.IGNORECASE,
+)
+
+_LEVEL_NAMES = {
+    "entry": "entry", "junior": "entry", "intern": "entry", "graduate": "entry", "new grad": "entry",
+    "mid": "mid", "intermediate": "mid",
+    "senior": "senior", "staff": "senior", "principal": "senior", "lead": "senior",
+}
+_LEADING_FILLER = re.compile(
+    r"^(?:what(?:'s|\s+is|\s+are)?|which|show\s+me|give\s+me|tell\s+me|the|a|an|my|our|latest|current|recent|some)\s+",
+    re.IGNORECASE,
+)
+_TRAILING_FILLER = re.compile(r"\s+(?:salary|salaries|compensation|pay|interview|interviews|questions?|resume|cv|tips|roles?|positions?|jobs?)$", re.IGNORECASE)
+_GENERIC_SLOTS = {"", "me", "it", "this", "that", "them", "you", "general", "a job", "my career", "a company"}
+_MAX_SLOT_WORDS = 6
+# A slot that starts with a verb or question word, or refers to the asker,
+# means a pattern latched onto the wrong part of the sentence ("What are
+# interview questions ..." is not a role called "are")
+_NOT_SLOT_START = {
+    "i", "am", "are", "is", "was", "were", "be", "do", "does", "did", "should", "would", "could", "can", "will",
+    "shall", "may", "might", "must", "have", "has", "had", "get", "include", "make", "earn",
+    "how", "why", "when", "where", "who", "whom",
+}
+_NOT_SLOT_WORDS = {"me", "my", "mine", "myself", "you", "your", "yours", "we", "our", "ours"}
+
+
+class _Unparsed(ValueError):
+    """A slot pattern matched, but only text that cannot be that slot."""
+
+
+@dataclass
+class Route:
+    """Result of routing one query: the intent plus any slots that were found."""
+
+    intent: str = "general"
+    company: str = ""
+    role: str = ""
+    level: str = ""
+    location: str = ""
+    experience: str = ""
+    industry: str = ""
+
+    def slots(self) -> dict:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "intent" and getattr(self, f.name)}
+
+
+def _clean(value: str) -> str:
+    value = value.strip().strip("\"'`*")
+    while True:
+        stripped = _TRAILING_FILLER.sub("", _LEADING_FILLER.sub("", value)).strip()
+        if stripped == value:
+            break
+        value = stripped
+    if value.lower() in _GENERIC_SLOTS or len(value.split()) > _MAX_SLOT_WORDS:
+        return ""
+    return value
+
+
+def _garbled(value: str) -> bool:
+    words = value.lower().split()
+    return bool(words) and (words[0] in _NOT_SLOT_START or not _NOT_SLOT_WORDS.isdisjoint(words))
+
+
+def _first(pattern, text: str, group: str) -> str:
+    garbled = False
+    for match in pattern.finditer(text):
+        value = _clean(match.group(group))
+        if value and _garbled(value):
+            garbled = True
+        elif value:
+            return value
+    if garbled:
+        raise _Unparsed(group)
+    return ""
+
+
+def _role(text: str) -> str:
+    return _first(_ROLE_AFTER_FOR, text, "role") or _first(_ROLE_BEFORE_KEYWORD, text, "role")
+
+
+def _level(text: str) -> str:
+    match = _LEVEL.search(text)
+    return _LEVEL_NAMES[" ".join(match.group("level").lower().split())] if match else ""
+
+
+def _experience(text: str) -> str:
+    match = _EXPERIENCE.search(text)
+    return f"{match.group('experience')} years" if match else ""
+
+
+def _industry(text: str) -> str:
+    return _first(_INDUSTRY_BEFORE, text, "industry") or _first(_INDUSTRY, text, "industry")
+
+
+def detect_intent(query: str) -> str:
+    """Highest-priority intent whose keywords appear in the query."""
+    found = {match.lastgroup for match in _KEYWORD_SCAN.finditer(query)}
+    if "jd" in found and not _ANALYZE.search(query):
+        # "job description" without an analysis request is an ordinary question
+        found.discard("jd")
+    return min(found, key=_PRIORITY.get, default="general")
+
+
+def route_query(query: str) -> Route:
+    """Classify the query and extract the slots its intent needs.
+
+    A query whose slots do not parse cleanly goes to the general route, which
+    leaves the question to the LLM instead of researching the wrong thing.
+    """
+    # Long pasted text (e.g. a JD) only needs the instruction line for routing
+    head = query.split("\n", 1)[0] if "\n" in query else query
+    try:
+        return _route_intent(detect_intent(head), head)
+    except _Unparsed:
+        return Route(intent="general")
+
+
+def _route_intent(intent: str, head: str) -> Route:
+    if intent == "jd":
+        return Route(intent="jd")
+    if intent == "salary":
+        # "in" after a role means location here, never industry
+        return Route(intent="salary", role=_role(head), location=_first(_LOCATION, head, "location"), level=_level(head))
+    if intent == "interview":
+        return Route(intent="interview", role=_role(head), level=_level(head) or "mid", company=_first(_COMPANY, head, "company"))
+    if intent == "resume":
+        return Route(intent="resume", role=_role(head), experience=_experience(head), level=_level(head))
+    if intent == "trends":
+        return Route(intent="trends", industry=_industry(head))
+    if intent == "company":
+        return Route(intent="company", company=_first(_COMPANY, head, "company"))
+    return Route(intent="general")
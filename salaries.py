@@ -0,0 +1,418 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+from answer_cache import normalize_slot
+
+# ---------------------
+# Salary figures from search snippets
+# ---------------------
+# Salary search results are parsed into numeric figures: a low/high range (or
+# a single value), currency, pay period and whether it is base pay or total
+# compensation. Figures are annualized and kept in a SQLite dataset keyed by
+# normalized role, level and location, so later salary questions for the same
+# pair are answered from percentiles over the stored figures without new
+# searches or an LLM call. A level with too few figures falls back to the
+# figures for every level of the role.
+
+DATASET_PATH = os.getenv("SALARY_DB_PATH", os.path.join(".cache", "salaries.sqlite3"))
+# Figures older than this are ignored and the pair is searched again
+MAX_AGE_DAYS = float(os.getenv("SALARY_MAX_AGE_DAYS", "30"))
+# Also ask the LLM for a short narrative under the figures (otherwise no LLM call)
+NARRATIVE = os.getenv("SALARY_NARRATIVE", "0") == "1"
+# Fewer figures than this are not enough to answer from the dataset
+MIN_FIGURES = int(os.getenv("SALARY_MIN_FIGURES", "3"))
+
+PERCENTILES = [10, 25, 50, 75, 90]
+KINDS = ["base", "total"]
+# Annual figures outside this range are parsing noise (funding rounds, counts, ...)
+ANNUAL_BOUNDS = {"INR": (100_000, 200_000_000), "JPY": (1_000_000, 300_000_000)}
+DEFAULT_BOUNDS = (8_000, 3_000_000)
+
+PERIOD_MULTIPLIERS = {"hour": 2080, "day": 260, "week": 52, "month": 12, "year": 1}
+CURRENCY_SYMBOLS = {
+    "US$": "USD", "$": "USD", "CA$": "CAD", "C$": "CAD", "A$": "AUD", "AU$": "AUD", "S$": "SGD",
+    "€": "EUR", "£": "GBP", "₹": "INR", "¥": "JPY", "CHF": "CHF", "Rs": "INR", "Rs.": "INR",
+}
+CURRENCY_CODES = ["USD", "EUR", "GBP", "CAD", "AUD", "INR", "CHF", "SGD", "JPY"]
+INR_SCALES = {"lakh", "lakhs", "lpa", "crore"}
+SCALE_WORDS = {"k": 1_000, "m": 1_000_000, "million": 1_000_000, "lakh": 100_000, "lakhs": 100_000, "lpa": 100_000, "crore": 10_000_000}
+
+_SYMBOL = "|".join(re.escape(s) for s in sorted(CURRENCY_SYMBOLS, key=len, reverse=True))
+_CODE = "|".join(CURRENCY_CODES)
+_NUMBER = r"\d{1,3}(?:[,.\s]\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+_SCALE = r"k|m(?!o)|million|lakhs?|lpa|crore"
+
+
+def _amount(p: str) -> str:
+    return (
+        rf"(?<![A-Za-z\d])(?:(?P<{p}sym>{_SYMBOL})\s?)?(?P<{p}num>{_NUMBER})\s?"
+        rf"(?P<{p}scale>{_SCALE})?\b\s?(?:(?P<{p}code>{_CODE})\b|(?P<{p}post>[€£]))?"
+    )
+
+
+_FIGURE = re.compile(_amount("a") + r"(?:\s*(?:-|–|—|to|and)\s*" + _amount("b") + r")?", re.IGNORECASE)
+_PERIODS = [
+    ("hour", re.compile(r"^\s*(?:/\s*h(?:ou)?r|per\s+hour|an\s+hour|hourly|/\s*hour)", re.IGNORECASE)),
+    ("day", re.compile(r"^\s*(?:/\s*day|per\s+day|a\s+day|daily)", re.IGNORECASE)),
+    ("week", re.compile(r"^\s*(?:/\s*w(?:ee)?k|per\s+week|a\s+week|weekly)", re.IGNORECASE)),
+    ("month", re.compile(r"^\s*(?:/\s*mo(?:nth)?|per\s+month|a\s+month|monthly)", re.IGNORECASE)),
+    ("year", re.compile(r"^\s*(?:/\s*y(?:ea)?r|per\s+(?:year|annum)|a\s+year|annually|annual|p\.?a\.?\b|lpa\b)", re.IGNORECASE)),
+]
+_PERIOD_BEFORE = [
+    ("hour", re.compile(r"hourly(?:\s+(?:rate|pay|wage))?\s*(?:of|is|:)?\s*$", re.IGNORECASE)),
+    ("month", re.compile(r"monthly(?:\s+(?:salary|pay))?\s*(?:of|is|:)?\s*$", re.IGNORECASE)),
+]
+_TOTAL_CUE = re.compile(r"total\s+(?:comp|compensation|pay|earnings|cash)|\btc\b|\bote\b|including\s+(?:bonus|equity|stock)", re.IGNORECASE)
+_BASE_CUE = re.compile(r"\bbase\b|salary|salaries|earn|makes?|paid|pays?\b|wage|income|range", re.IGNORECASE)
+# Amounts described by these words are not salaries (or only a component of one)
+_NOT_SALARY = re.compile(
+    r"bonus(?:es)?\s+(?:of|up to|:)|additional\s+(?:pay|cash|compensation)|signing|sign-on|stock|equity|rsus?|raised|funding|revenue|valuation|"
+    r"tuition|rent|cost of living|401\(?k\)?|budget|stipend|per\s+share|market\s+cap",
+    re.IGNORECASE,
+)
+# ... and so are amounts followed by them ("a $20,000 sign-on bonus", "$25,000 in stock"). Only a few
+# qualifiers may sit in between, so "a base salary of $150,000 plus bonus" is still a salary.
+_NOT_SALARY_AFTER = re.compile(
+    r"\s*(?:(?:in|of|worth\s+of|annual|yearly|target|performance|cash|one-time|retention|restricted)\s+)*"
+    r"(?:bonus(?:es)?|stock|equity|rsus?|sign[- ]?on|signing|relocation|shares|options)\b",
+    re.IGNORECASE,
+)
+_SENTENCE_START = re.compile(r"[.!?\n]\s")
+
+
+@dataclass
+class SalaryFigure:
+    kind: str
+    low: float
+    high: float
+    # Currency code and the period the figure was quoted in; low/high are annual
+    currency: str
+    period: str
+    source: str = ""
+
+
+def _number(text: str) -> float:
+    text = text.replace(" ", "")
+    if re.fullmatch(r"\d{1,3}(?:\.\d{3})+(?:,\d+)?", text):
+        # "65.000" style thousands separators; salaries are never quoted to three decimals
+        return float(text.replace(".", "").replace(",", "."))
+    return float(text.replace(",", ""))
+
+
+def _currency(match, prefix: str):
+    symbol, code = match.group(f"{prefix}sym") or match.group(f"{prefix}post"), match.group(f"{prefix}code")
+    if code:
+        return code.upper()
+    if symbol:
+        return CURRENCY_SYMBOLS.get(symbol) or CURRENCY_SYMBOLS.get(symbol.upper()) or CURRENCY_SYMBOLS.get(symbol.capitalize())
+    if (match.group(f"{prefix}scale") or "").lower() in INR_SCALES:
+        return "INR"
+    return None
+
+
+def _context(text: str, start: int) -> str:
+    """The sentence (or last 120 characters of it) before a figure."""
+    before = text[max(0, start - 120):start]
+    sentences = list(_SENTENCE_START.finditer(before))
+    return before[sentences[-1].end():] if sentences else before
+
+
+def _period(text: str, match, annual_guess: float) -> str:
+    after = text[match.end():match.end() + 25]
+    for period, regex in _PERIODS:
+        if regex.search(after):
+            return period
+    before = text[max(0, match.start() - 40):match.start()]
+    for period, regex in _PERIOD_BEFORE:
+        if regex.search(before):
+            return period
+    # Unlabelled small amounts are hourly rates ("$45-60")
+    return "hour" if annual_guess < 300 else "year"
+
+
+def parse_salaries(text: str, source: str = "") -> list:
+    """Salary figures quoted in a piece of text, annualized; amounts that are not pay are skipped."""
+    figures = []
+    for match in _FIGURE.finditer(text):
+        currency = _currency(match, "a") or (match.group("bnum") and _currency(match, "b"))
+        if not currency:
+            continue
+        before = _context(text, match.start())
+        if _NOT_SALARY.search(before[-60:]) or _NOT_SALARY_AFTER.match(text, match.end()):
+            continue
+        values = []
+        for prefix in ("a", "b"):
+            if match.group(f"{prefix}num") is None:
+                continue
+            scale = (match.group(f"{prefix}scale") or "").lower()
+            values.append([_number(match.group(f"{prefix}num")), SCALE_WORDS.get(scale, 1)])
+        if len(values) == 2:
+            # "$95-120K", "12 to 18 lakh": a scale written once applies to both ends
+            (low, low_scale), (high, high_scale) = values
+            if low_scale == 1 and high_scale > 1 and low < 1000:
+                values[0][1] = high_scale
+            elif high_scale == 1 and low_scale > 1 and high < 1000:
+                values[1][1] = low_scale
+        amounts = sorted(value * scale for value, scale in values)
+        if amounts[0] <= 0:
+            continue
+        if len(amounts) == 2 and amounts[1] > amounts[0] * 10:
+            # Not a range, e.g. "$50 and 10,000 employees"
+            amounts = amounts[:1]
+
+        period = _period(text, match, amounts[-1])
+        low, high = (amount * PERIOD_MULTIPLIERS[period] for amount in (amounts[0], amounts[-1]))
+        lowest, highest = ANNUAL_BOUNDS.get(currency, DEFAULT_BOUNDS)
+        if not (lowest <= low and high <= highest):
+            continue
+        if _TOTAL_CUE.search(before) or _TOTAL_CUE.match(text[match.end():match.end() + 40].lstrip(" ()in")):
+            kind = "total"
+        elif _BASE_CUE.search(before) or period != "year":
+            kind = "base"
+        else:
+            # A bare amount with no pay wording around it
+            continue
+        figures.append(SalaryFigure(kind, low, high, currency, period, source))
+    return figures
+
+
+def parse_results(results: list) -> list:
+    """Salary figures from Tavily results (content plus url)."""
+    figures = []
+    for item in results:
+        if isinstance(item, dict):
+            figures += parse_salaries(item.get("content") or "", item.get("url", ""))
+    return figures
+
+
+# ---------------------
+# Dataset
+# ---------------------
+class SalaryDataset:
+    """Salary figures per normalized (role, level, location), backed by a SQLite file.
+
+    If the file cannot be opened (e.g. a read-only .cache) the dataset stays
+    empty and salary answers come from search + LLM, as without it.
+    """
+
+    def __init__(self, path: str = DATASET_PATH):
+        self.path = path
+        self._local = threading.local()
+        self.errors = 0
+        try:
+            self._create()
+            self._ok = True
+        except (sqlite3.Error, OSError):
+            self._ok = False
+            self.errors += 1
+
+    def _create(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(figures)")]
+        if columns and "level" not in columns:
+            # Figures from before levels were kept; the next salary searches collect them again
+            conn.execute("DROP TABLE figures")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS figures (
+                role TEXT NOT NULL,
+                level TEXT NOT NULL,
+                location TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                low REAL NOT NULL,
+                high REAL NOT NULL,
+                currency TEXT NOT NULL,
+                period TEXT NOT NULL,
+                source TEXT NOT NULL,
+                observed REAL NOT NULL,
+                UNIQUE (role, level, location, kind, low, high, currency, source)
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS figures_by_key ON figures (role, location, level, observed)")
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def key(role: str, location: str, level: str = "") -> tuple:
+        return normalize_slot(role), normalize_slot(location), normalize_slot(level)
+
+    def add(self, role: str, location: str, figures: list, level: str = "") -> int:
+        """Store figures for a role, location and level ("" when the search named none).
+
+        A figure already seen from the same source is refreshed.
+        """
+        if not self._ok:
+            return 0
+        role, location, level = self.key(role, location, level)
+        now = time.time()
+        try:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    """INSERT INTO figures (role, level, location, kind, low, high, currency, period, source, observed)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (role, level, location, kind, low, high, currency, source)
+                       DO UPDATE SET observed = excluded.observed""",
+                    [(role, level, location, f.kind, f.low, f.high, f.currency, f.period, f.source, now) for f in figures],
+                )
+        except sqlite3.Error:
+            self.errors += 1
+            return 0
+        return len(figures)
+
+    def _where(self, role: str, location: str, level, max_age_days: float) -> tuple:
+        """SQL condition and parameters for fresh figures of a role and location; level None means every level."""
+        role_key, location_key, level_key = self.key(role, location, level or "")
+        where = "WHERE role = ? AND location = ? AND observed >= ?"
+        params = (role_key, location_key, time.time() - max_age_days * 86400)
+        if level is not None:
+            where += " AND level = ?"
+            params += (level_key,)
+        return where, params
+
+    def figures(self, role: str, location: str, max_age_days: float = MAX_AGE_DAYS, level: str = None) -> list:
+        """Stored figures for a role and location, for one level or (None) every level."""
+        if not self._ok:
+            return []
+        where, params = self._where(role, location, level, max_age_days)
+        try:
+            rows = self._connection().execute(
+                f"SELECT kind, low, high, currency, period, source FROM figures {where}", params
+            ).fetchall()
+        except sqlite3.Error:
+            self.errors += 1
+            return []
+        return [SalaryFigure(*row) for row in rows]
+
+    def summary(self, role: str, location: str, max_age_days: float = MAX_AGE_DAYS, min_figures: int = MIN_FIGURES,
+                level: str = ""):
+        """Percentiles of the stored figures for a role and location, or None with too few of them.
+
+        With a level, that level's figures are used when there are enough of
+        them, otherwise those of every level. summary["level"] says which.
+        """
+        if not self._ok:
+            return None
+        if level:
+            summary = self._summary(role, location, level, max_age_days, min_figures)
+            if summary is not None:
+                return summary
+        return self._summary(role, location, None, max_age_days, min_figures)
+
+    def _summary(self, role: str, location: str, level, max_age_days: float, min_figures: int):
+        # NumPy is imported on first use to keep it out of the app's cold start
+        import numpy as np
+
+        where, params = self._where(role, location, level, max_age_days)
+        try:
+            conn = self._connection()
+            # Figures in other currencies (e.g. a remote role quoted in USD and EUR) are left out
+            top = conn.execute(f"SELECT currency FROM figures {where} GROUP BY currency ORDER BY COUNT(*) DESC LIMIT 1", params).fetchone()
+            if top is None:
+                return None
+            rows = conn.execute(f"SELECT kind, low, high, source FROM figures {where} AND currency = ?", params + top).fetchall()
+        except sqlite3.Error:
+            self.errors += 1
+            return None
+        kinds, lows, highs, sources = zip(*rows)
+        summary = summarize(top[0], np.array(kinds), np.array(lows), np.array(highs), np.array(sources), min_figures)
+        if summary is not None:
+            summary["level"] = level or ""
+        return summary
+
+    def stats(self) -> dict:
+        figures = pairs = 0
+        if self._ok:
+            try:
+                figures, pairs = self._connection().execute(
+                    "SELECT COUNT(*), COUNT(DISTINCT role || '|' || location) FROM figures"
+                ).fetchone()
+            except sqlite3.Error:
+                self.errors += 1
+        return {"figures": figures, "pairs": pairs, "available": self._ok, "errors": self.errors}
+
+
+def summarize(currency: str, kinds, lows, highs, sources, min_figures: int = MIN_FIGURES):
+    """Percentiles per kind (base, total) over figure arrays in one currency; None with too few figures."""
+    import numpy as np
+
+    summary = {"currency": currency, "kinds": {}}
+    shown = np.zeros(len(kinds), dtype=bool)
+    for kind in KINDS:
+        selected = kinds == kind
+        count = int(selected.sum())
+        if count < min_figures:
+            continue
+        shown |= selected
+        mids = (lows[selected] + highs[selected]) / 2
+        ranged = selected & (highs > lows)
+        summary["kinds"][kind] = {
+            "figures": count,
+            "sources": len(np.unique(sources[selected])),
+            "percentiles": dict(zip(PERCENTILES, np.percentile(mids, PERCENTILES).round(-2).tolist())),
+            "typical_range": (
+                [float(np.median(lows[ranged]).round(-2)), float(np.median(highs[ranged]).round(-2))] if ranged.any() else None
+            ),
+        }
+    summary["sources"] = len(np.unique(sources[shown]))
+    return summary if summary["kinds"] else None
+
+
+def _money(value: float, currency: str) -> str:
+    symbol = {"USD": "$", "EUR": "€", "GBP": "£", "INR": "₹", "JPY": "¥"}.get(currency)
+    return f"{symbol}{value:,.0f}" if symbol else f"{value:,.0f} {currency}"
+
+
+def render_summary(role: str, location: str, summary: dict, level: str = "") -> str:
+    """Markdown table of the salary percentiles; level is the one asked for, if any."""
+    currency = summary["currency"]
+    labels = {"base": "Base salary", "total": "Total compensation"}
+    figures = sum(k["figures"] for k in summary["kinds"].values())
+    title = f"{summary['level']} {role}" if summary.get("level") else role
+    lines = [
+        f"**Salary data for {title} in {location}** ({figures} figures from {summary['sources']} sources, {currency} per year)",
+        "",
+        "| | 10th | 25th | Median | 75th | 90th |",
+        "|---|---|---|---|---|---|",
+    ]
+    for kind, data in summary["kinds"].items():
+        lines.append(f"| {labels[kind]} | " + " | ".join(_money(v, currency) for v in data["percentiles"].values()) + " |")
+    if level and not summary.get("level"):
+        lines.append(f"\nToo few figures are specific to {level} level yet; these cover every level.")
+    for kind, data in summary["kinds"].items():
+        if data["typical_range"]:
+            low, high = data["typical_range"]
+            lines.append(f"\nTypical quoted {labels[kind].lower()} range: {_money(low, currency)} – {_money(high, currency)}.")
+    lines.append(
+        f"\n*Figures parsed from web search results from the last {MAX_AGE_DAYS:g} days; hourly and monthly rates "
+        "are annualized. They are what the sources report, not verified offers.*\n"
+    )
+    return "\n".join(lines)
+
+
+_dataset = None
+_dataset_lock = threading.Lock()
+
+
+def get_salary_dataset() -> SalaryDataset:
+    """Process-wide salary dataset."""
+    global _dataset
+    if _dataset is None:
+        with _dataset_lock:
+            if _dataset is None:
+                _dataset = SalaryDataset()
+    return _dataset
@@ -0,0 +1,245 @@
+import contextvars
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from singleflight import search_flights
+
+# ---------------------
+# Search result cache
+# ---------------------
+# Two tiers: a small in-memory LRU per process in front of a SQLite file that
+# survives restarts and is shared by every worker process on the machine.
+
+CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", os.path.join(".cache", "search_cache.sqlite3"))
+MEMORY_ENTRIES = int(os.getenv("SEARCH_CACHE_MEMORY_ENTRIES", "512"))
+
+# Time-to-live per research tool, in seconds
+SEARCH_TTLS = {
+    "company": 6 * 60 * 60,
+    "interview": 7 * 24 * 60 * 60,
+    "salary": 24 * 60 * 60,
+    "resume": 7 * 24 * 60 * 60,
+    "trends": 12 * 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+
+# Set while research is being refreshed in the background: reads are skipped
+# so the results come from a new search and replace the cached ones
+_refreshing = contextvars.ContextVar("search_cache_refreshing", default=False)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace so trivial variants share a key."""
+    query = _PUNCTUATION.sub(" ", query.lower())
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+class SearchCache:
+    """TTL cache for search results with an LRU memory tier over a SQLite tier."""
+
+    def __init__(self, path: str = CACHE_PATH, memory_entries: int = MEMORY_ENTRIES, ttls: dict = None):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.ttls = dict(SEARCH_TTLS if ttls is None else ttls)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "disk_errors": 0,
+        }
+        self._init_disk()
+
+    # Disk tier
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_disk(self):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connection()
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    expires REAL NOT NULL
+                )"""
+            )
+            conn.commit()
+            self._disk_ok = True
+        except (sqlite3.Error, OSError):
+            self._disk_ok = False
+            self._counters["disk_errors"] += 1
+
+    def _disk_get(self, key: str):
+        if not self._disk_ok:
+            return None
+        try:
+            row = self._connection().execute(
+                "SELECT payload, expires FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            self._count("disk_errors")
+            return None
+        if row is None:
+            return None
+        payload, expires = row
+        if expires <= time.time():
+            self._count("expirations")
+            return None
+        return expires, json.loads(payload)
+
+    def _disk_set(self, key: str, results, expires: float):
+        if not self._disk_ok:
+            return
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, payload, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(results), expires),
+            )
+            conn.execute("DELETE FROM search_cache WHERE expires <= ?", (time.time(),))
+            conn.commit()
+        except (sqlite3.Error, TypeError, ValueError):
+            self._count("disk_errors")
+
+    # Memory tier
+
+    def _memory_get(self, key: str):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._memory[key]
+                self._counters["expirations"] += 1
+                return None
+            self._memory.move_to_end(key)
+            return entry
+
+    def _memory_set(self, key: str, results, expires: float):
+        with self._lock:
+            self._memory[key] = (expires, results)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    # Public API
+
+    def key(self, tool: str, query: str) -> str:
+        return f"{tool}:{normalize_query(query)}"
+
+    def get(self, tool: str, query: str):
+        """Return cached results for a tool/query pair, or None on a miss."""
+        key = self.key(tool, query)
+        entry = self._memory_get(key)
+        if entry is not None:
+            self._count("memory_hits")
+            return entry[1]
+
+        entry = self._disk_get(key)
+        if entry is not None:
+            self._count("disk_hits")
+            self._memory_set(key, entry[1], entry[0])
+            return entry[1]
+
+        self._count("misses")
+        return None
+
+    def set(self, tool: str, query: str, results):
+        """Store results under the tool's TTL in both tiers."""
+        key = self.key(tool, query)
+        expires = time.time() + self.ttls.get(tool, DEFAULT_TTL)
+        self._memory_set(key, results, expires)
+        self._disk_set(key, results, expires)
+
+    def get_or_search(self, tool: str, query: str, search_fn):
+        """Return cached results, calling search_fn(query) and caching its output on a miss.
+
+        Concurrent misses for the same tool/query share one search_fn call.
+        """
+        results = None if _refreshing.get() else self.get(tool, query)
+        if results is None:
+            results = search_flights.do(self.key(tool, query), lambda: self._search(tool, query, search_fn))
+        return results
+
+    def _search(self, tool: str, query: str, search_fn):
+        results = search_fn(query)
+        if isinstance(results, list):
+            self.set(tool, query, results)
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self._disk_ok:
+            try:
+                conn = self._connection()
+                conn.execute("DELETE FROM search_cache")
+                conn.commit()
+            except sqlite3.Error:
+                self._count("disk_errors")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+def is_refreshing() -> bool:
+    """True inside a refreshing() block, where stored data should be recomputed rather than read."""
+    return _refreshing.get()
+
+
+@contextmanager
+def refreshing():
+    """Bypass cached results (but still store new ones) for searches made inside this block."""
+    token = _refreshing.set(True)
+    try:
+        yield
+    finally:
+        _refreshing.reset(token)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Process-wide cache instance; lives in this module so it outlives Streamlit reruns."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SearchCache()
+    return _cache
@@ -0,0 +1,177 @@
+import contextvars
+import threading
+import time
+
+from metrics import exclude, metrics, record, set_attribute
+from ratelimit import current_priority
+
+# ---------------------
+# Request coalescing
+# ---------------------
+# When several sessions ask for the same thing at once, only the first
+# (the leader) calls upstream; the others wait on its in-flight call and get
+# the same result or error. Streams are shared too: the upstream stream runs
+# on its own producer thread, and every caller (the first one included)
+# replays the chunks produced so far and then follows live. Any reader may
+# go away without cutting the others off; the producer is only cancelled
+# when the last one leaves. Nothing is kept once a call finishes; caching is
+# the caches' job. Calls only coalesce with calls of the same priority: a
+# shared call waits for rate limits at its leader's priority, so a chat
+# request must not join a background prefetch of the same query.
+
+
+class _Flight:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks = []
+        self.done = False
+        self.result = None
+        self.error = None
+        # Callers waiting on or reading this flight; a stream is cancelled when none are left
+        self.subscribers = 1
+        self.streamed = False
+        self.cancelled = False
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        # Off (e.g. in benchmarks) every call runs on its own, through the same code path
+        self.coalesce = True
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._counters = {"leaders": 0, "coalesced": 0}
+
+    def _key(self, key):
+        return (current_priority(), key) if self.coalesce else object()
+
+    def _join(self, key):
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self._counters["leaders"] += 1
+                return flight, True
+            flight.subscribers += 1
+            self._counters["coalesced"] += 1
+        metrics.inc("coalesced_total", help="Upstream calls saved by request coalescing", kind=self.name)
+        set_attribute("coalesced", True)
+        return flight, False
+
+    def _leave(self, key, flight):
+        """A caller stopped waiting or reading; the last one out cancels a stream still running."""
+        with self._lock:
+            flight.subscribers -= 1
+            if flight.subscribers or flight.done or not flight.streamed:
+                return
+            flight.cancelled = True
+            # Later identical requests start a fresh call instead of joining a cancelled one
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def _finish(self, key, flight, result=None, error=None):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        with flight.cond:
+            flight.result, flight.error, flight.done = result, error, True
+            flight.cond.notify_all()
+
+    def do(self, key, fn):
+        """Return fn(), or the result of an identical call already in flight."""
+        key = self._key(key)
+        flight, leader = self._join(key)
+        if leader:
+            try:
+                result = fn()
+            except BaseException as e:
+                self._finish(key, flight, error=e)
+                raise
+            self._finish(key, flight, result=result)
+            return result
+
+        try:
+            with flight.cond:
+                flight.cond.wait_for(lambda: flight.done)
+        finally:
+            self._leave(key, flight)
+        if flight.error is not None:
+            raise flight.error
+        if flight.result is None and flight.chunks:
+            return "".join(flight.chunks)
+        return flight.result
+
+    def stream(self, key, fn):
+        """Yield the chunks of fn() (an iterable of strings), shared with identical streams in flight."""
+        key = self._key(key)
+        flight, leader = self._join(key)
+        if leader:
+            flight.streamed = True
+            # Runs in a copy of the caller's context (trace, priority, queue listener)
+            producer = threading.Thread(
+                target=contextvars.copy_context().run, args=(self._produce, key, flight, fn),
+                name=f"{self.name}-flight", daemon=True,
+            )
+            producer.start()
+
+        index = 0
+        try:
+            while True:
+                with flight.cond:
+                    started = time.perf_counter()
+                    flight.cond.wait_for(lambda: flight.done or len(flight.chunks) > index)
+                    new_chunks = flight.chunks[index:]
+                    done = flight.done
+                waited = time.perf_counter() - started
+                if leader:
+                    # The producer records its own stages (search, llm, ...) in this request's trace
+                    exclude(waited)
+                else:
+                    record("coalesced", waited)
+                index += len(new_chunks)
+                yield from new_chunks
+                if done:
+                    break
+        finally:
+            self._leave(key, flight)
+        if flight.error is not None:
+            raise flight.error
+        if not index and flight.result:
+            # The leader was a non-streaming call
+            yield flight.result
+
+    def _produce(self, key, flight, fn):
+        """Run a shared stream to the end, or until every reader has left."""
+        items = None
+        try:
+            items = iter(fn())
+            for chunk in items:
+                with flight.cond:
+                    flight.chunks.append(chunk)
+                    flight.cond.notify_all()
+                if flight.cancelled:
+                    break
+        except Exception as e:
+            self._finish(key, flight, error=e)
+            return
+        finally:
+            # Closing the generator cancels the provider calls of an abandoned request
+            if hasattr(items, "close"):
+                items.close()
+        if flight.cancelled:
+            self._finish(key, flight, error=RuntimeError("The shared request was cancelled, please retry."))
+        else:
+            self._finish(key, flight, result="".join(flight.chunks))
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["in_flight"] = len(self._flights)
+        return stats
+
+
+# Shared by every session in the process
+search_flights = SingleFlight("search")
+answer_flights = SingleFlight("answer")
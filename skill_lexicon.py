@@ -0,0 +1,161 @@
+# ---------------------
+# Skill lexicon
+# ---------------------
+# Curated skills by category. Each entry is "Canonical|alias|alias...".
+# Matching is case-insensitive on word boundaries; an alias starting with "="
+# only matches with exactly that capitalization (for words such as "Go" or
+# "Swift" that are also ordinary English), and a "=" alias equal to the
+# canonical name makes the canonical name case-sensitive too. Single-letter
+# names (C, R) only match through their longer aliases. Names that are also
+# everyday words even when capitalized at the start of a sentence ("Spring",
+# "Express", "Spark") or in lowercase prose ("node", "ts"), and names that
+# are also places or people ("Phoenix", "Aurora", "Julia", "Ruby", "Ray"),
+# are only matched in context: "Spring Boot", "Express.js", "Apache Spark",
+# "Node.js", "Phoenix Framework", "Ruby developer", "Julia language".
+
+SKILL_LEXICON = {
+    "language": [
+        "Python|python3|py3", "Java|java 8|java 11|java 17", "JavaScript|js|ecmascript|es6|vanilla js",
+        "TypeScript", "=Go|golang", "Rust|rustlang", "C++|cpp|c/c++|modern c++", "C|c language|c programming|ansi c",
+        "C#|c sharp|csharp", "Ruby programming|ruby language|ruby developer|ruby developers|ruby engineer|ruby engineers|ruby 2|ruby 3|rubygems|ruby gems", "PHP", "Kotlin", "=Swift|swift programming|swiftui", "Objective-C|objective c|objc",
+        "Scala", "R|r programming|r language|rstudio", "MATLAB", "Julia language|julialang|julia programming|julia developer", "Perl", "Haskell", "Elixir",
+        "Erlang", "Clojure", "F#|f sharp", "Dart|=Dart", "Lua", "Groovy", "Bash|shell scripting|shell script|bash scripting",
+        "PowerShell", "SQL|structured query language", "PL/SQL|plsql", "T-SQL|tsql|transact-sql", "Solidity",
+        "Assembly|=Assembly|assembly language|x86 assembly|asm", "COBOL", "Fortran", "VBA|visual basic for applications", "Visual Basic|vb.net",
+        "OCaml", "Zig", "Verilog", "VHDL", "SAS", "Stata", "Apex|salesforce apex|=Apex", "ABAP",
+    ],
+    "frontend": [
+        "React|react.js|reactjs", "Angular|angularjs|angular.js", "Vue|vue.js|vuejs", "Svelte|sveltekit",
+        "Next.js|nextjs", "Nuxt|nuxt.js", "Redux|redux toolkit", "HTML|html5", "CSS|css3", "Sass|scss",
+        "Tailwind|tailwind css|tailwindcss", "Bootstrap", "jQuery", "Webpack", "Vite", "Babel", "Storybook",
+        "Material UI|mui", "D3.js|d3", "Three.js|threejs", "WebGL", "Web Components", "Accessibility|a11y|wcag",
+        "Responsive design|responsive web design", "Ember.js|ember", "Backbone.js", "Gatsby", "Remix|=Remix",
+        "React Native|react-native", "Flutter", "Ionic|=Ionic", "Electron|=Electron", "Redux Saga", "RxJS", "Zustand", "Apollo|apollo client",
+        "Cypress", "Playwright", "Jest", "Vitest", "React Testing Library",
+    ],
+    "backend": [
+        "Node.js|nodejs|node js", "Express.js|expressjs|express framework", "NestJS|nest.js", "Django", "Flask", "FastAPI",
+        "Spring Framework|spring mvc|spring cloud", "Spring Boot|springboot", "Ruby on Rails|=Rails|ror", ".NET|dotnet|.net core|asp.net|asp.net core",
+        "Laravel", "Symfony", "Gin|=Gin|gin framework|gin-gonic", "Echo framework", "Fiber|=Fiber|go fiber|gofiber", "Phoenix Framework|phoenix liveview|elixir phoenix|elixir/phoenix|phoenix/elixir", "Ktor", "Micronaut", "Quarkus",
+        "GraphQL", "REST|rest api|rest apis|restful|restful apis|=REST", "gRPC", "Protocol Buffers|protobuf", "WebSockets|websocket",
+        "Microservices|microservice|micro-services", "Event-driven architecture|event driven architecture|event-driven",
+        "Serverless", "OAuth|oauth2|oauth 2.0", "OpenID Connect|oidc", "JWT|json web tokens", "API design",
+        "Distributed systems", "System design", "Domain-driven design|ddd", "Celery", "Sidekiq", "Hibernate", "JPA",
+        "Entity Framework", "SQLAlchemy", "Prisma", "Sequelize", "TypeORM", "Nginx", "Apache HTTP Server|httpd",
+        "Tomcat", "Caching", "Message queues|message queue|message queuing",
+    ],
+    "data": [
+        "Apache Spark|pyspark|spark sql|spark streaming", "Hadoop|hdfs|mapreduce", "Kafka|apache kafka|kafka streams",
+        "Apache Flink|flink", "Apache Beam", "Airflow|apache airflow", "dbt|data build tool", "Dagster", "Prefect|=Prefect",
+        "Snowflake", "BigQuery|google bigquery", "Redshift|amazon redshift", "Databricks", "Delta Lake",
+        "Apache Iceberg", "Hive|=Hive|apache hive|hiveql", "Presto|=Presto", "Trino", "Pandas", "NumPy", "Polars", "Dask",
+        "ETL|elt|etl pipelines", "Data modeling|data modelling|dimensional modeling", "Data warehousing|data warehouse",
+        "Data lake|data lakes|lakehouse", "Data pipelines|data pipeline", "Data governance", "Data quality",
+        "Stream processing|streaming data|real-time data", "Batch processing", "Fivetran", "Stitch|=Stitch|stitch data", "Airbyte",
+        "Informatica", "Talend", "SSIS", "Tableau", "Power BI|powerbi", "Looker|=Looker", "Metabase", "Superset|=Superset|apache superset",
+        "=Excel|microsoft excel|ms excel|advanced excel", "Google Sheets", "Data visualization|data visualisation",
+        "Data analysis|data analytics", "Statistics|statistical analysis|statistical modeling", "A/B testing|ab testing|experimentation",
+        "Business intelligence|bi tools", "Great Expectations", "Kinesis|amazon kinesis", "Pub/Sub|google pub/sub", "RabbitMQ",
+        "ActiveMQ", "NiFi|apache nifi", "Pulsar|apache pulsar", "ClickHouse", "Druid|=Druid|apache druid", "Pinot|=Pinot|apache pinot",
+    ],
+    "database": [
+        "PostgreSQL|postgres|psql", "MySQL", "MariaDB", "SQL Server|mssql|microsoft sql server", "Oracle|oracle database|oracle db",
+        "SQLite", "MongoDB|mongo", "Redis", "Cassandra|apache cassandra", "DynamoDB|amazon dynamodb", "Elasticsearch|elastic search",
+        "OpenSearch", "Neo4j", "CouchDB", "Couchbase", "Firebase", "Firestore", "Memcached", "HBase", "CockroachDB",
+        "InfluxDB", "TimescaleDB", "Supabase", "NoSQL", "Database design", "Query optimization|query tuning",
+        "Vector databases|vector database|vector db", "Pinecone", "Weaviate", "Milvus", "pgvector", "Amazon Aurora|aws aurora|aurora postgresql|aurora mysql|aurora serverless",
+        "Cosmos DB|cosmosdb|azure cosmos db", "Spanner|=Spanner|cloud spanner|google spanner", "Bigtable",
+    ],
+    "ml": [
+        "Machine learning|ml", "Deep learning", "Natural language processing|nlp", "Computer vision",
+        "TensorFlow|tensorflow 2", "PyTorch|torch", "Keras", "scikit-learn|sklearn|scikit learn", "XGBoost", "LightGBM",
+        "CatBoost", "Hugging Face|huggingface|transformers", "LangChain", "LlamaIndex", "OpenAI API|openai",
+        "Large language models|llm|llms|large language model", "Generative AI|genai|gen ai", "Prompt engineering",
+        "Retrieval-augmented generation|rag", "Fine-tuning|fine tuning|finetuning", "Reinforcement learning|rl",
+        "MLOps|ml ops", "MLflow", "Kubeflow", "SageMaker|amazon sagemaker", "Vertex AI", "Azure ML|azure machine learning",
+        "Feature engineering", "Model deployment|model serving", "Recommendation systems|recommender systems|recommendation engines",
+        "Time series|time series forecasting|time-series forecasting|time-series analysis", "Predictive modeling|predictive modelling",
+        "Neural networks|neural network", "CNN|=CNN|cnns|convolutional neural networks", "RNN|rnns|lstm", "Transformers architecture",
+        "OpenCV", "spaCy", "NLTK", "Embeddings", "ONNX", "TensorRT", "CUDA", "Weights & Biases|wandb", "Ray framework|ray.io|ray serve|ray tune|ray cluster|ray clusters",
+        "Mathematical optimization|linear programming|operations research", "Bayesian statistics|bayesian", "Causal inference",
+    ],
+    "cloud": [
+        "AWS|amazon web services", "Azure|microsoft azure", "GCP|google cloud|google cloud platform", "EC2|amazon ec2",
+        "S3|amazon s3", "Lambda|aws lambda|lambda functions|=Lambda", "ECS|amazon ecs", "EKS|amazon eks", "Fargate", "CloudFormation",
+        "IAM|identity and access management", "VPC", "CloudWatch", "Route 53|route53", "API Gateway", "SQS|amazon sqs",
+        "SNS|amazon sns", "Step Functions", "Glue|=Glue|aws glue", "Athena|amazon athena|=Athena", "EMR|amazon emr", "Azure Functions",
+        "Azure DevOps", "AKS|azure kubernetes service", "Azure Data Factory|adf", "Synapse|azure synapse",
+        "Cloud Functions|google cloud functions", "Cloud Run", "GKE|google kubernetes engine", "Dataflow", "Dataproc",
+        "Heroku", "Vercel", "Netlify", "DigitalOcean", "Cloudflare", "Multi-cloud", "Cloud architecture",
+        "Cloud security", "Cost optimization|finops",
+    ],
+    "devops": [
+        "Docker|containers|containerization", "Kubernetes|k8s", "Helm|=Helm|helm charts", "Terraform", "Pulumi", "Ansible", "Chef|chef infra|=Chef",
+        "Puppet", "Jenkins", "GitHub Actions", "GitLab CI|gitlab ci/cd", "CircleCI", "Travis CI", "Argo CD|argocd",
+        "Spinnaker", "CI/CD|ci cd|continuous integration|continuous delivery|continuous deployment", "Infrastructure as code|iac",
+        "Git|version control", "GitHub", "GitLab", "Bitbucket", "Linux|unix", "Prometheus", "Grafana", "Datadog",
+        "New Relic", "Splunk", "ELK|elk stack", "OpenTelemetry", "Jaeger", "PagerDuty", "Observability", "Monitoring",
+        "Site reliability engineering|sre", "Incident management|incident response", "Istio", "Envoy|envoy proxy|=Envoy", "Service mesh",
+        "Vagrant", "Packer|=Packer|hashicorp packer", "Consul|hashicorp consul|=Consul", "Vault|hashicorp vault|=Vault", "Nomad|=Nomad|hashicorp nomad", "Bazel", "Maven|apache maven|=Maven", "Gradle", "npm", "Yarn",
+        "Load balancing", "Computer networking|tcp/ip|dns|network engineering", "Performance tuning|performance optimization", "Chaos engineering",
+    ],
+    "mobile": [
+        "iOS|ios development", "Android|android development", "Xcode", "Android Studio", "Jetpack Compose", "UIKit",
+        "Core Data", "Kotlin Multiplatform", "Xamarin", "Mobile development|mobile app development",
+        "App Store Optimization|aso", "Push notifications",
+    ],
+    "testing": [
+        "Unit testing|unit tests", "Integration testing|integration tests", "End-to-end testing|e2e testing|e2e tests",
+        "Test automation|automated testing|automation testing", "Selenium", "Appium", "JUnit", "TestNG", "pytest",
+        "Mocha|mocha.js", "Chai|chai.js|=Chai", "Cucumber", "Postman|=Postman", "JMeter", "Gatling", "k6", "Load testing|performance testing",
+        "TDD|test-driven development|test driven development", "BDD|behavior-driven development", "QA|quality assurance",
+        "Manual testing", "Regression testing",
+    ],
+    "security": [
+        "Cybersecurity|cyber security|information security|infosec", "Penetration testing|pen testing|pentesting",
+        "Vulnerability management", "SIEM", "SOC|security operations", "Threat modeling|threat modelling",
+        "Identity management|iam governance", "Zero trust", "Encryption|cryptography", "PKI", "SSO|single sign-on",
+        "SAML", "OWASP", "Burp Suite", "Wireshark", "Nmap", "Metasploit", "Firewalls|firewall", "Network security",
+        "Application security|appsec", "DevSecOps", "Incident response", "Risk assessment", "ISO 27001", "SOC 2|soc2",
+        "GDPR", "HIPAA", "PCI DSS|pci-dss|pci", "NIST", "Compliance",
+    ],
+    "design": [
+        "Figma", "Sketch|sketch app|=Sketch", "Adobe XD", "Adobe Photoshop|photoshop", "Adobe Illustrator", "InVision",
+        "Adobe Creative Suite|creative cloud|adobe creative cloud", "After Effects", "Premiere Pro", "Canva",
+        "UX design|user experience|ux", "UI design|user interface design|ui", "User research|ux research",
+        "Wireframing|wireframes", "Prototyping|prototypes", "Interaction design", "Visual design", "Design systems|design system",
+        "Usability testing", "Information architecture", "Human-centered design|user-centered design", "Motion design",
+        "Typography", "Branding", "Graphic design",
+    ],
+    "product": [
+        "Product management", "Product strategy", "Roadmapping|product roadmap|roadmaps", "Agile|agile methodologies",
+        "Scrum", "Kanban", "Lean|=Lean|lean methodology|lean principles|lean manufacturing", "SAFe|scaled agile", "Jira", "Confluence", "Asana", "Trello", "Notion|=Notion",
+        "OKRs|okr", "KPIs|kpi", "User stories", "Requirements gathering", "Stakeholder management",
+        "Go-to-market|go to market|gtm", "Market research", "Competitive analysis", "Product analytics",
+        "Amplitude", "Mixpanel", "Google Analytics|ga4", "Segment|=Segment|twilio segment|segment.io", "SQL analytics", "Pricing strategy",
+        "Project management", "Program management", "Waterfall", "Risk management", "Budgeting", "Forecasting models",
+        "Financial modeling|financial modelling", "Salesforce|sfdc", "HubSpot", "SAP", "Oracle ERP", "Workday|=Workday",
+        "ServiceNow", "Zendesk", "Marketo", "SEO|search engine optimization", "SEM|search engine marketing",
+        "Content marketing", "Digital marketing", "Email marketing", "Social media marketing", "Copywriting",
+        "CRM|customer relationship management", "Customer success", "Account management", "Business development",
+        "Sales", "Negotiation", "Lead generation", "Growth marketing|growth hacking", "Six Sigma|lean six sigma",
+        "Process improvement", "Supply chain management|supply chain", "Procurement", "Accounting", "GAAP", "IFRS",
+        "QuickBooks", "Auditing|audit", "Tax", "Financial analysis", "Valuation", "Excel modeling",
+    ],
+    "soft": [
+        "Communication|communication skills|written and verbal communication|verbal communication|written communication",
+        "Leadership|team leadership|technical leadership", "Teamwork|collaboration|cross-functional collaboration",
+        "Problem solving|problem-solving", "Critical thinking", "Mentoring|mentorship|coaching", "Time management",
+        "Attention to detail|detail-oriented|detail oriented", "Adaptability|flexibility", "Ownership", "Creativity",
+        "Presentation skills|public speaking|presentations", "Analytical skills|analytical thinking",
+        "Decision making|decision-making", "Conflict resolution", "Emotional intelligence", "Customer focus|customer-focused",
+        "Self-starter|self-motivated", "Prioritization", "Organizational skills|organization skills",
+        "Interpersonal skills", "Strategic thinking", "People management", "Storytelling", "Empathy",
+    ],
+    "certification": [
+        "AWS Certified|aws certification|aws solutions architect", "Azure certification|az-900|az-104",
+        "Google Cloud certification|gcp certification", "CKA|certified kubernetes administrator", "PMP",
+        "CSM|certified scrummaster|certified scrum master", "CISSP", "CISM", "CompTIA Security+|security+", "CEH",
+        "OSCP", "CPA", "CFA", "ITIL", "Terraform Associate",
+    ],
+}
@@ -0,0 +1,239 @@
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+from jd import SKIPPED_SECTIONS, heading_kind, job_description, relevant_sections, render_sections, responsibilities
+from skill_lexicon import SKILL_LEXICON
+
+# ---------------------
+# Local skill extraction
+# ---------------------
+# Every alias in the lexicon is compiled into one Aho-Corasick automaton, so a
+# posting or resume is scanned once regardless of lexicon size. Overlapping
+# matches resolve leftmost-longest ("React Native" beats "React"). In a job
+# description each skill is classed as must-have or nice-to-have from the
+# section it appears in and cue words on its line; benefits, company and EEO
+# sections are ignored.
+
+_NICE_CUES = re.compile(
+    r"nice[- ]to[- ]have|preferred|a plus|is a plus|bonus|desirable|familiarity with|exposure to|ideally|optional",
+    re.IGNORECASE,
+)
+_YEARS = re.compile(r"(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?years?", re.IGNORECASE)
+_SENIORITY = [
+    ("principal", re.compile(r"\b(?:principal|distinguished|staff)\b", re.IGNORECASE)),
+    ("lead", re.compile(r"\b(?:lead|head of|manager)\b", re.IGNORECASE)),
+    ("senior", re.compile(r"\b(?:senior|sr\.?)\b", re.IGNORECASE)),
+    ("junior", re.compile(r"\b(?:junior|jr\.?|entry[- ]level|graduate|intern)\b", re.IGNORECASE)),
+    ("mid", re.compile(r"\bmid[- ]?(?:level|senior)?\b", re.IGNORECASE)),
+]
+# Postings with fewer lexicon matches than this (e.g. non-technical roles the
+# lexicon barely covers) are left to the LLM analysis. Soft skills do not
+# count: every posting mentions communication and teamwork.
+MIN_LOCAL_SKILLS = 3
+
+
+@dataclass
+class Skill:
+    name: str
+    category: str
+    # "must" or "nice" for job descriptions, "" for plain text such as resumes
+    requirement: str = ""
+    positions: list = field(default_factory=list)
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over every alias in a skill lexicon."""
+
+    def __init__(self, lexicon: dict = SKILL_LEXICON):
+        self.skills = []
+        self._goto = [{}]
+        self._fail = [0]
+        # Per state: (alias length, skill index, exact-case alias or None)
+        self._out = [[]]
+        for category, entries in lexicon.items():
+            for entry in entries:
+                names = entry.split("|")
+                canonical = names[0].lstrip("=")
+                self.skills.append((canonical, category))
+                index = len(self.skills) - 1
+                exact = {name[1:].lower() for name in names if name.startswith("=")}
+                for name in names:
+                    alias = name.lstrip("=")
+                    case_sensitive = name.startswith("=") or (name is names[0] and alias.lower() in exact)
+                    if len(alias) < 2:
+                        continue
+                    self._add(alias.lower(), (len(alias), index, alias if case_sensitive else None))
+        self._link()
+
+    def _add(self, alias: str, output: tuple):
+        state = 0
+        for char in alias:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if output not in self._out[state]:
+            self._out[state].append(output)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0) if self._goto[fail].get(char, 0) != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def scan(self, text: str) -> list:
+        """Non-overlapping (start, end, skill index) matches, leftmost-longest, in text order."""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters change length when lowercased; keep offsets aligned
+            lowered = "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+        goto, fail, out = self._goto, self._fail, self._out
+        found = []
+        state = 0
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, index, exact in out[state]:
+                start = end - length
+                if start > 0 and lowered[start - 1].isalnum():
+                    continue
+                if end < len(lowered) and lowered[end].isalnum():
+                    continue
+                if exact is not None and text[start:end] != exact:
+                    continue
+                found.append((start, end, index))
+
+        found.sort(key=lambda m: (m[0], m[0] - m[1]))
+        matches, covered = [], 0
+        for start, end, index in found:
+            if start >= covered:
+                matches.append((start, end, index))
+                covered = end
+        return matches
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher() -> SkillMatcher:
+    """Process-wide matcher; the automaton is built on first use."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher()
+    return _matcher
+
+
+def extract_skills(text: str, job_description: bool = True) -> list:
+    """Skills found in text with their (start, end) positions, in order of first mention.
+
+    For a job description, matches in skipped sections are ignored and each
+    skill is classed must-have unless every mention is in a preferred
+    section or on a line with a nice-to-have cue.
+    """
+    matcher = get_matcher()
+    skills = {}
+    offset = 0
+    kind = "overview"
+    for line in text.splitlines(keepends=True):
+        start_of_line = offset
+        offset += len(line)
+        if job_description:
+            line_kind = heading_kind(line)
+            if line_kind is not None:
+                kind = line_kind
+                continue
+            if kind in SKIPPED_SECTIONS:
+                continue
+        nice = kind == "preferred" or bool(_NICE_CUES.search(line))
+        for start, end, index in matcher.scan(line):
+            name, category = matcher.skills[index]
+            skill = skills.get(name)
+            if skill is None:
+                skill = skills[name] = Skill(name, category, "nice" if job_description else "")
+            if job_description and not nice:
+                skill.requirement = "must"
+            skill.positions.append((start_of_line + start, start_of_line + end))
+    return list(skills.values())
+
+
+def experience_requirements(text: str) -> dict:
+    """Seniority from the title (first line) and the largest "N+ years" figure in the text."""
+    title = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    seniority = next((level for level, regex in _SENIORITY if regex.search(title)), "")
+    years = [int(m.group(1)) for m in _YEARS.finditer(text) if int(m.group(1)) <= 30]
+    return {"title": title[:80], "seniority": seniority, "years": max(years) if years else None}
+
+
+CATEGORY_LABELS = {"soft": "Soft skills", "certification": "Certifications"}
+
+
+def render_extraction(skills: list, experience: dict, duties: list) -> str:
+    """Markdown for the first four parts of the JD analysis, built from the local extraction."""
+    technical = [s.name for s in skills if s.category not in CATEGORY_LABELS]
+    lines = ["**1. KEY SKILLS REQUIRED**"]
+    if technical:
+        lines.append(f"- Technical: {', '.join(technical)}")
+    for category, label in CATEGORY_LABELS.items():
+        names = [s.name for s in skills if s.category == category]
+        if names:
+            lines.append(f"- {label}: {', '.join(names)}")
+
+    lines += ["", "**2. MUST-HAVE vs NICE-TO-HAVE**"]
+    for requirement, label in (("must", "Must-have"), ("nice", "Nice-to-have")):
+        names = [s.name for s in skills if s.requirement == requirement]
+        lines.append(f"- {label}: {', '.join(names) if names else 'none listed'}")
+
+    lines += ["", "**3. MAIN RESPONSIBILITIES**"]
+    lines += [f"- {duty}" for duty in duties] or ["- Not listed in the posting"]
+
+    level = " · ".join(
+        part for part in (experience["seniority"].capitalize(), f"{experience['years']}+ years" if experience["years"] else "") if part
+    )
+    lines += ["", "**4. EXPERIENCE LEVEL**", f"- {level or 'Not stated'}", "", "**5. RESUME TAILORING SUGGESTIONS**", ""]
+    return "\n".join(lines) + "\n"
+
+
+def tailoring_prompt(experience: dict, skills: list) -> str:
+    must = ", ".join(s.name for s in skills if s.requirement == "must") or "none listed"
+    nice = ", ".join(s.name for s in skills if s.requirement == "nice") or "none listed"
+    years = f"{experience['years']}+ years" if experience["years"] else "not stated"
+    return f"""You are a career assistant. A candidate is applying for this role:
+
+        Title: {experience['title'] or 'not stated'}
+        Seniority: {experience['seniority'] or 'not stated'}; experience: {years}
+        Must-have skills: {must}
+        Nice-to-have skills: {nice}
+
+        Write only RESUME TAILORING SUGGESTIONS: 4-6 concrete bullet points on how to tailor a resume
+        for this role (which skills to lead with, keywords to mirror, what to quantify). Do not repeat
+        the skills list or add a heading."""
+
+
+def analyze_job_description(user_query: str):
+    """(preamble, prompt) for a JD analysis: parts 1-4 computed locally and a short prompt for part 5.
+
+    Returns None when too few skills are recognized to stand in for the LLM analysis.
+    """
+    posting = job_description(user_query)
+    skills = extract_skills(posting)
+    if sum(skill.category != "soft" for skill in skills) < MIN_LOCAL_SKILLS:
+        return None
+    experience = experience_requirements(render_sections(relevant_sections(posting)) or posting)
+    preamble = render_extraction(skills, experience, responsibilities(posting))
+    return preamble, tailoring_prompt(experience, skills)
@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient  # noqa: E402
+
+import assistant  # noqa: E402
+from ratelimit import Overloaded  # noqa: E402
+from router import Route  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("BENCH_API_SCALE", "0")
+    from benchmarks.bench_api import serve_app
+
+    return TestClient(serve_app())
+
+
+@pytest.fixture
+def overloaded(monkeypatch):
+    def turned_away(user_query, route, llm):
+        raise Overloaded("OpenAI is overloaded right now. Please try again in a moment.")
+        yield
+
+    monkeypatch.setattr(assistant, "_stream", turned_away)
+
+
+def test_answer_streams_chunks_then_done(client):
+    response = client.post("/v1/chat", json={"query": "How do I negotiate a job offer?"})
+    assert response.status_code == 200
+    assert "event: chunk" in response.text
+    assert "event: done" in response.text
+
+
+def test_overloaded_request_is_a_503_with_retry_after(client, overloaded):
+    response = client.post("/v1/chat", json={"query": "How do I negotiate a job offer?", "stream": False})
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) > 0
+    data = response.json()
+    assert data["error"] == "Overloaded"
+    assert data["message"].startswith("The assistant is very busy right now.")
+
+
+def test_overloaded_stream_is_a_503_not_a_chunk(client, overloaded):
+    response = client.post("/v1/chat", json={"query": "How do I negotiate a job offer?"})
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    assert "event: chunk" not in response.text
+
+
+def test_stream_query_yields_overload_message_by_default(client, overloaded):
+    import api
+
+    llm = api.get_llm("OpenAI")
+    chunks = list(assistant.stream_query("How do I negotiate a job offer?", llm, route=Route()))
+    assert len(chunks) == 1 and chunks[0].startswith("The assistant is very busy right now.")
+    with pytest.raises(Overloaded):
+        list(assistant.stream_query("How do I negotiate a job offer?", llm, route=Route(), raise_overloaded=True))
@@ -0,0 +1,44 @@
+import argparse
+import json
+
+import pytest
+
+import assistant
+import batch
+from benchmarks.bench_pipeline import disable_caches, install_fakes
+
+
+class FailingSearch:
+    def invoke(self, query):
+        raise ConnectionError("Tavily is down")
+
+
+@pytest.fixture
+def llm(tmp_path):
+    args = argparse.Namespace(
+        scale=0.0, chunks=5, content_chars=200, spike_rate=0.0, spike_seconds=0.0, rate_limits=False,
+    )
+    install_fakes(args)
+    disable_caches(str(tmp_path))
+    return assistant.initialize_llm("OpenAI")
+
+
+def test_research_failure_is_an_error_and_not_done(llm, tmp_path, monkeypatch):
+    monkeypatch.setattr(assistant, "get_search", lambda *args, **kwargs: FailingSearch())
+
+    result = batch.run_job("q1", "Tell me about Stripe as a company", llm)
+    assert result["answer"]
+    assert result["error"] == "Research failed: company"
+
+    output = tmp_path / "answers.jsonl"
+    output.write_text(json.dumps(result) + "\n", encoding="utf-8")
+    assert batch.completed_ids(str(output)) == set()
+
+
+def test_answer_with_research_is_done(llm, tmp_path):
+    result = batch.run_job("q1", "Tell me about Stripe as a company", llm)
+    assert result["error"] is None
+
+    output = tmp_path / "answers.jsonl"
+    output.write_text(json.dumps(result) + "\n", encoding="utf-8")
+    assert batch.completed_ids(str(output)) == {"q1"}
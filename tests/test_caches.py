@@ -0,0 +1,58 @@
+from answer_cache import AnswerCache
+from router import route_query
+from search_cache import SearchCache
+
+RESULTS = [{"url": "https://example.com", "content": "Stripe raised a new round."}]
+
+
+def test_search_results_survive_a_restart(tmp_path):
+    path = str(tmp_path / "search.sqlite3")
+    calls = []
+
+    def search(query):
+        calls.append(query)
+        return RESULTS
+
+    assert SearchCache(path).get_or_search("company", "Stripe  news!", search) == RESULTS
+    # A new process (fresh memory tier) reads the disk tier; punctuation and spacing do not matter
+    restarted = SearchCache(path)
+    assert restarted.get_or_search("company", "stripe news", search) == RESULTS
+    assert calls == ["Stripe  news!"]
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_expired_and_failed_searches_are_not_served(tmp_path):
+    cache = SearchCache(str(tmp_path / "search.sqlite3"), ttls={"company": 0})
+    cache.set("company", "stripe", RESULTS)
+    assert cache.get("company", "stripe") is None
+
+    cache = SearchCache(str(tmp_path / "other.sqlite3"))
+    assert cache.get_or_search("company", "stripe", lambda query: "Error: timed out") == "Error: timed out"
+    assert cache.get("company", "stripe") is None
+
+
+def test_unwritable_search_cache_still_works_in_memory(tmp_path):
+    (tmp_path / "cache").write_text("")
+    cache = SearchCache(str(tmp_path / "cache" / "search.sqlite3"))
+    cache.set("company", "stripe", RESULTS)
+    assert cache.get("company", "stripe") == RESULTS
+    assert cache.stats()["disk_errors"] == 1
+
+
+def test_near_duplicate_questions_share_an_answer():
+    cache = AnswerCache(max_age={"salary": 3600})
+    query = "What is the salary for a data scientist in NYC?"
+    cache.store(query, route_query(query), "About $150k.", latency=2.0)
+
+    rephrased = "what is the salary for a Data Scientist in New York"
+    assert cache.lookup(rephrased, route_query(rephrased)) == "About $150k."
+    # Different slots never match, however similar the wording
+    other = "What is the salary for a data engineer in NYC?"
+    assert cache.lookup(other, route_query(other)) is None
+
+
+def test_answers_are_not_cached_for_intents_without_a_max_age():
+    cache = AnswerCache(max_age={})
+    query = "How do I negotiate a job offer?"
+    cache.store(query, route_query(query), "Ask for more.", latency=1.0)
+    assert cache.lookup(query, route_query(query)) is None
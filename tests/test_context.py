@@ -0,0 +1,20 @@
+from context import build_context, count_tokens, query_terms
+
+RESULTS = [
+    {"url": "https://a.example", "content": "Accept all cookies. Stripe raised funding at a $50B valuation. " * 3
+     + "The office has a cafe. " * 20},
+    {"url": "https://b.example", "content": "Stripe raised funding at a $50B valuation. Stripe is hiring engineers in Dublin."},
+]
+
+
+def test_context_fits_the_token_budget():
+    terms = query_terms("Stripe", "funding valuation hiring")
+    for budget in (40, 80, 200):
+        assert count_tokens(build_context("Company Research: Stripe", RESULTS, terms, budget)) <= budget
+
+
+def test_boilerplate_and_repeats_are_dropped():
+    context = build_context("Company Research: Stripe", RESULTS, query_terms("Stripe", "funding hiring"), 200)
+    assert "cookies" not in context
+    assert context.count("$50B valuation") == 1
+    assert "hiring engineers in Dublin" in context
@@ -0,0 +1,35 @@
+from conversation_store import ConversationStore
+
+
+def filled(tmp_path, messages: int = 5) -> ConversationStore:
+    store = ConversationStore(str(tmp_path / "conversations.sqlite3"))
+    for i in range(messages):
+        store.append("s1", "user" if i % 2 == 0 else "assistant", f"message {i} " + "x" * 2000, "OpenAI")
+    return store
+
+
+def test_pages_go_back_from_the_newest(tmp_path):
+    store = filled(tmp_path)
+    newest = store.page("s1", limit=2)
+    assert [m["text"].split()[1] for m in newest] == ["3", "4"]
+    older = store.page("s1", before_seq=newest[0]["seq"], limit=2)
+    assert [m["text"].split()[1] for m in older] == ["1", "2"]
+    assert store.count("s1") == 5
+
+
+def test_iter_messages_reads_everything_in_order(tmp_path):
+    store = filled(tmp_path)
+    texts = [m["text"] for m in store.iter_messages("s1", batch=2)]
+    assert [text.split()[1] for text in texts] == ["0", "1", "2", "3", "4"]
+    # Long messages are compressed on disk but come back unchanged
+    assert texts[0] == "message 0 " + "x" * 2000
+
+
+def test_transfer_moves_history_to_the_new_session(tmp_path):
+    store = filled(tmp_path)
+    assert store.transfer("s1", "s2") == 5
+    assert store.count("s1") == 0
+    assert store.count("s2") == 5
+
+    store.clear("s2")
+    assert store.page("s2") == []
@@ -0,0 +1,87 @@
+import itertools
+import time
+
+import pytest
+
+import dispatch
+from benchmarks.fakes import FakeChatModel
+from dispatch import LLMDispatcher, provider_health
+from ratelimit import Overloaded
+
+_names = itertools.count()
+
+
+def providers(**models) -> dict:
+    """Providers under names no other test uses, since health is kept per process."""
+    suffix = next(_names)
+    return {f"{name}-{suffix}": model for name, model in models.items()}
+
+
+def fake(name: str, time_to_first_token: float = 0.01, **kwargs) -> FakeChatModel:
+    return FakeChatModel(name, time_to_first_token=time_to_first_token, chunks=3, **kwargs)
+
+
+def answer(llm) -> str:
+    return "".join(chunk.content for chunk in llm.stream("prompt"))
+
+
+class TurnedAway:
+    """Chat model whose calls the local rate limiter rejects."""
+
+    def stream(self, prompt, **kwargs):
+        raise Overloaded("primary is overloaded right now")
+
+
+def test_slow_provider_is_hedged_to_the_other(monkeypatch):
+    monkeypatch.setattr(dispatch, "HEDGE_DELAY_SECONDS", 0.1)
+    models = providers(primary=fake("slow", time_to_first_token=2.0), backup=fake("fast"))
+    llm = LLMDispatcher(models, preferred=next(iter(models)), hedging=True)
+
+    start = time.perf_counter()
+    assert answer(llm).startswith("fast-0")
+    assert time.perf_counter() - start < 1.5
+
+
+def test_error_before_first_token_fails_over():
+    primary, backup = fake("down", error_rate=1.0), fake("up")
+    models = providers(primary=primary, backup=backup)
+    primary_name = next(iter(models))
+    llm = LLMDispatcher(models, preferred=primary_name, hedging=False)
+
+    assert answer(llm).startswith("up-0")
+    assert provider_health(primary_name).breaker.failures == 1
+
+
+def test_repeated_failures_open_the_circuit():
+    primary, backup = fake("down", error_rate=1.0), fake("up")
+    models = providers(primary=primary, backup=backup)
+    primary_name = next(iter(models))
+    llm = LLMDispatcher(models, preferred=primary_name, hedging=False)
+
+    for _ in range(dispatch.CIRCUIT_FAILURES):
+        answer(llm)
+    assert provider_health(primary_name).breaker.state == "open"
+
+    # With the circuit open the primary is not called at all
+    calls = primary.calls
+    assert answer(llm).startswith("up-0")
+    assert primary.calls == calls
+
+
+def test_local_rate_limit_rejections_do_not_open_the_circuit():
+    models = providers(primary=TurnedAway(), backup=fake("up"))
+    primary_name = next(iter(models))
+    llm = LLMDispatcher(models, preferred=primary_name, hedging=False)
+
+    for _ in range(dispatch.CIRCUIT_FAILURES + 1):
+        assert answer(llm).startswith("up-0")
+    assert provider_health(primary_name).breaker.state == "closed"
+    assert provider_health(primary_name).breaker.failures == 0
+
+
+def test_error_from_every_provider_is_raised():
+    models = providers(primary=fake("down", error_rate=1.0), backup=fake("also-down", error_rate=1.0))
+    llm = LLMDispatcher(models, preferred=next(iter(models)), hedging=False)
+
+    with pytest.raises(RuntimeError, match="down: simulated provider error"):
+        answer(llm)
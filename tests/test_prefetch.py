@@ -0,0 +1,31 @@
+import threading
+
+import assistant
+from prefetch import Prefetcher
+from ratelimit import current_priority
+
+
+def test_refreshes_are_deduplicated_and_budgeted(monkeypatch):
+    release = threading.Event()
+    priorities = []
+
+    def refresh_answer(query, llm):
+        priorities.append(current_priority())
+        release.wait(5)
+
+    monkeypatch.setattr(assistant, "refresh_answer", refresh_answer)
+    prefetcher = Prefetcher(concurrency=2, max_per_hour=2)
+
+    assert prefetcher.submit("Tell me about Stripe", llm=None)
+    # Already queued: not refreshed twice
+    assert not prefetcher.submit("Tell me about Stripe", llm=None)
+    assert prefetcher.submit("Tell me about Google", llm=None)
+    # The hourly budget is spent
+    assert not prefetcher.submit("Tell me about Apple", llm=None)
+
+    release.set()
+    prefetcher._executor.shutdown(wait=True)
+    stats = prefetcher.stats()
+    assert stats["refreshed"] == 2 and stats["over_budget"] == 1
+    # Refreshes wait behind interactive and batch traffic
+    assert priorities == ["prefetch", "prefetch"]
@@ -0,0 +1,111 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import ratelimit
+from ratelimit import Overloaded, UpstreamLimiter, priority
+
+
+def drained(rpm: float, max_queue: int = 10) -> UpstreamLimiter:
+    """A limiter whose only token has been spent, so the next callers queue."""
+    limiter = UpstreamLimiter("test", rpm, burst_seconds=0, max_queue=max_queue)
+    limiter.acquire()
+    return limiter
+
+
+def wait_until(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def start_waiter(limiter: UpstreamLimiter, name: str, outcomes: list) -> threading.Thread:
+    def run():
+        with priority(name):
+            try:
+                limiter.acquire()
+                outcomes.append((name, "admitted"))
+            except Overloaded:
+                outcomes.append((name, "overloaded"))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_waiters_are_admitted_in_priority_order():
+    limiter = drained(rpm=240)
+    outcomes = []
+    threads = [start_waiter(limiter, "prefetch", outcomes)]
+    wait_until(lambda: limiter.stats()["waiting"] == 1)
+    threads.append(start_waiter(limiter, "batch", outcomes))
+    wait_until(lambda: limiter.stats()["waiting"] == 2)
+    threads.append(start_waiter(limiter, "interactive", outcomes))
+    for thread in threads:
+        thread.join(5)
+
+    assert outcomes == [("interactive", "admitted"), ("batch", "admitted"), ("prefetch", "admitted")]
+
+
+def test_full_queue_displaces_the_least_important_waiter():
+    limiter = drained(rpm=60, max_queue=1)
+    outcomes = []
+    background = start_waiter(limiter, "prefetch", outcomes)
+    wait_until(lambda: limiter.stats()["waiting"] == 1)
+    interactive = start_waiter(limiter, "interactive", outcomes)
+    background.join(5)
+    assert outcomes == [("prefetch", "overloaded")]
+
+    # A less important caller cannot displace a more important one
+    with priority("batch"), pytest.raises(Overloaded):
+        limiter.acquire()
+    interactive.join(5)
+    assert outcomes[-1] == ("interactive", "admitted")
+    assert limiter.stats()["rejected"] == 2
+
+
+def test_waiting_too_long_raises_overloaded(monkeypatch):
+    monkeypatch.setitem(ratelimit.MAX_WAIT, "interactive", 0.1)
+    limiter = drained(rpm=1)
+    start = time.monotonic()
+    with pytest.raises(Overloaded):
+        limiter.acquire()
+    assert time.monotonic() - start < 1
+    assert limiter.stats()["waiting"] == 0
+
+
+class RateLimited(Exception):
+    status_code = 429
+    response = SimpleNamespace(headers={"retry-after": "0.2"})
+
+
+def test_429_pauses_the_bucket_and_retries():
+    limiter = UpstreamLimiter("test", rpm=6000)
+    calls = []
+
+    def fn():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise RateLimited("slow down")
+        return "ok"
+
+    assert limiter.call(fn) == "ok"
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.2
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_other_errors_are_not_retried():
+    limiter = UpstreamLimiter("test", rpm=6000)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        limiter.call(fn)
+    assert calls == [1]
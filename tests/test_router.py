@@ -0,0 +1,28 @@
+import pytest
+
+from benchmarks.bench_router import check
+from benchmarks.router_corpus import build_corpus
+from router import route_query
+
+
+def test_labelled_corpus():
+    failures = check(build_corpus())
+    assert not failures, "\n".join(f"{query!r}: expected {intent} {slots}, got {route}" for query, intent, slots, route in failures[:20])
+
+
+@pytest.mark.parametrize("query", [
+    "What are interview questions about leadership?",
+    "What should I include in my resume about my pay history?",
+])
+def test_verbs_and_pronouns_are_not_slots(query):
+    assert route_query(query).intent == "general"
+
+
+@pytest.mark.parametrize("query, role", [
+    ("Software Engineer I salary in Austin, TX", "Software Engineer I"),
+    ("IT support specialist salary in the US", "IT support specialist"),
+    ("How much does a nurse make in Phoenix?", "nurse"),
+])
+def test_roles_that_look_like_pronouns_still_parse(query, role):
+    route = route_query(query)
+    assert route.intent == "salary" and route.role == role
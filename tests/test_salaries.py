@@ -0,0 +1,56 @@
+import pytest
+
+from salaries import SalaryDataset, SalaryFigure, parse_salaries
+
+
+@pytest.mark.parametrize("text, salary", [
+    ("Engineers earn $180,000 with a $20,000 sign-on bonus.", 180_000),
+    ("The base salary is $160,000 plus $25,000 in stock.", 160_000),
+    ("Analysts make $90,000 plus a $10,000 bonus.", 90_000),
+    ("Offers pay $140,000 and a $15,000 signing bonus.", 140_000),
+    ("Salary is $130,000 with $30,000 in RSUs.", 130_000),
+    ("The role pays $120,000 plus a $5,000 relocation package.", 120_000),
+    ("Base salary is $150,000 plus bonus.", 150_000),
+])
+def test_amounts_followed_by_bonus_or_stock_are_not_salaries(text, salary):
+    figures = parse_salaries(text)
+    assert [(f.kind, f.low, f.high) for f in figures] == [("base", salary, salary)]
+
+
+def test_amounts_after_bonus_wording_are_not_salaries():
+    assert [f.low for f in parse_salaries("Salary $110,000; bonus of $12,000 and equity worth $40,000.")] == [110_000]
+
+
+def test_total_compensation_including_stock_is_kept():
+    figures = parse_salaries("Total compensation of $250K including stock.")
+    assert [(f.kind, f.low) for f in figures] == [("total", 250_000)]
+
+
+def _figures(prefix: str, amounts: list) -> list:
+    return [SalaryFigure("base", amount, amount, "USD", "year", f"{prefix}{i}") for i, amount in enumerate(amounts)]
+
+
+def test_level_summary_falls_back_to_every_level(tmp_path):
+    dataset = SalaryDataset(str(tmp_path / "salaries.sqlite3"))
+    dataset.add("Data Scientist", "NYC", _figures("any", [120_000, 130_000, 140_000]))
+    dataset.add("data scientists", "New York", _figures("senior", [200_000, 210_000]), level="senior")
+
+    # Two senior figures are too few on their own
+    summary = dataset.summary("Data Scientist", "New York", level="senior", min_figures=3)
+    assert summary["level"] == "" and summary["kinds"]["base"]["figures"] == 5
+
+    dataset.add("Data Scientist", "New York", _figures("more", [220_000]), level="Senior")
+    summary = dataset.summary("Data Scientist", "New York", level="senior", min_figures=3)
+    assert summary["level"] == "senior"
+    assert summary["kinds"]["base"]["percentiles"][50] == 210_000
+
+
+def test_unwritable_dataset_is_empty_instead_of_failing(tmp_path):
+    # The cache "directory" is a file, so the database cannot be created
+    (tmp_path / "cache").write_text("")
+    dataset = SalaryDataset(str(tmp_path / "cache" / "salaries.sqlite3"))
+
+    assert dataset.add("Data Scientist", "NYC", _figures("any", [120_000, 130_000, 140_000])) == 0
+    assert dataset.summary("Data Scientist", "NYC", min_figures=1) is None
+    assert dataset.figures("Data Scientist", "NYC") == []
+    assert dataset.stats() == {"figures": 0, "pairs": 0, "available": False, "errors": 1}
@@ -0,0 +1,148 @@
+import threading
+import time
+
+from metrics import span, trace_request
+from ratelimit import priority
+from singleflight import SingleFlight
+
+CHUNKS = ["a", "b", "c", "d"]
+
+
+def gated_stream(calls: list, gate: threading.Event, closed: threading.Event):
+    """fn() for SingleFlight.stream: one chunk, then the rest once the gate opens."""
+    def fn():
+        calls.append(1)
+        try:
+            yield CHUNKS[0]
+            gate.wait(5)
+            yield from CHUNKS[1:]
+        finally:
+            closed.set()
+    return fn
+
+
+def test_leader_closing_does_not_cut_off_followers():
+    flights = SingleFlight("test")
+    calls, gate, closed = [], threading.Event(), threading.Event()
+    fn = gated_stream(calls, gate, closed)
+
+    leader = flights.stream("key", fn)
+    assert next(leader) == "a"
+    follower = flights.stream("key", fn)
+    assert next(follower) == "a"
+
+    # The leader's reader goes away partway through
+    leader.close()
+    gate.set()
+
+    assert "a" + "".join(follower) == "".join(CHUNKS)
+    assert len(calls) == 1
+    assert flights.stats()["coalesced"] == 1
+
+
+def test_follower_joining_late_replays_the_whole_answer():
+    flights = SingleFlight("test")
+    calls, gate, closed = [], threading.Event(), threading.Event()
+    fn = gated_stream(calls, gate, closed)
+
+    leader = flights.stream("key", fn)
+    assert next(leader) == "a"
+    follower = flights.stream("key", fn)
+    # Chunks produced before the follower joined are replayed first
+    assert next(follower) == "a"
+    gate.set()
+
+    assert "a" + "".join(leader) == "".join(CHUNKS)
+    assert "a" + "".join(follower) == "".join(CHUNKS)
+    assert len(calls) == 1
+
+
+def test_last_reader_leaving_cancels_the_stream():
+    flights = SingleFlight("test")
+    calls, gate, closed = [], threading.Event(), threading.Event()
+    fn = gated_stream(calls, gate, closed)
+
+    leader = flights.stream("key", fn)
+    follower = flights.stream("key", fn)
+    assert next(leader) == "a"
+    assert next(follower) == "a"
+    leader.close()
+    follower.close()
+    gate.set()
+
+    # The upstream generator is closed and the next request starts a fresh call
+    assert closed.wait(5)
+    assert flights.stats()["in_flight"] == 0
+    assert "".join(flights.stream("key", gated_stream(calls, gate, threading.Event()))) == "".join(CHUNKS)
+    assert len(calls) == 2
+
+
+def test_stream_errors_reach_every_reader():
+    flights = SingleFlight("test")
+    gate = threading.Event()
+
+    def fn():
+        yield "a"
+        gate.wait(5)
+        raise ValueError("upstream failed")
+
+    leader = flights.stream("key", fn)
+    follower = flights.stream("key", fn)
+    assert next(leader) == "a"
+    gate.set()
+    for reader in (leader, follower):
+        try:
+            list(reader)
+        except ValueError as e:
+            assert str(e) == "upstream failed"
+        else:
+            raise AssertionError("expected the upstream error")
+
+
+def test_do_shares_a_streamed_answer():
+    flights = SingleFlight("test")
+    calls, gate, closed = [], threading.Event(), threading.Event()
+    stream = flights.stream("key", gated_stream(calls, gate, closed))
+    assert next(stream) == "a"
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(flights.do("key", lambda: "other")))
+    waiter.start()
+    stream.close()
+    gate.set()
+    waiter.join(5)
+
+    assert results == ["".join(CHUNKS)]
+    assert len(calls) == 1
+
+
+def test_interactive_call_does_not_join_a_prefetch():
+    flights = SingleFlight("test")
+    calls, gate, closed = [], threading.Event(), threading.Event()
+    fn = gated_stream(calls, gate, closed)
+
+    with priority("prefetch"):
+        background = flights.stream("key", fn)
+        assert next(background) == "a"
+    # Started outside the prefetch block: runs on its own, at interactive priority
+    interactive = flights.stream("key", fn)
+    assert next(interactive) == "a"
+    gate.set()
+
+    assert "a" + "".join(interactive) == "".join(CHUNKS)
+    assert "a" + "".join(background) == "".join(CHUNKS)
+    assert len(calls) == 2
+    assert flights.stats()["coalesced"] == 0
+
+
+def test_reader_span_excludes_waiting_on_the_producer():
+    flights = SingleFlight("test")
+
+    def slow():
+        time.sleep(0.2)
+        yield "answer"
+
+    with trace_request() as trace:
+        with span("render"):
+            assert list(flights.stream("key", slow)) == ["answer"]
+    assert trace.stages["render"] < 0.1
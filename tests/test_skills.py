@@ -0,0 +1,50 @@
+from skills import analyze_job_description, extract_skills
+
+NURSING_JD = """Registered Nurse - Medical/Surgical Unit
+
+About the role:
+Spring is our busiest season, and we are looking for a compassionate Registered Nurse to join our team.
+
+Responsibilities:
+- Assess patients, monitor vital signs and lymph node changes, and administer medications.
+- Express concerns about patient safety to the charge nurse promptly.
+- Spark positive change on the unit by mentoring new graduates.
+- Chart in real time; late entries must note the original ts.
+- Educate patients and families about discharge plans and follow-up care.
+
+Requirements:
+- Active RN license and BLS certification.
+- 2+ years of acute care experience.
+- Excellent communication and teamwork skills.
+- Ability to work night and weekend shifts.
+"""
+
+
+def test_non_tech_posting_has_no_tech_skills():
+    skills = extract_skills(NURSING_JD)
+    assert {skill.category for skill in skills} <= {"soft"}
+
+
+def test_non_tech_posting_is_left_to_the_llm():
+    query = "Analyze this job description and extract key skills, requirements, responsibilities, " \
+            "and suggest how I should tailor my resume:\n\n" + NURSING_JD
+    assert analyze_job_description(query) is None
+
+
+def test_context_forms_still_match():
+    text = "Requirements:\n- Node.js and Express.js with TypeScript\n- Spring Boot or Spring Framework\n- Apache Spark"
+    names = [skill.name for skill in extract_skills(text)]
+    assert names == ["Node.js", "Express.js", "TypeScript", "Spring Boot", "Spring Framework", "Apache Spark"]
+
+
+def test_places_and_names_are_not_skills():
+    text = "Location: Phoenix, AZ (hybrid, or Aurora, CO)\nHiring manager: Julia Ray\nRecruiter: Ruby Chen\n" \
+           "Requirements:\n- Python and PostgreSQL"
+    names = [skill.name for skill in extract_skills(text)]
+    assert names == ["Python", "PostgreSQL"]
+
+
+def test_languages_named_like_people_match_in_context():
+    text = "Requirements:\n- Ruby developer with Ruby on Rails\n- Elixir/Phoenix experience\n- Julia language a plus"
+    names = {skill.name for skill in extract_skills(text)}
+    assert {"Ruby programming", "Ruby on Rails", "Phoenix Framework", "Julia language"} <= names